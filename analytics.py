@@ -0,0 +1,217 @@
+# analytics.py
+#
+# Population analytics for the admin dashboard: dosha analyses by primary
+# dosha and by percentage band, symptoms chosen in the symptom checker and
+# herb detail views, across every user and worker process.
+#
+# Each process counts into an in-memory delta. A background thread adds the
+# delta to a counters table in the profile database every SNAPSHOT_INTERVAL
+# seconds with "count = count + delta", so any number of processes merge
+# into the same totals. The dashboard reads one row per counter, never one
+# per user, and reuses what it read for SNAPSHOT_INTERVAL seconds.
+#
+# The dashboard is shown to visitors whose link carries
+# ?admin=<AYURVEDA_ADMIN_TOKEN>; without the variable it is disabled.
+
+import atexit
+import hmac
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+from functools import cached_property
+
+from dosha_index import DOSHA_BITS
+from profile_store import DB_PATH
+
+ADMIN_TOKEN = os.environ.get("AYURVEDA_ADMIN_TOKEN", "")
+
+# Seconds between writes of the counted delta, and between dashboard reads
+SNAPSHOT_INTERVAL = 5.0
+
+# Width in percentage points of the dosha percentage bands
+BAND_WIDTH = 10
+BANDS = tuple(range(0, 100, BAND_WIDTH))
+
+# Symptoms and herbs listed on the dashboard
+TOP_N = 10
+
+DOSHAS = tuple(DOSHA_BITS)
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS counters "
+    "(metric TEXT NOT NULL, key TEXT NOT NULL, count INTEGER NOT NULL, PRIMARY KEY (metric, key)) WITHOUT ROWID",
+    "CREATE INDEX IF NOT EXISTS counters_by_count ON counters (metric, count)",
+)
+
+_ADD = """
+INSERT INTO counters (metric, key, count) VALUES (?, ?, ?)
+ON CONFLICT(metric, key) DO UPDATE SET count = count + excluded.count
+"""
+
+
+def is_admin(token: str) -> bool:
+    # Compared as bytes: compare_digest() rejects str with non-ASCII characters
+    return bool(ADMIN_TOKEN) and hmac.compare_digest(token.encode(), ADMIN_TOKEN.encode())
+
+
+def band(percentage: float) -> int:
+    """Lower bound of the band a percentage falls in; 100% is in the top band."""
+    return min(int(percentage // BAND_WIDTH) * BAND_WIDTH, BANDS[-1])
+
+
+class PopulationSnapshot:
+    """Totals of every counter at one moment; its charts are built on first use."""
+
+    def __init__(self, rows, top_symptoms, top_herbs):
+        self.taken_at = time.time()
+        self.totals = Counter()
+        self.primary = Counter()
+        self.bands = {dosha: [0] * len(BANDS) for dosha in DOSHAS}
+        for metric, key, count in rows:
+            if metric == "total":
+                self.totals[key] = count
+            elif metric == "primary":
+                self.primary[key] = count
+            elif metric == "band":
+                dosha, lower = key.split(":")
+                if dosha in self.bands and int(lower) in BANDS:
+                    self.bands[dosha][BANDS.index(int(lower))] = count
+        self.top_symptoms = top_symptoms  # [(name, count)], most chosen first
+        self.top_herbs = top_herbs
+
+    @cached_property
+    def dosha_chart(self):
+        import utils
+        return utils.generate_dosha_chart({dosha.title(): self.primary[dosha] for dosha in DOSHAS})
+
+    @cached_property
+    def band_chart(self):
+        import utils
+        return utils.generate_band_chart(
+            [f"{lower}-{lower + BAND_WIDTH}%" for lower in BANDS],
+            {dosha.title(): counts for dosha, counts in self.bands.items()},
+            "Dosha percentages in analyses"
+        )
+
+
+class PopulationStats:
+    """
+    Counters of population analytics. record_*() only increment an
+    in-memory delta; a background thread merges it into the shared
+    counters table, one transaction per interval.
+    """
+
+    def __init__(self, path: str = DB_PATH, interval: float = SNAPSHOT_INTERVAL):
+        self.path = path
+        self.interval = interval
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        for statement in _SCHEMA:
+            self._conn.execute(statement)
+        self._conn_lock = threading.Lock()
+
+        self._delta = Counter()  # (metric, key) -> count not yet written
+        self._delta_lock = threading.Condition()
+        self._snapshot = None
+        self._snapshot_expires = 0.0
+        self._closed = False
+        self._writer = threading.Thread(target=self._write_behind, name="analytics-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def _count(self, counts):
+        with self._delta_lock:
+            self._delta.update(counts)
+
+    def record_analysis(self, result: dict):
+        """Count a dosha analysis result: {"percentages": {dosha: %}, "primary": dosha}."""
+        counts = [("total", "analyses"), ("primary", result["primary"])]
+        counts += [("band", f"{dosha}:{band(pct)}") for dosha, pct in result["percentages"].items()]
+        self._count(counts)
+
+    def record_symptom_check(self, symptoms):
+        self._count([("total", "symptom_checks"), *(("symptom", name) for name in dict.fromkeys(symptoms))])
+
+    def record_herb_view(self, herb: str):
+        self._count([("total", "herb_views"), ("herb", herb)])
+
+    def flush(self):
+        """Add the counted delta to the counters table now."""
+        with self._delta_lock:
+            delta, self._delta = self._delta, Counter()
+        if not delta:
+            return
+        with self._conn_lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(_ADD, ((metric, key, count) for (metric, key), count in delta.items()))
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                # Counts are additive, so the failed delta is simply merged back
+                with self._delta_lock:
+                    self._delta.update(delta)
+                raise
+
+    def snapshot(self) -> PopulationSnapshot:
+        """
+        Totals across all processes, including this process's latest counts.
+        Read at most once per interval; the cost depends on the number of
+        counters (doshas, bands, top symptoms and herbs), not of users.
+        """
+        now = time.monotonic()
+        if self._snapshot is None or now >= self._snapshot_expires:
+            self.flush()
+            with self._conn_lock:
+                rows = self._conn.execute(
+                    "SELECT metric, key, count FROM counters WHERE metric IN ('total', 'primary', 'band')"
+                ).fetchall()
+                top = {metric: self._conn.execute(
+                    "SELECT key, count FROM counters WHERE metric = ? ORDER BY count DESC LIMIT ?", (metric, TOP_N)
+                ).fetchall() for metric in ("symptom", "herb")}
+            self._snapshot = PopulationSnapshot(rows, top["symptom"], top["herb"])
+            self._snapshot_expires = now + self.interval
+        return self._snapshot
+
+    def close(self):
+        with self._delta_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._delta_lock.notify()
+        self._writer.join()
+        self.flush()
+        with self._conn_lock:
+            self._conn.close()
+
+    def _write_behind(self):
+        while True:
+            with self._delta_lock:
+                if not self._closed:
+                    self._delta_lock.wait(self.interval)
+                closed = self._closed
+            try:
+                self.flush()
+            except sqlite3.Error:
+                # The delta was merged back by flush(); retry on the next interval
+                if closed:
+                    raise
+            if closed:
+                return
+
+
+_shared_stats = None
+_shared_stats_lock = threading.Lock()
+
+
+def shared_population_stats() -> PopulationStats:
+    """Return the process-wide analytics counters, opening them on first use."""
+    global _shared_stats
+    if _shared_stats is None:
+        with _shared_stats_lock:
+            if _shared_stats is None:
+                _shared_stats = PopulationStats()
+    return _shared_stats
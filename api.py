@@ -0,0 +1,273 @@
+# api.py
+#
+# Headless JSON API over the same knowledge base the Streamlit UI uses.
+#
+#     python api.py --port 8000
+#
+#     POST /api/analyze_symptoms           {"symptoms": ["Anxiety", "Acidity"]}
+#     POST /api/get_recommended_herbs      {"symptoms": ["Anxiety"]}
+#     POST /api/get_dietary_advice         {"dosha": "vata"}
+#     POST /api/get_dosha_specific_routine {"dosha": "pitta"}
+#     POST /api/get_remedy                 {"symptom": "headache"}
+#     POST /api/check_symptoms             {"symptoms": ["Headache", "Acidity"]}
+#     POST /api/analyze_dosha              {"answers": [0, 1, 2, 0, 1]}
+#     POST /api/search                     {"query": "what helps with acid reflux at night?", "k": 5}
+#     POST /api/batch                      {"requests": [{"op": "get_remedy", "args": {"symptom": "cold"}}, ...]}
+#     GET  /health
+#     GET  /metrics                        Prometheus text format, with AYURVEDA_METRICS=1
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+
+import metrics
+from dosha_outcomes import shared_outcome_cache
+from wellness_kb import shared_knowledge_base
+
+MAX_BODY_SIZE = 1024 * 1024
+MAX_BATCH_SIZE = 10000
+MAX_SEARCH_RESULTS = 100
+TOP_K = 5
+
+INTERNAL_ERROR = "Internal server error."
+
+log = logging.getLogger(__name__)
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large",
+            500: "Internal Server Error"}
+
+
+class ApiError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _arg(args: dict, name: str, kind):
+    value = args.get(name) if isinstance(args, dict) else None
+    if kind is list:
+        if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+            raise ApiError(400, f"'{name}' must be a list of strings.")
+    elif not isinstance(value, str):
+        raise ApiError(400, f"'{name}' must be a string.")
+    return value
+
+
+def _analyze_dosha(args: dict):
+    answers = args.get("answers") if isinstance(args, dict) else None
+    if not isinstance(answers, list) or not all(type(answer) is int for answer in answers):
+        raise ApiError(400, "'answers' must be a list of option indices.")
+    try:
+        return shared_outcome_cache().get(answers)
+    except ValueError as e:
+        raise ApiError(400, str(e))
+
+
+def _search_k(args: dict) -> int:
+    k = args.get("k", TOP_K) if isinstance(args, dict) else None
+    if type(k) is not int or not 1 <= k <= MAX_SEARCH_RESULTS:
+        raise ApiError(400, f"'k' must be an integer from 1 to {MAX_SEARCH_RESULTS}.")
+    return k
+
+
+def _hits(results) -> list:
+    return [{**passage.to_dict(), "score": round(score, 4)} for passage, score in results]
+
+
+OPERATIONS = {
+    "analyze_symptoms": lambda args: shared_knowledge_base().analyze_symptoms(_arg(args, "symptoms", list)),
+    "get_recommended_herbs": lambda args: shared_knowledge_base().get_recommended_herbs(_arg(args, "symptoms", list)),
+    "get_dietary_advice": lambda args: shared_knowledge_base().get_dietary_advice(_arg(args, "dosha", str)),
+    "get_dosha_specific_routine": lambda args: shared_knowledge_base().get_dosha_specific_routine(_arg(args, "dosha", str)),
+    "get_remedy": lambda args: {"remedy": shared_knowledge_base().remedy_kb.get_remedy(_arg(args, "symptom", str))},
+    "check_symptoms": lambda args: shared_knowledge_base().symptom_index.check(_arg(args, "symptoms", list)),
+    "analyze_dosha": _analyze_dosha,
+    "search": lambda args: _hits(shared_knowledge_base().corpus_index.search(_arg(args, "query", str), _search_k(args))),
+}
+
+
+def run_batch(requests) -> list:
+    """
+    Run a list of {"op": ..., "args": {...}} requests.
+    Symptom analyses in the batch are scored together through
+    analyze_symptoms_batch, and searches with the same k through one
+    search_batch; a failing entry reports its own error.
+    """
+    if not isinstance(requests, list) or len(requests) > MAX_BATCH_SIZE:
+        raise ApiError(400, f"'requests' must be a list of at most {MAX_BATCH_SIZE} entries.")
+
+    results = [None] * len(requests)
+    analyses = []
+    searches = {}  # k -> [(index, query)]
+    for index, request in enumerate(requests):
+        try:
+            op = request.get("op") if isinstance(request, dict) else None
+            args = request.get("args", {}) if isinstance(request, dict) else None
+            if op == "analyze_symptoms":
+                analyses.append((index, _arg(args, "symptoms", list)))
+            elif op == "search":
+                query = _arg(args, "query", str)
+                searches.setdefault(_search_k(args), []).append((index, query))
+            elif op in OPERATIONS:
+                results[index] = {"result": OPERATIONS[op](args)}
+            else:
+                raise ApiError(404, f"Unknown operation '{op}'.")
+        except ApiError as e:
+            results[index] = {"error": str(e)}
+        except Exception:
+            log.exception("Batch entry %d (%r) failed", index, request)
+            results[index] = {"error": INTERNAL_ERROR}
+
+    if analyses:
+        try:
+            scored = shared_knowledge_base().analyze_symptoms_batch([symptoms for _, symptoms in analyses])
+            for (index, _), analysis in zip(analyses, scored):
+                results[index] = {"result": analysis}
+        except Exception:
+            log.exception("Batched symptom analysis failed")
+            for index, _ in analyses:
+                results[index] = {"error": INTERNAL_ERROR}
+    for k, queries in searches.items():
+        try:
+            found = shared_knowledge_base().corpus_index.search_batch([query for _, query in queries], k)
+            for (index, _), hits in zip(queries, found):
+                results[index] = {"result": _hits(hits)}
+        except Exception:
+            log.exception("Batched search with k=%d failed", k)
+            for index, _ in queries:
+                results[index] = {"error": INTERNAL_ERROR}
+    return results
+
+
+def handle_request(method: str, path: str, body: bytes):
+    """
+    Route one request and return (status, payload). The payload is
+    JSON-serializable, or a str for plain-text responses.
+    """
+    if not metrics.ENABLED:
+        return _route(method, path, body)
+    start = time.perf_counter()
+    try:
+        return _route(method, path, body)
+    finally:
+        # Unknown paths share one label so clients cannot create unbounded series
+        op = path[len("/api/"):] if path.startswith("/api/") else path
+        label = op if op in OPERATIONS or op in ("batch", "/health", "/metrics") else "other"
+        metrics.observe("ayurveda_api_request_seconds", "op", label, time.perf_counter() - start)
+
+
+def _route(method: str, path: str, body: bytes):
+    try:
+        if path == "/metrics" and metrics.ENABLED:
+            return 200, metrics.REGISTRY.render()
+        if path == "/health":
+            return 200, {"status": "ok", "version": shared_knowledge_base().version}
+        if not path.startswith("/api/"):
+            raise ApiError(404, f"No route for '{path}'.")
+        if method != "POST":
+            raise ApiError(405, "Use POST with a JSON body.")
+
+        op = path[len("/api/"):]
+        if op != "batch" and op not in OPERATIONS:
+            raise ApiError(404, f"Unknown operation '{op}'.")
+        try:
+            args = json.loads(body or b"{}")
+        except ValueError:
+            raise ApiError(400, "Request body is not valid JSON.")
+
+        if op == "batch":
+            return 200, {"results": run_batch(args.get("requests") if isinstance(args, dict) else None)}
+        return 200, {"result": OPERATIONS[op](args)}
+    except ApiError as e:
+        return e.status, {"error": str(e)}
+    except Exception:
+        log.exception("%s %s failed", method, path)
+        return 500, {"error": INTERNAL_ERROR}
+
+
+def _to_json(value):
+    # Domain records from models.py serialize through their to_dict()
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _response(status: int, payload, keep_alive: bool) -> bytes:
+    if isinstance(payload, str):
+        body = payload.encode("utf-8")
+        content_type = "text/plain; version=0.0.4; charset=utf-8"
+    else:
+        body = json.dumps(payload, ensure_ascii=False, default=_to_json).encode("utf-8")
+        content_type = "application/json; charset=utf-8"
+    head = (
+        f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode("latin-1") + body
+
+
+async def _handle_connection(reader, writer):
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            parts = request_line.decode("latin-1").split()
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+            if len(parts) != 3:
+                writer.write(_response(400, {"error": "Malformed request line."}, False))
+                break
+            method, target, version = parts
+            connection = headers.get("connection", "").lower()
+            keep_alive = connection == "keep-alive" if version == "HTTP/1.0" else connection != "close"
+
+            length = headers.get("content-length", "0") or "0"
+            if not (length.isascii() and length.isdigit()):
+                writer.write(_response(400, {"error": "Invalid Content-Length."}, False))
+                break
+            length = int(length)
+            if length > MAX_BODY_SIZE:
+                writer.write(_response(413, {"error": "Request body too large."}, False))
+                break
+            body = await reader.readexactly(length) if length else b""
+
+            status, payload = handle_request(method, target.split("?", 1)[0], body)
+            writer.write(_response(status, payload, keep_alive))
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(host: str = "127.0.0.1", port: int = 8000):
+    shared_outcome_cache().warm()  # warm the dosha quiz outcomes and charts before the first request
+    server = await asyncio.start_server(_handle_connection, host, port)
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ayurvedic Wellness JSON API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+    print(f"Serving on http://{args.host}:{args.port}")
+    asyncio.run(serve(args.host, args.port))
+
+
+if __name__ == "__main__":
+    main()
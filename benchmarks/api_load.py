@@ -0,0 +1,116 @@
+# benchmarks/api_load.py
+#
+# Local load test for api.py. Starts the API in a separate process (one
+# core) and drives it over keep-alive connections for a fixed duration.
+#
+# Run from the repository root:
+#     python -m benchmarks.api_load
+
+import asyncio
+import json
+import multiprocessing
+import socket
+import time
+
+import api
+
+CONNECTIONS = 32
+DURATION = 5.0
+BATCH_SIZE = 100
+
+REQUESTS = [
+    ("/api/analyze_symptoms", {"symptoms": ["Anxiety", "Acidity", "Insomnia"]}),
+    ("/api/get_recommended_herbs", {"symptoms": ["Constipation"]}),
+    ("/api/get_dietary_advice", {"dosha": "pitta"}),
+    ("/api/get_dosha_specific_routine", {"dosha": "kapha"}),
+    ("/api/get_remedy", {"symptom": "headache"}),
+]
+
+
+def _encode(path, payload):
+    body = json.dumps(payload).encode()
+    return (f"POST {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n").encode() + body
+
+
+async def _read_response(reader):
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line == b"\r\n":
+            break
+        if line.lower().startswith(b"content-length:"):
+            length = int(line.split(b":", 1)[1])
+    await reader.readexactly(length)
+
+
+async def _client(port, messages, deadline, results):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    latencies = []
+    i = 0
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        writer.write(messages[i % len(messages)])
+        await _read_response(reader)
+        latencies.append(time.perf_counter() - start)
+        i += 1
+    writer.close()
+    results.extend(latencies)
+
+
+async def _drive(port, messages):
+    results = []
+    deadline = time.perf_counter() + DURATION
+    await asyncio.gather(*(_client(port, messages, deadline, results) for _ in range(CONNECTIONS)))
+    return results
+
+
+def _serve(port):
+    asyncio.run(api.serve("127.0.0.1", port))
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_for(port):
+    for _ in range(100):
+        try:
+            socket.create_connection(("127.0.0.1", port)).close()
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError("API server did not start")
+
+
+def run(name, port, messages, operations_per_request):
+    latencies = sorted(asyncio.run(_drive(port, messages)))
+    throughput = len(latencies) / DURATION
+    p50 = latencies[len(latencies) // 2] * 1e3
+    p99 = latencies[int(len(latencies) * 0.99)] * 1e3
+    print(f"{name:>22} {throughput:>10.0f} {throughput * operations_per_request:>12.0f} {p50:>8.2f} {p99:>8.2f}")
+
+
+def main():
+    port = _free_port()
+    server = multiprocessing.Process(target=_serve, args=(port,), daemon=True)
+    server.start()
+    try:
+        _wait_for(port)
+        single = [_encode(path, payload) for path, payload in REQUESTS]
+        batch = [_encode("/api/batch", {"requests": [
+            {"op": path[len("/api/"):], "args": payload}
+            for path, payload in (REQUESTS * BATCH_SIZE)[:BATCH_SIZE]
+        ]})]
+        print(f"{CONNECTIONS} connections, {DURATION:.0f}s per run")
+        print(f"{'':>22} {'requests/s':>10} {'operations/s':>12} {'p50 ms':>8} {'p99 ms':>8}")
+        run("single operations", port, single, 1)
+        run(f"batches of {BATCH_SIZE}", port, batch, BATCH_SIZE)
+    finally:
+        server.terminate()
+
+
+if __name__ == "__main__":
+    main()
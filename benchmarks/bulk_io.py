@@ -0,0 +1,93 @@
+# benchmarks/bulk_io.py
+#
+# Bulk import: records per second and peak memory of streaming JSONL/CSV
+# imports into a knowledge base directory, and the cost of adding remedies
+# to a live knowledge base one pair at a time versus in one batch.
+#
+# Run from the repository root:
+#     python -m benchmarks.bulk_io
+
+import json
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.synthetic import BENEFITS, DOSHA_FIELDS, make_store
+from bulk_io import export_file, import_file
+from wellness_kb import AyurvedicKnowledgeBase
+
+RECORD_COUNTS = (10000, 100000, 300000)
+REMEDY_COUNTS = (100, 1000)
+
+
+def write_herbs(path, count):
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(count):
+            f.write(json.dumps({
+                "name": f"Herb {i}", "benefits": [BENEFITS[i % len(BENEFITS)], BENEFITS[i * 7 % len(BENEFITS)]],
+                "dosha": DOSHA_FIELDS[i % len(DOSHA_FIELDS)], "dosage": f"{i % 5 + 1}g daily"
+            }) + "\n")
+
+
+def measure(directory, path):
+    """
+    Import path into fresh stores under directory; return (report, seconds,
+    peak traced MiB). Memory is traced in a second run as tracing slows it down.
+    """
+    def run(name):
+        os.mkdir(os.path.join(directory, name))
+        store = make_store(os.path.join(directory, name), herb_count=5)
+        return store, import_file(store, "herbs", path)
+
+    start = time.perf_counter()
+    store, report = run("timed")
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    run("traced")
+    peak = tracemalloc.get_traced_memory()[1] / 2**20
+    tracemalloc.stop()
+    return store, report, seconds, peak
+
+
+def main():
+    print(f"{'records':>8} {'format':>6} {'file MiB':>9} {'records/s':>10} {'peak MiB':>9}")
+    for count in RECORD_COUNTS:
+        directory = tempfile.mkdtemp()
+        try:
+            source = os.path.join(directory, "herbs.jsonl")
+            write_herbs(source, count)
+            exported = os.path.join(directory, "herbs.csv")
+            os.mkdir(os.path.join(directory, "jsonl"))
+            os.mkdir(os.path.join(directory, "csv"))
+            for format, path in (("jsonl", source), ("csv", exported)):
+                store, report, seconds, peak = measure(os.path.join(directory, format), path)
+                assert report.added == count and not report.failed, report.summary()
+                size = os.path.getsize(path) / 2**20
+                print(f"{count:>8} {format:>6} {size:>9.1f} {count / seconds:>10.0f} {peak:>9.1f}")
+                if format == "jsonl":
+                    export_file(store, "herbs", exported)
+        finally:
+            shutil.rmtree(directory)
+
+    print(f"\n{'remedies':>8} {'one at a time ms':>17} {'batch ms':>9}")
+    for count in REMEDY_COUNTS:
+        pairs = [(f"symptom {i}", f"Sip warm water with remedy {i}.") for i in range(count)]
+        timings = []
+        for batched in (False, True):
+            kb = AyurvedicKnowledgeBase()
+            kb.corpus_index.search("warm up")
+            start = time.perf_counter()
+            if batched:
+                kb.remedy_kb.add_remedies(pairs)
+            else:
+                for symptom, remedy in pairs:
+                    kb.remedy_kb.add_remedy(symptom, remedy)
+            kb.corpus_index.search("warm water")
+            timings.append((time.perf_counter() - start) * 1e3)
+        print(f"{count:>8} {timings[0]:>17.1f} {timings[1]:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# benchmarks/chat_engine.py
+#
+# Chat engine latency: time to the first streamed token and to the full
+# answer, with the response cache cold and warm, on the shipped knowledge
+# base and on synthetic ones. Also shows that a turn costs the same late in
+# a long conversation as at its start.
+#
+# Run from the repository root:
+#     python -m benchmarks.chat_engine
+
+import shutil
+import statistics
+import tempfile
+import time
+
+from benchmarks.synthetic import make_store
+from wellness_kb import AyurvedicKnowledgeBase
+
+HERB_COUNTS = (5, 1000, 10000)
+MESSAGES = (
+    "I have a headache and acidity, and I feel irritable",
+    "What should I eat?",
+    "Tell me about ashwagandha",
+    "Which yoga is good for vata?",
+    "I can't sleep and I worry a lot",
+    "What daily routine do you suggest?",
+    "hello",
+)
+LONG_CONVERSATION = 1000
+
+
+def turn(engine, conversation, message):
+    """Return (ms to first token, ms to full answer, tokens) for one turn."""
+    start = time.perf_counter()
+    stream = engine.respond(conversation, message)
+    next(stream)
+    first = time.perf_counter() - start
+    count = 1 + sum(1 for _ in stream)
+    return first * 1e3, (time.perf_counter() - start) * 1e3, count
+
+
+def measure(engine):
+    """Median first-token and full-answer ms over MESSAGES in a fresh conversation."""
+    conversation = engine.new_conversation()
+    samples = [turn(engine, conversation, message) for message in MESSAGES]
+    return statistics.median(s[0] for s in samples), statistics.median(s[1] for s in samples)
+
+
+def main():
+    print(f"{'herbs':>7} {'build ms':>9} {'cold first':>11} {'cold full':>10} {'warm first':>11} {'warm full':>10}")
+    for count in HERB_COUNTS:
+        directory = tempfile.mkdtemp()
+        try:
+            kb = AyurvedicKnowledgeBase(make_store(directory, herb_count=count)).load_all().freeze()
+            start = time.perf_counter()
+            engine = kb.chat_engine
+            build = (time.perf_counter() - start) * 1e3
+            cold = measure(engine)
+            warm = measure(engine)
+            print(f"{count:>7} {build:>9.1f} {cold[0]:>11.3f} {cold[1]:>10.3f} {warm[0]:>11.3f} {warm[1]:>10.3f}")
+        finally:
+            shutil.rmtree(directory)
+
+    conversation = engine.new_conversation()
+    early = [turn(engine, conversation, message)[1] for message in MESSAGES]
+    for i in range(LONG_CONVERSATION):
+        turn(engine, conversation, MESSAGES[i % len(MESSAGES)])
+    late = [turn(engine, conversation, message)[1] for message in MESSAGES]
+    print(f"\nfull answer, turns 1-{len(MESSAGES)}: {statistics.median(early):.3f} ms; "
+          f"after {LONG_CONVERSATION} more turns: {statistics.median(late):.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
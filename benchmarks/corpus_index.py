@@ -0,0 +1,66 @@
+# benchmarks/corpus_index.py
+#
+# BM25 corpus index: build time, per-query latency of single queries versus
+# one batch, and the cost of adding passages incrementally versus rebuilding
+# the index, on synthetic knowledge bases.
+#
+# Run from the repository root:
+#     python -m benchmarks.corpus_index
+
+import shutil
+import tempfile
+import time
+
+from benchmarks.synthetic import make_store
+from corpus_index import CorpusIndex, kb_passages
+from models import Passage
+from wellness_kb import AyurvedicKnowledgeBase
+
+HERB_COUNTS = (5, 1000, 10000, 100000)
+QUERIES = (
+    "what helps with acid reflux at night?", "better sleep", "stress relief for vata",
+    "what to eat in winter", "yoga for balance", "digestive aid", "headache remedy",
+    "calms mind", "clears congestion in spring", "energy boost",
+) * 10
+ADDED = 10
+
+
+def per_query_ms(func):
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) / len(QUERIES) * 1e3
+
+
+def main():
+    print(f"{'passages':>9} {'build ms':>9} {'single ms':>10} {'batched ms':>11} {'add+query ms':>13} {'rebuild ms':>11}")
+    for count in HERB_COUNTS:
+        directory = tempfile.mkdtemp()
+        try:
+            kb = AyurvedicKnowledgeBase(make_store(directory, herb_count=count))
+            passages = list(kb_passages(kb))
+
+            start = time.perf_counter()
+            index = CorpusIndex(passages)
+            index.search("warm up")
+            build = (time.perf_counter() - start) * 1e3
+
+            single = per_query_ms(lambda: [index.search(query) for query in QUERIES])
+            batched = per_query_ms(lambda: index.search_batch(QUERIES))
+
+            new = [Passage(f"note:{i}", "note", f"Note {i}", f"Sip warm water with lemon for digestion {i}.")
+                   for i in range(ADDED)]
+            start = time.perf_counter()
+            index.add(new)
+            index.search("warm water")
+            incremental = (time.perf_counter() - start) * 1e3
+
+            start = time.perf_counter()
+            CorpusIndex(passages + new).search("warm water")
+            rebuild = (time.perf_counter() - start) * 1e3
+            print(f"{len(passages):>9} {build:>9.1f} {single:>10.3f} {batched:>11.3f} {incremental:>13.2f} {rebuild:>11.1f}")
+        finally:
+            shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
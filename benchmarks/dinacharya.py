@@ -0,0 +1,66 @@
+# benchmarks/dinacharya.py
+#
+# Daily routine schedule: building a (dosha, season) template, personalizing
+# it for a new wake/sleep time, and a repeated schedule (a rerun of the
+# routine page), next to the fixed pandas DataFrame the page used to build
+# on every rerun.
+#
+# Run from the repository root:
+#     python -m benchmarks.dinacharya
+
+import time
+
+from dinacharya import ScheduleEngine
+from wellness_kb import AyurvedicKnowledgeBase
+
+REPEATS = 2000
+
+
+def per_call_us(func, repeats=REPEATS):
+    start = time.perf_counter()
+    for i in range(repeats):
+        func(i)
+    return (time.perf_counter() - start) / repeats * 1e6
+
+
+def old_table(i):
+    import pandas as pd
+    return pd.DataFrame({
+        "Time": ["5:00-6:00 AM", "6:00-7:00 AM", "7:00-8:00 AM", "8:00-9:00 AM",
+                 "12:00-1:00 PM", "6:00-7:00 PM", "9:00-10:00 PM"],
+        "Activity": ["Wake up", "Oral hygiene & Oil pulling", "Exercise & Yoga", "Bath & Meditation",
+                     "Main Meal", "Light Dinner", "Sleep"],
+        "Description": ["Best time to wake up", "Cleanse with oil", "Gentle exercise", "15-min meditation",
+                        "Largest meal of day", "2-3 hours before sleep", "Digital detox before bed"]
+    })
+
+
+def main():
+    data = AyurvedicKnowledgeBase().dinacharya
+    engine = ScheduleEngine(data)
+
+    def template(i):
+        engine.template.cache_clear()
+        engine.template("vata", "winter")
+
+    def personalized(i):
+        # A wake time not seen before: template hit, schedule and table miss
+        engine._schedule.cache_clear()
+        engine.schedule("vata", "winter", f"{5 + i % 4:02d}:{i % 60:02d}", "22:00").frame
+
+    engine.schedule("vata", "winter").frame
+    rows = [
+        ("old: fixed DataFrame per rerun", per_call_us(old_table)),
+        ("template per (dosha, season)", per_call_us(template)),
+        ("new wake time: schedule + DataFrame", per_call_us(personalized)),
+        ("new wake time: schedule only", per_call_us(
+            lambda i: (engine._schedule.cache_clear(), engine.schedule("vata", "winter", f"{5 + i % 4:02d}:30")))),
+        ("rerun: cached schedule", per_call_us(lambda i: engine.schedule("vata", "winter").frame, 100000)),
+    ]
+    print(f"{'case':<38} {'us per call':>12}")
+    for name, us in rows:
+        print(f"{name:<38} {us:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
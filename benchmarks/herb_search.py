@@ -0,0 +1,61 @@
+# benchmarks/herb_search.py
+#
+# Herb library search: the old linear substring filter versus the trigram
+# index returning the first page of ranked results.
+#
+# Run from the repository root:
+#     python -m benchmarks.herb_search
+
+import random
+import string
+import time
+
+from herb_search import HerbSearchIndex
+from models import AyurvedicHerb
+
+HERB_COUNTS = (100, 1000, 10000, 100000)
+QUERIES = ("ashwaganda", "sleep", "digestive", "tumeric", "calms mind")
+BENEFITS = ("Stress Relief", "Better Sleep", "Energy Boost", "Digestive Aid", "Calms Mind", "Detoxifier")
+
+
+def make_herbs(rng, count):
+    herbs = [
+        {"name": "Ashwagandha", "sanskrit": "अश्वगन्धा", "benefits": ["Stress Relief", "Better Sleep"],
+         "dosha": "Vata, Kapha", "dosage": "500-1000mg daily"},
+        {"name": "Turmeric", "sanskrit": "हरिद्रा", "benefits": ["Anti-inflammatory", "Digestive Aid"],
+         "dosha": "All doshas", "dosage": "1-3g daily"},
+    ]
+    for _ in range(count - len(herbs)):
+        name = "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(5, 12))).capitalize()
+        herbs.append({"name": name, "sanskrit": "", "benefits": rng.sample(BENEFITS, 2),
+                      "dosha": "Pitta", "dosage": "1g daily"})
+    return [AyurvedicHerb.from_dict(herb) for herb in herbs]
+
+
+def linear_search(herbs, term):
+    return [h for h in herbs if term.lower() in h.name.lower() or
+            any(term.lower() in b.lower() for b in h.benefits)]
+
+
+def per_query(func):
+    start = time.perf_counter()
+    for query in QUERIES:
+        func(query)
+    return (time.perf_counter() - start) / len(QUERIES)
+
+
+def main():
+    rng = random.Random(7)
+    print(f"{'herbs':>7} {'build (ms)':>11} {'linear (ms)':>12} {'index (ms)':>11}")
+    for count in HERB_COUNTS:
+        herbs = make_herbs(rng, count)
+        start = time.perf_counter()
+        index = HerbSearchIndex(herbs)
+        build = time.perf_counter() - start
+        linear = per_query(lambda query: linear_search(herbs, query))
+        indexed = per_query(lambda query: index.search(query, 0, 10))
+        print(f"{count:>7} {build * 1e3:>11.1f} {linear * 1e3:>12.3f} {indexed * 1e3:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+# benchmarks/kb_startup.py
+#
+# Knowledge base construction time versus herb catalogue size. Construction
+# only fingerprints the data directory; the herbs section is read on first
+# access.
+#
+# Run from the repository root:
+#     python -m benchmarks.kb_startup
+
+import shutil
+import tempfile
+import time
+
+from benchmarks.synthetic import make_store
+from wellness_kb import AyurvedicKnowledgeBase
+
+HERB_COUNTS = (5, 1000, 10000, 50000)
+
+
+def main():
+    print(f"{'herbs':>7} {'startup (ms)':>13} {'first herbs access (ms)':>24}")
+    for herb_count in HERB_COUNTS:
+        directory = tempfile.mkdtemp()
+        try:
+            store = make_store(directory, herb_count)
+            start = time.perf_counter()
+            kb = AyurvedicKnowledgeBase(store)
+            startup = time.perf_counter() - start
+            start = time.perf_counter()
+            kb.get_all_herbs()
+            first_access = time.perf_counter() - start
+        finally:
+            shutil.rmtree(directory)
+        print(f"{herb_count:>7} {startup * 1e3:>13.3f} {first_access * 1e3:>24.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+# benchmarks/load_test.py
+#
+# Multi-session load test for the Streamlit app, fully offline. Simulated
+# sessions (AppTest instances, one per user) are interleaved round-robin in
+# each worker process, as one `streamlit run` process interleaves its users.
+# Every session walks a randomly chosen flow:
+#
+#     navigation  - visit every page from the sidebar
+#     quiz        - answer the five questions and analyze
+#     search      - type a search term a keystroke at a time, turn a page
+#     symptoms    - select symptoms and analyze them
+#
+# Widgets inside a fragment rerun only that fragment, as in the browser.
+# Reports rerun latency percentiles per interaction, CPU time and RSS per
+# session, and the users one process could serve at a given think time.
+#
+# Run from the repository root:
+#     python -m benchmarks.load_test
+#     python -m benchmarks.load_test --sessions 500 --processes 4
+
+import argparse
+import multiprocessing
+import os
+import random
+import statistics
+import tempfile
+import time
+from collections import defaultdict
+
+from streamlit.testing.v1 import AppTest
+
+from benchmarks.rerun_latency import cache_compiled_script, fragment_rerun
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT = os.path.join(ROOT, "main.py")
+PAGES = ("home", "dosha", "herbs", "routine", "symptoms")
+SEARCH_TERMS = ("ashwagandha", "tulsi", "brahmi", "sleep", "digestion", "ginger")
+SYMPTOMS = ("Anxiety", "Acidity", "Insomnia", "Joint Pain", "Constipation", "Headache")
+
+
+def rss_bytes() -> int:
+    """Resident set size of this process."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024  # peak, in KiB on Linux
+
+
+class Session:
+    """One simulated user: an AppTest instance plus the fragment of the page it is on."""
+
+    # AppTest scans installed packages for components on each instance's first
+    # run; the server does it once, so every session shares the first scan
+    components = None
+
+    def __init__(self, rng):
+        self.app = AppTest.from_file(SCRIPT, default_timeout=60)
+        self.app._bidi_component_manager = Session.components
+        self.rng = rng
+        self.fragment = None
+
+    def run(self):
+        self.app.run()
+        assert not self.app.exception, self.app.exception
+        Session.components = self.app._bidi_component_manager
+
+    def navigate(self, page):
+        # Only the destination page's fragment is registered during the navigation run
+        self.app._fragment_storage.clear()
+        self.app.button(key=f"nav_{page}").click()
+        self.run()
+        fragments = list(self.app._fragment_storage._fragments)
+        self.fragment = fragments[0] if fragments else None
+
+    def in_fragment(self):
+        """Rerun the current page's fragment, keeping the full page tree for later interactions."""
+        tree = self.app._tree
+        fragment_rerun(self.app, self.fragment)
+        self.app._tree = tree
+
+
+def navigation_flow(session):
+    for page in session.rng.sample(PAGES, len(PAGES)):
+        session.navigate(page)
+        yield "navigate"
+
+
+def quiz_flow(session):
+    session.navigate("dosha")
+    yield "navigate"
+    for i in range(5):
+        radio = session.app.radio(key=f"q_{i}")
+        radio.set_value(session.rng.choice(radio.options))
+        session.in_fragment()
+        yield "quiz answer"
+    session.app.button[[b.label for b in session.app.button].index("📊 Analyze My Dosha")].click()
+    session.run()
+    yield "quiz analyze"
+
+
+def search_flow(session):
+    session.navigate("herbs")
+    yield "navigate"
+    term = session.rng.choice(SEARCH_TERMS)
+    for length in range(1, len(term) + 1):
+        session.app.text_input[0].input(term[:length])
+        session.in_fragment()
+        yield "search keystroke"
+    session.app.text_input[0].input(term[:2])
+    session.in_fragment()
+    yield "search keystroke"
+    pages = session.app.number_input(key="herb_page") if len(session.app.number_input) else None
+    if pages is not None:
+        pages.increment()
+        session.in_fragment()
+        yield "search page"
+
+
+def symptom_flow(session):
+    session.navigate("symptoms")
+    yield "navigate"
+    session.app.multiselect[0].set_value(session.rng.sample(SYMPTOMS, session.rng.randint(1, 3)))
+    session.run()
+    yield "symptom select"
+    session.app.button[[b.label for b in session.app.button].index("🔍 Analyze Symptoms")].click()
+    session.run()
+    yield "symptom analyze"
+
+
+FLOWS = (navigation_flow, quiz_flow, search_flow, symptom_flow)
+
+
+def run_worker(sessions: int, seed: int) -> dict:
+    """Drive sessions simulated users to completion in this process."""
+    cache_compiled_script()
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ["AYURVEDA_DB_PATH"] = os.path.join(directory, "load.db")
+        os.environ["AYURVEDA_SESSION_BACKEND"] = "sqlite:///" + os.path.join(directory, "load-sessions.db")
+        os.environ["AYURVEDA_HISTORY_DIR"] = os.path.join(directory, "load-history")
+
+        # Warm the shared knowledge base and imports so they are not billed to the first session
+        warm = Session(rng)
+        warm.run()
+        for page in PAGES:
+            warm.navigate(page)
+        overhead = AppTest.from_string("", default_timeout=60)
+        overhead._bidi_component_manager = Session.components
+        overhead.run()
+        start = time.perf_counter()
+        overhead.run()
+        overhead = time.perf_counter() - start
+        rss_before = rss_bytes()
+        cpu_before = time.process_time()
+
+        latencies = defaultdict(list)
+        active = []
+        for _ in range(sessions):
+            session = Session(random.Random(rng.random()))
+            start = time.perf_counter()
+            session.run()
+            latencies["first render"].append(time.perf_counter() - start)
+            active.append((session, rng.choice(FLOWS)(session)))
+
+        while active:
+            still_active = []
+            for session, flow in active:
+                start = time.perf_counter()
+                interaction = next(flow, None)
+                if interaction is None:
+                    continue
+                latencies[interaction].append(time.perf_counter() - start)
+                still_active.append((session, flow))
+            active = still_active
+
+        return {
+            "sessions": sessions,
+            "latencies": dict(latencies),
+            "cpu": time.process_time() - cpu_before,
+            "rss": rss_bytes() - rss_before,
+            "overhead": overhead,
+        }
+
+
+def percentile(samples, fraction):
+    return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+
+
+def report(results, think_time):
+    latencies = defaultdict(list)
+    for result in results:
+        for interaction, samples in result["latencies"].items():
+            latencies[interaction].extend(samples)
+    all_reruns = sorted(sample for samples in latencies.values() for sample in samples)
+
+    print(f"{'interaction':<18} {'reruns':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for interaction, samples in sorted(latencies.items()) + [("all", all_reruns)]:
+        samples = sorted(samples)
+        print(f"{interaction:<18} {len(samples):>7} "
+              + " ".join(f"{percentile(samples, q) * 1e3:>8.1f}" for q in (0.5, 0.95, 0.99)))
+
+    sessions = sum(result["sessions"] for result in results)
+    cpu = sum(result["cpu"] for result in results)
+    rss = sum(result["rss"] for result in results)
+    cpu_per_rerun = cpu / len(all_reruns)
+    print(f"(latencies include about {results[0]['overhead'] * 1e3:.1f} ms of AppTest overhead per run)")
+    print()
+    print(f"{sessions} sessions in {len(results)} process(es)")
+    print(f"CPU per session:   {cpu / sessions * 1e3:.1f} ms ({cpu_per_rerun * 1e3:.2f} ms per rerun)")
+    print(f"RSS per session:   {rss / sessions / 1024:.1f} KiB")
+    print(f"One process serves about {think_time / cpu_per_rerun:,.0f} active users "
+          f"at one interaction every {think_time:g} s (CPU-bound, one core)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-session load test for the Streamlit app")
+    parser.add_argument("--sessions", type=int, default=200, help="simulated users in total")
+    parser.add_argument("--processes", type=int, default=1, help="worker processes to spread them over")
+    parser.add_argument("--think-time", type=float, default=5.0,
+                        help="seconds between a user's interactions, for the capacity estimate")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    shares = [args.sessions // args.processes + (i < args.sessions % args.processes)
+              for i in range(args.processes)]
+    if args.processes == 1:
+        results = [run_worker(shares[0], args.seed)]
+    else:
+        with multiprocessing.Pool(args.processes) as pool:
+            results = pool.starmap(run_worker, [(share, args.seed + i) for i, share in enumerate(shares)])
+    report(results, args.think_time)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# benchmarks/lookup_keys.py
+#
+# Normalized lookups: cost of a herb, dosha and remedy lookup by English,
+# Devanagari and Romanized names (first query and repeated query), next to
+# the old exact .lower().strip() dict lookup, and herb library search time
+# per script on a synthetic 10k-herb catalogue.
+#
+# Run from the repository root:
+#     python -m benchmarks.lookup_keys
+
+import shutil
+import tempfile
+import time
+
+from benchmarks.synthetic import make_store
+from text_keys import lookup_key
+from wellness_kb import AyurvedicKnowledgeBase
+
+REPEATS = 20000
+LOOKUPS = (
+    ("herb", "Ashwagandha"), ("herb", "अश्वगंधा"), ("herb", "ashvagandha"), ("herb", "haldi"),
+    ("dosha", "vata"), ("dosha", "वात"), ("remedy", "Headache"), ("remedy", "  HEADACHE "),
+)
+SEARCHES = ("ashwagandha", "ashvagandha", "अश्वगंधा", "हल्दी", "haldi", "sleep")
+
+
+def per_call_us(func, repeats=REPEATS):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        func()
+    return (time.perf_counter() - start) / repeats * 1e6
+
+
+def main():
+    kb = AyurvedicKnowledgeBase()
+    find = {
+        "herb": kb.find_herb,
+        "dosha": kb.get_dosha_info,
+        "remedy": kb.remedy_kb.get_remedy,
+    }
+    exact = {
+        "herb": lambda name: kb.herbs.get(name.lower().strip()),
+        "dosha": lambda name: kb.dosha_info.get(name.lower().strip()),
+        "remedy": lambda name: kb.remedy_kb.remedies.get(name.lower().strip()),
+    }
+    print(f"{'lookup':<22} {'found':>6} {'old found':>10} {'first us':>9} {'repeat us':>10} {'old us':>7}")
+    for kind, name in LOOKUPS:
+        lookup_key.cache_clear()
+        first = per_call_us(lambda: (lookup_key.cache_clear(), find[kind](name)), 2000)
+        repeat = per_call_us(lambda: find[kind](name))
+        old = per_call_us(lambda: exact[kind](name))
+        result = find[kind](name)
+        found = result is not None and not str(result).startswith("Sorry")
+        print(f"{kind + ' ' + name.strip():<22} {str(found):>6} {str(exact[kind](name) is not None):>10} "
+              f"{first:>9.2f} {repeat:>10.2f} {old:>7.2f}")
+
+    directory = tempfile.mkdtemp()
+    try:
+        index = AyurvedicKnowledgeBase(make_store(directory, herb_count=10000)).herb_search_index
+        print(f"\n{'search (10k herbs)':<22} {'matches':>8} {'top':>12} {'ms':>7}")
+        for query in SEARCHES:
+            herbs, total = index.search(query)
+            ms = per_call_us(lambda: index.search(query), 200) / 1e3
+            print(f"{query:<22} {total:>8} {herbs[0].name if herbs else '-':>12} {ms:>7.3f}")
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
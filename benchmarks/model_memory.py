@@ -0,0 +1,73 @@
+# benchmarks/model_memory.py
+#
+# Memory of 100k herbs and 100k user profiles held as plain dicts (the
+# previous representation, loaded from JSON) versus the slotted records in
+# models.py.
+#
+# Run from the repository root:
+#     python -m benchmarks.model_memory
+
+import gc
+import json
+import random
+import tracemalloc
+
+from benchmarks.synthetic import BENEFITS, DOSHA_FIELDS
+from models import AyurvedicHerb, UserProfile
+
+COUNT = 100000
+
+
+def herb_json(rng):
+    return json.dumps([
+        {
+            "name": f"Herb {i}",
+            "sanskrit": "",
+            "benefits": rng.sample(BENEFITS, 3),
+            "dosha": rng.choice(DOSHA_FIELDS),
+            "dosage": f"{rng.randint(1, 5)}g daily"
+        }
+        for i in range(COUNT)
+    ])
+
+
+def profile_json(rng):
+    return json.dumps([
+        {
+            "name": f"User {i}",
+            "age": rng.randint(18, 90),
+            "gender": rng.choice(("Male", "Female", "Other")),
+            "weight": rng.randint(40, 120)
+        }
+        for i in range(COUNT)
+    ])
+
+
+def retained(build, payload):
+    """Bytes still allocated after build(payload) returns, with the payload itself excluded."""
+    gc.collect()
+    tracemalloc.start()
+    result = build(payload)
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current
+
+
+def main():
+    rng = random.Random(3)
+    cases = (
+        ("herbs", herb_json(rng), AyurvedicHerb.from_dict),
+        ("profiles", profile_json(rng), UserProfile.from_dict),
+    )
+    print(f"{COUNT} records each")
+    print(f"{'':>10} {'dicts (MB)':>11} {'records (MB)':>13} {'reduction':>10}")
+    for name, payload, from_dict in cases:
+        as_dicts = retained(json.loads, payload)
+        as_records = retained(lambda text: [from_dict(item) for item in json.loads(text)], payload)
+        print(f"{name:>10} {as_dicts / 1e6:>11.1f} {as_records / 1e6:>13.1f} {as_dicts / as_records:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
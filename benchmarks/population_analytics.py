@@ -0,0 +1,94 @@
+# benchmarks/population_analytics.py
+#
+# Admin dashboard data for growing user counts: recomputing the dosha
+# distribution by scanning every stored result in the profile database,
+# versus reading the incrementally maintained counters. Also the cost of
+# counting one event and of merging a batch of counts into the table.
+#
+# Run from the repository root:
+#     python -m benchmarks.population_analytics
+
+import json
+import os
+import random
+import tempfile
+import time
+from collections import Counter
+
+from analytics import PopulationStats
+from profile_store import ProfileStore
+
+USER_COUNTS = (1000, 10000, 100000)
+SYMPTOMS = ("Headache", "Acidity", "Insomnia", "Anxiety", "Constipation", "Fatigue", "Cold", "Cough")
+HERBS = tuple(f"Herb {i}" for i in range(500))
+
+
+def result(rng):
+    vata, pitta = rng.uniform(0, 60), rng.uniform(0, 40)
+    percentages = {"vata": vata, "pitta": pitta, "kapha": 100 - vata - pitta}
+    return {"percentages": percentages, "primary": max(percentages, key=percentages.get)}
+
+
+def scan(store):
+    """What the dashboard would do without counters: read and tally every stored result."""
+    primary, bands = Counter(), Counter()
+    with store._conn_lock:
+        rows = store._conn.execute("SELECT dosha_results FROM users WHERE dosha_results IS NOT NULL").fetchall()
+    for (value,) in rows:
+        results = json.loads(value)
+        primary[results["primary"]] += 1
+        for dosha, pct in results["percentages"].items():
+            bands[dosha, int(pct // 10)] += 1
+    return primary, bands
+
+
+def best_ms(func, repeats=5):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def main():
+    rng = random.Random(0)
+    print(f"{'users':>8} {'scan ms':>10} {'counters ms':>12} {'cached ms':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.db")
+        profiles = ProfileStore(path)
+        stats = PopulationStats(path)
+        users = 0
+        for count in USER_COUNTS:
+            for i in range(users, count):
+                results = result(rng)
+                profiles.save(f"user{i}", dosha_results=results)
+                stats.record_analysis(results)
+                stats.record_symptom_check(rng.sample(SYMPTOMS, 2))
+                stats.record_herb_view(rng.choice(HERBS))
+            users = count
+            profiles.flush()
+            stats.flush()
+
+            def uncached():
+                stats._snapshot = None
+                stats.snapshot()
+
+            print(f"{count:>8} {best_ms(lambda: scan(profiles)):>10.2f} {best_ms(uncached):>12.3f} "
+                  f"{best_ms(stats.snapshot):>10.4f}")
+
+        events = 100000
+        start = time.perf_counter()
+        for i in range(events):
+            stats.record_herb_view(HERBS[i % len(HERBS)])
+        record_us = (time.perf_counter() - start) / events * 1e6
+        start = time.perf_counter()
+        stats.flush()
+        flush_ms = (time.perf_counter() - start) * 1000
+        print(f"\ncount one event: {record_us:.2f} us; merge {events} events ({len(HERBS) + 1} counters): {flush_ms:.1f} ms")
+        stats.close()
+        profiles.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# benchmarks/profile_store.py
+#
+# Cost of a save as seen by a page rerun: the write-behind ProfileStore
+# versus committing every save immediately, plus the return-visit load.
+#
+# Run from the repository root:
+#     python -m benchmarks.profile_store
+
+import os
+import tempfile
+import time
+
+from profile_store import ProfileStore
+
+SAVES = 20000
+USERS = 5000
+
+PROFILE = {"name": "Asha", "age": 30, "dosha_type": "vata", "gender": "Female", "weight": 60}
+RESULTS = {"percentages": {"vata": 60.0, "pitta": 20.0, "kapha": 20.0}, "primary": "vata"}
+
+
+def per_save(save):
+    start = time.perf_counter()
+    for i in range(SAVES):
+        save(f"user{i % USERS}", profile=PROFILE, dosha_results=RESULTS)
+    return (time.perf_counter() - start) / SAVES
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        store = ProfileStore(os.path.join(directory, "bench.db"))
+
+        def save_now(user_id, **fields):
+            store.save(user_id, **fields)
+            store.flush()
+
+        immediate = per_save(save_now)
+        behind = per_save(store.save)
+        start = time.perf_counter()
+        store.flush()
+        drain = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for i in range(USERS):
+            store.load(f"user{i}")
+        load = (time.perf_counter() - start) / USERS
+        store.close()
+
+    print(f"{SAVES} saves over {USERS} users")
+    print(f"commit per save:     {immediate * 1e6:>8.1f} us/save")
+    print(f"write-behind save:   {behind * 1e6:>8.1f} us/save (final batch flushed in {drain * 1e3:.1f} ms)")
+    print(f"return-visit load:   {load * 1e6:>8.1f} us/load")
+
+
+if __name__ == "__main__":
+    main()
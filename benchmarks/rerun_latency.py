@@ -0,0 +1,113 @@
+# benchmarks/rerun_latency.py
+#
+# Per-interaction rerun cost of the Streamlit app: a quiz answer, a search
+# keystroke and a sidebar navigation click. Interactions inside a fragment
+# are timed both as a full script rerun and as a fragment-only rerun (what
+# the browser requests); navigation is timed as one click, including any
+# st.rerun() it triggers. As on a real server the compiled script is cached
+# across runs, and the cost of an empty AppTest run is subtracted so only
+# the script's own work is reported.
+#
+# Run from the repository root:
+#     python -m benchmarks.rerun_latency
+#     python -m benchmarks.rerun_latency --script old_main.py   # compare another version
+
+import argparse
+import functools
+import os
+import statistics
+import tempfile
+import time
+from unittest import mock
+
+from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+from streamlit.runtime.scriptrunner_utils.script_requests import RerunData
+from streamlit.testing.v1 import AppTest, local_script_runner
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPEATS = 30
+SEARCHES = ("a", "as", "ash", "ashw", "tul", "tulsi", "br", "bra", "brah", "neem")
+
+
+def timed(run):
+    """Median milliseconds of REPEATS calls of run(i)."""
+    samples = []
+    for i in range(REPEATS):
+        start = time.perf_counter()
+        run(i)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1e3
+
+
+def cache_compiled_script():
+    """AppTest recompiles the script on every run; make it compile once, as the server does."""
+    mock.patch.object(local_script_runner, "ScriptCache", return_value=ScriptCache()).start()
+
+
+def open_page(app, page):
+    """Navigate to page with a full run; return the id of the fragment it registers, if any."""
+    app.run()  # a fragment rerun leaves only the fragment's elements in the tree
+    app._fragment_storage.clear()
+    app.button(key=f"nav_{page}").click().run()
+    assert not app.exception, app.exception
+    fragments = list(app._fragment_storage._fragments)
+    return fragments[0] if fragments else None
+
+
+def fragment_rerun(app, fragment_id):
+    """Run the app as the browser does for a widget inside fragment_id."""
+    with mock.patch.object(local_script_runner, "RerunData",
+                           functools.partial(RerunData, fragment_id_queue=[fragment_id])):
+        app.run()
+    assert not app.exception, app.exception
+
+
+def interactions(app):
+    """Yield (name, full rerun ms, fragment rerun ms or None)."""
+    fragment = open_page(app, "dosha")
+
+    def answer(i):
+        radio = app.radio(key="q_0")
+        radio.set_value(radio.options[i % len(radio.options)])
+
+    full = timed(lambda i: (answer(i), app.run()))
+    partial = timed(lambda i: (answer(i), fragment_rerun(app, fragment))) if fragment else None
+    yield "quiz answer", full, partial
+
+    fragment = open_page(app, "herbs")
+    search = lambda i: app.text_input[0].input(SEARCHES[i % len(SEARCHES)])
+    full = timed(lambda i: (search(i), app.run()))
+    partial = timed(lambda i: (search(i), fragment_rerun(app, fragment))) if fragment else None
+    yield "search keystroke", full, partial
+
+    app.run()
+    pages = ("home", "herbs")
+    yield "sidebar navigation", timed(lambda i: app.button(key=f"nav_{pages[i % 2]}").click().run()), None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streamlit rerun latency per interaction")
+    parser.add_argument("--script", default=os.path.join(ROOT, "main.py"), help="app script to measure")
+    args = parser.parse_args()
+
+    cache_compiled_script()
+
+    empty = AppTest.from_string("", default_timeout=60).run()
+    overhead = timed(lambda i: empty.run())
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ["AYURVEDA_DB_PATH"] = os.path.join(directory, "bench.db")
+        os.environ["AYURVEDA_SESSION_BACKEND"] = "sqlite:///" + os.path.join(directory, "bench-sessions.db")
+        os.environ["AYURVEDA_HISTORY_DIR"] = os.path.join(directory, "bench-history")
+        app = AppTest.from_file(os.path.abspath(args.script), default_timeout=60).run()
+        assert not app.exception, app.exception
+
+        print(f"AppTest overhead of {overhead:.1f} ms per run subtracted")
+        print(f"{'interaction':<20} {'full rerun ms':>14} {'fragment ms':>12}")
+        for name, full, partial in interactions(app):
+            partial = f"{partial - overhead:>12.1f}" if partial is not None else f"{'-':>12}"
+            print(f"{name:<20} {full - overhead:>14.1f} {partial}")
+
+
+if __name__ == "__main__":
+    main()
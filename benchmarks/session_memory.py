@@ -0,0 +1,45 @@
+# benchmarks/session_memory.py
+#
+# Per-session memory of the knowledge base: a private AyurvedicKnowledgeBase
+# per session (the old behaviour) versus a reference to the shared instance.
+#
+# Run from the repository root:
+#     python -m benchmarks.session_memory
+
+import time
+import tracemalloc
+
+from wellness_kb import AyurvedicKnowledgeBase, shared_knowledge_base
+
+SESSIONS = 1000
+
+
+def measure(make_kb):
+    """Return (bytes per session, seconds per session) for SESSIONS simulated sessions."""
+    sessions = []
+    tracemalloc.start()
+    start = time.perf_counter()
+    for _ in range(SESSIONS):
+        sessions.append({"kb": make_kb(), "user_profile": None, "dosha_results": None, "current_page": "home"})
+    elapsed = time.perf_counter() - start
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return allocated / SESSIONS, elapsed / SESSIONS
+
+
+def main():
+    # Load the shared instance up front, as the server does on its first request
+    shared_knowledge_base().load_all()
+
+    private_bytes, private_time = measure(lambda: AyurvedicKnowledgeBase().load_all())
+    shared_bytes, shared_time = measure(shared_knowledge_base)
+
+    print(f"{SESSIONS} sessions")
+    print(f"{'':>16} {'bytes/session':>14} {'us/session':>11}")
+    print(f"{'private kb':>16} {private_bytes:>14.0f} {private_time * 1e6:>11.1f}")
+    print(f"{'shared kb':>16} {shared_bytes:>14.0f} {shared_time * 1e6:>11.1f}")
+    print(f"reduction: {private_bytes / shared_bytes:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
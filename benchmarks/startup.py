@@ -0,0 +1,88 @@
+# benchmarks/startup.py
+#
+# Cold-start cost: import time of each module and time-to-first-render of
+# each page, every measurement in a fresh interpreter. Also lists which
+# heavy dependencies each step pulled in. Each page is opened the way a
+# returning tab is: its live session, already on that page, is stored in
+# the session backend and the app is opened with its ?uid= and ?sid=.
+#
+# Run from the repository root:
+#     python -m benchmarks.startup
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES = ("wellness_kb", "knowledge_base", "utils", "questionnaire", "herb_search", "api")
+PAGES = ("home", "dosha", "herbs", "routine", "symptoms")
+HEAVY = ("numpy", "pandas", "plotly.graph_objects")
+RUNS = 3
+
+IMPORT_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"ms": elapsed * 1e3, "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+# Streamlit itself is imported before timing: the page cost is what main.py adds
+RENDER_SCRIPT = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+before = set(sys.modules)
+from session_backend import session_key, shared_session_backend
+uid, sid = "0" * 32, "{page_number:032x}"
+dosha_results = {{"percentages": {{"vata": 60.0, "pitta": 20.0, "kapha": 20.0}}, "primary": "vata"}}
+shared_session_backend().save(session_key(uid, sid), {{
+    "current_page": {page!r}, "user_profile": None, "routine": None,
+    "dosha_results": dosha_results if {page!r} == "routine" else None,
+}})
+app = AppTest.from_file("main.py", default_timeout=60)
+app.query_params["uid"], app.query_params["sid"] = uid, sid
+start = time.perf_counter()
+app.run()
+elapsed = time.perf_counter() - start
+assert not app.exception, app.exception
+assert app.session_state.current_page == {page!r}
+loaded = set(sys.modules) - before
+print(json.dumps({{"ms": elapsed * 1e3, "heavy": [m for m in {heavy!r} if m in loaded]}}))
+"""
+
+
+def measure(script, env):
+    """Run script in RUNS fresh interpreters and return (best ms, heavy modules loaded)."""
+    results = []
+    for _ in range(RUNS):
+        output = subprocess.run(
+            [sys.executable, "-c", script], cwd=ROOT, env=env, capture_output=True, text=True, check=True
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+    return min(result["ms"] for result in results), results[0]["heavy"]
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        env = {
+            **os.environ,
+            "AYURVEDA_DB_PATH": os.path.join(directory, "startup.db"),
+            "AYURVEDA_SESSION_BACKEND": "sqlite:///" + os.path.join(directory, "startup-sessions.db"),
+            "AYURVEDA_HISTORY_DIR": os.path.join(directory, "startup-history"),
+        }
+        print(f"{'import':<28} {'ms':>8}  heavy modules loaded")
+        for module in MODULES:
+            ms, heavy = measure(IMPORT_SCRIPT.format(module=module, heavy=HEAVY), env)
+            print(f"{module:<28} {ms:>8.1f}  {', '.join(heavy) or '-'}")
+
+        print()
+        print(f"{'first render':<28} {'ms':>8}  heavy modules loaded")
+        for page_number, page in enumerate(PAGES, 1):
+            ms, heavy = measure(RENDER_SCRIPT.format(page=page, page_number=page_number, heavy=HEAVY), env)
+            print(f"{page:<28} {ms:>8.1f}  {', '.join(heavy) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
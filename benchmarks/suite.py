@@ -0,0 +1,165 @@
+# benchmarks/suite.py
+#
+# Micro-benchmarks for the knowledge base and scoring hot paths on synthetic
+# knowledge bases from 5 to 100k herbs. Reports throughput and peak
+# allocation per call, can save the results as a JSON baseline, and flags
+# regressions against a saved baseline.
+#
+# Run from the repository root:
+#     python -m benchmarks.suite --save            # record benchmarks/baseline.json
+#     python -m benchmarks.suite                   # compare against it
+#     python -m benchmarks.suite --scales 5 1000   # subset of scales
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+import knowledge_base
+import utils
+from benchmarks.synthetic import make_store
+from dosha_outcomes import DoshaOutcomeCache
+from questionnaire import DOSHA_QUIZ
+from wellness_kb import AyurvedicKnowledgeBase
+
+SCALES = (5, 100, 1000, 10000, 100000)
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+ROUNDS = 5
+ROUND_TIME = 0.05
+DEFAULT_THRESHOLD = 0.2
+
+SYMPTOMS = ["Anxiety", "Acidity", "Insomnia", "Joint Pain", "Constipation"]
+QUIZ_RESPONDENTS = 10000
+
+
+def measure(func):
+    """
+    Return (calls per second, peak bytes allocated by one call).
+    Throughput is the best of ROUNDS timed rounds to damp scheduler noise.
+    """
+    func()  # warm caches and lazy sections before timing
+    best = 0.0
+    for _ in range(ROUNDS):
+        calls = 0
+        start = time.perf_counter()
+        while True:
+            func()
+            calls += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= ROUND_TIME:
+                break
+        best = max(best, calls / elapsed)
+
+    tracemalloc.start()
+    baseline_memory, _ = tracemalloc.get_traced_memory()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, max(peak - baseline_memory, 0)
+
+
+def scaled_cases(scale, directory):
+    """Cases whose cost depends on the size of the knowledge base."""
+    store = make_store(directory, herb_count=scale, remedy_count=scale)
+    kb = AyurvedicKnowledgeBase(store).load_all().freeze()
+    remedy_kb = knowledge_base.AyurvedicKnowledgeBase(store)
+    return {
+        "analyze_symptoms": lambda: kb.analyze_symptoms(SYMPTOMS),
+        "get_recommended_herbs": lambda: kb.get_recommended_herbs(SYMPTOMS),
+        "get_all_herbs": kb.get_all_herbs,
+        "get_remedy": lambda: remedy_kb.get_remedy("Headache"),
+    }
+
+
+def fixed_cases():
+    """Cases that do not depend on the size of the knowledge base."""
+    rng = np.random.default_rng(0)
+    respondents = rng.integers(0, 3, (QUIZ_RESPONDENTS, len(DOSHA_QUIZ.questions)))
+    scores = {"Vata": 40, "Pitta": 35, "Kapha": 25}
+    outcomes = DoshaOutcomeCache(DOSHA_QUIZ)
+    outcomes.warm()
+    return {
+        "quiz_analyze": lambda: DOSHA_QUIZ.analyze([0, 1, 2, 0, 1]),
+        "quiz_outcome_cached": lambda: outcomes.get([0, 1, 2, 0, 1]).chart_json,
+        f"quiz_percentages_x{QUIZ_RESPONDENTS}": lambda: DOSHA_QUIZ.percentages(respondents),
+        "calculate_prakriti": lambda: utils.calculate_prakriti(scores),
+        "generate_dosha_chart": lambda: utils.generate_dosha_chart(scores),
+    }
+
+
+def run(scales):
+    results = {}
+    for name, func in fixed_cases().items():
+        results[name] = measure(func)
+        report(name, *results[name])
+    for scale in scales:
+        directory = tempfile.mkdtemp()
+        try:
+            for name, func in scaled_cases(scale, directory).items():
+                key = f"{name}[{scale}]"
+                results[key] = measure(func)
+                report(key, *results[key])
+        finally:
+            shutil.rmtree(directory)
+    return {key: {"ops_per_sec": ops, "peak_bytes": peak} for key, (ops, peak) in results.items()}
+
+
+def report(name, ops, peak):
+    print(f"{name:<34} {ops:>14,.0f} {peak:>12,}")
+
+
+def compare(results, baseline, threshold):
+    """
+    Print the cases that got slower or allocate more than threshold allows
+    and return how many regressed.
+    """
+    regressions = 0
+    for key, current in results.items():
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+        slower = current["ops_per_sec"] < previous["ops_per_sec"] * (1 - threshold)
+        heavier = current["peak_bytes"] > previous["peak_bytes"] * (1 + threshold) + 1024
+        if slower or heavier:
+            regressions += 1
+            print(f"REGRESSION {key}: "
+                  f"{previous['ops_per_sec']:,.0f} -> {current['ops_per_sec']:,.0f} ops/s, "
+                  f"{previous['peak_bytes']:,} -> {current['peak_bytes']:,} peak bytes")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Knowledge base micro-benchmarks")
+    parser.add_argument("--scales", type=int, nargs="+", default=SCALES, help="herb counts to benchmark")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline JSON file")
+    parser.add_argument("--save", action="store_true", help="save the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed fractional slowdown before a case is flagged")
+    args = parser.parse_args()
+
+    print(f"{'case':<34} {'ops/s':>14} {'peak bytes':>12}")
+    results = run(args.scales)
+
+    if args.save:
+        with open(args.baseline, "w") as f:
+            json.dump({"python": sys.version.split()[0], "machine": platform.machine(), "results": results},
+                      f, indent=2)
+            f.write("\n")
+        print(f"Saved baseline to {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        print(f"{regressions} regression(s) beyond {args.threshold:.0%} against {args.baseline}")
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
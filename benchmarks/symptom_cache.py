@@ -0,0 +1,110 @@
+# benchmarks/symptom_cache.py
+#
+# Symptom checker clicks on the shared result cache: computing the result
+# as every click used to, a cache miss and a cache hit, on the bundled
+# knowledge base and on a synthetic one with 10k remedies. First checks that
+# cached results equal the symptom matcher's analysis of the same list,
+# repeated symptoms and any capitalization included. Also counts how often
+# 16 threads asking for the same uncached symptoms at once compute them.
+#
+# Run from the repository root:
+#     python -m benchmarks.symptom_cache
+
+import random
+import tempfile
+import threading
+import time
+
+from benchmarks.synthetic import make_store
+from wellness_kb import AyurvedicKnowledgeBase
+
+CLICKS = 20000
+THREADS = 16
+EQUIVALENCE_LISTS = 3000
+
+
+def per_click_us(func, selections):
+    start = time.perf_counter()
+    for selection in selections:
+        func(selection)
+    return (time.perf_counter() - start) / len(selections) * 1e6
+
+
+def equivalence(kb):
+    """Compare check() with the uncached symptom matcher on lists with repeats, in any case."""
+    index = kb.symptom_index
+    rng = random.Random(1)
+    spellings = [spelling for name in index.names for spelling in (name, name.upper(), name.lower())]
+    spellings += ["heat", "lethargy", "restless nights"]  # not indexed, scored from their text
+    index.results.clear()
+    differing = 0
+    for _ in range(EQUIVALENCE_LISTS):
+        selection = rng.choices(spellings, k=rng.randint(1, 5))
+        result = index.check(selection)
+        expected = kb.symptom_matcher.analyze(selection)
+        if (result["dosha_probabilities"] != expected["dosha_probabilities"]
+                or result["primary_dosha"] != expected["primary_dosha"]):
+            differing += 1
+    print(f"{EQUIVALENCE_LISTS} symptom lists with repeats: {differing} differ from the symptom matcher\n")
+
+
+def measure(label, kb):
+    index = kb.symptom_index
+    rng = random.Random(0)
+    # Most users pick one to three of the first ten symptoms
+    options = index.names[:10]
+    selections = [rng.sample(options, rng.randint(1, 3)) for _ in range(CLICKS)]
+
+    def miss(selection):
+        index.results.clear()
+        index.check(selection)
+
+    uncached = per_click_us(lambda selection: index.results.compute(index.canonical_key(selection)), selections)
+    missed = per_click_us(miss, selections)
+    index.results.clear()
+    for selection in selections:
+        index.check(selection)
+    hit = per_click_us(index.check, selections)
+    print(f"{label:<22} {uncached:>12.1f} {missed:>10.1f} {hit:>8.1f} {len(index.results):>14}")
+
+
+def coalescing(kb):
+    index = kb.symptom_index
+    compute = index.results.compute
+    calls = []
+
+    def slow_compute(key):
+        calls.append(key)
+        time.sleep(0.05)  # a slow analysis, so the threads overlap
+        return compute(key)
+
+    index.results.clear()
+    index.results.compute = slow_compute
+    barrier = threading.Barrier(THREADS)
+
+    def click():
+        barrier.wait()
+        index.check(["Headache", "Acidity"])
+
+    threads = [threading.Thread(target=click) for _ in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    index.results.compute = compute
+    print(f"\n{THREADS} concurrent identical clicks: {len(calls)} computation, "
+          f"{index.results.info()['coalesced']} coalesced")
+
+
+def main():
+    bundled = AyurvedicKnowledgeBase().freeze()
+    equivalence(bundled)
+    print(f"{'knowledge base':<22} {'uncached us':>12} {'miss us':>10} {'hit us':>8} {'distinct lists':>14}")
+    measure("bundled", bundled)
+    with tempfile.TemporaryDirectory() as directory:
+        measure("10k remedies", AyurvedicKnowledgeBase(make_store(directory, 1000, 10000)).freeze())
+    coalescing(bundled)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# benchmarks/symptom_matcher.py
+#
+# Compares the compiled keyword matcher with the original per-keyword
+# substring loop as the keyword vocabulary grows.
+#
+# Run from the repository root:
+#     python -m benchmarks.symptom_matcher
+
+import random
+import string
+import time
+
+from symptom_matcher import SymptomMatcher
+
+DOSHAS = ("vata", "pitta", "kapha")
+KEYWORD_COUNTS = (15, 150, 1500, 6000)
+SYMPTOM_LISTS = 2000
+
+
+def naive_analyze(keywords_by_dosha, symptoms):
+    """The original analyze_symptoms loop, kept as the reference implementation."""
+    dosha_scores = {dosha: 0 for dosha in keywords_by_dosha}
+    for symptom in symptoms:
+        symptom_lower = symptom.lower()
+        for dosha, keywords in keywords_by_dosha.items():
+            for keyword in keywords:
+                if keyword in symptom_lower:
+                    dosha_scores[dosha] += 1
+
+    primary_dosha = max(dosha_scores, key=dosha_scores.get) if sum(dosha_scores.values()) > 0 else DOSHAS[0]
+    total = max(sum(dosha_scores.values()), 1)
+    return {
+        "dosha_probabilities": {dosha: score / total for dosha, score in dosha_scores.items()},
+        "primary_dosha": primary_dosha
+    }
+
+
+def make_keywords(rng, count):
+    keywords = {dosha: [] for dosha in DOSHAS}
+    for i in range(count):
+        word = "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 10)))
+        keywords[DOSHAS[i % len(DOSHAS)]].append(word)
+    return keywords
+
+
+def make_symptom_lists(rng, keywords_by_dosha, count):
+    vocabulary = [keyword for keywords in keywords_by_dosha.values() for keyword in keywords]
+    filler = ["pain", "Feeling", "at night", "after meals", "mild", "Severe"]
+    lists = []
+    for _ in range(count):
+        symptoms = []
+        for _ in range(rng.randint(1, 5)):
+            words = rng.sample(filler, 2) + [rng.choice(vocabulary).capitalize()]
+            rng.shuffle(words)
+            symptoms.append(" ".join(words))
+        lists.append(symptoms)
+    return lists
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    rng = random.Random(42)
+    print(f"{'keywords':>9} {'naive (s)':>10} {'compiled (s)':>13} {'batch (s)':>10} {'speedup':>8}")
+    for keyword_count in KEYWORD_COUNTS:
+        keywords_by_dosha = make_keywords(rng, keyword_count)
+        symptom_lists = make_symptom_lists(rng, keywords_by_dosha, SYMPTOM_LISTS)
+
+        matcher = SymptomMatcher(keywords_by_dosha)
+        expected, naive_time = timed(lambda: [naive_analyze(keywords_by_dosha, s) for s in symptom_lists])
+        single, compiled_time = timed(lambda: [matcher.analyze(s) for s in symptom_lists])
+        batch, batch_time = timed(matcher.analyze_batch, symptom_lists)
+
+        assert single == expected and batch == expected, "compiled matcher disagrees with reference"
+        print(f"{keyword_count:>9} {naive_time:>10.4f} {compiled_time:>13.4f} {batch_time:>10.4f} "
+              f"{naive_time / batch_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+# benchmarks/synthetic.py
+#
+# Synthetic knowledge bases for benchmarks, scaled from the shipped data.
+
+import random
+import string
+
+from kb_store import KnowledgeStore
+
+DOSHA_FIELDS = ("Vata", "Pitta", "Kapha", "Vata, Pitta", "Pitta, Kapha", "Kapha, Vata", "All doshas")
+BENEFITS = ("Stress Relief", "Better Sleep", "Energy Boost", "Digestive Aid", "Calms Mind",
+            "Detoxifier", "Anti-inflammatory", "Memory Boost", "Clears Congestion")
+
+
+def make_store(directory: str, herb_count: int, remedy_count: int = None, seed: int = 0) -> KnowledgeStore:
+    """
+    Write a knowledge base with herb_count herbs (the shipped herbs first,
+    then generated ones) and remedy_count remedies into directory.
+    """
+    rng = random.Random(seed)
+    source = KnowledgeStore()
+    store = KnowledgeStore(directory)
+    for section in ("dosha_info", "foods", "yoga_asanas", "routines", "symptom_keywords", "symptoms", "dinacharya"):
+        store.save(section, source.load(section))
+
+    herbs = dict(list(source.load("herbs").items())[:herb_count])
+    while len(herbs) < herb_count:
+        name = "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(5, 12)))
+        herbs[f"{name}{len(herbs)}"] = {
+            "name": name.capitalize(),
+            "sanskrit": "",
+            "benefits": rng.sample(BENEFITS, 3),
+            "dosha": rng.choice(DOSHA_FIELDS),
+            "dosage": f"{rng.randint(1, 5)}g daily"
+        }
+    store.save("herbs", herbs)
+
+    remedies = source.load("remedies")
+    for i in range(len(remedies), remedy_count or len(remedies)):
+        remedies[f"symptom {i}"] = f"Remedy {i}"
+    store.save("remedies", remedies)
+    return store
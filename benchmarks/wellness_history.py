@@ -0,0 +1,89 @@
+# benchmarks/wellness_history.py
+#
+# Wellness history of one user with ten years of daily dosha analyses and
+# symptom checks: loading it cold from the column files, a rerun of the
+# journey page (up-to-date check plus summaries), appending an entry, and
+# the trend chart with and without downsampling. For comparison, the same
+# history kept as a JSON list, as it would be in a profile field.
+#
+# Run from the repository root:
+#     python -m benchmarks.wellness_history
+
+import json
+import random
+import shutil
+import tempfile
+import time
+
+from wellness_history import ASSESSMENT, DAY, HistoryStore
+
+YEARS = 10
+REPEATS = 200
+
+
+def per_call_ms(func, repeats=REPEATS):
+    start = time.perf_counter()
+    for i in range(repeats):
+        func(i)
+    return (time.perf_counter() - start) / repeats * 1000
+
+
+def main():
+    root = tempfile.mkdtemp()
+    try:
+        rng = random.Random(0)
+        store = HistoryStore(root)
+        history = store.history("bench")
+        start = time.time() - YEARS * 365 * DAY
+        entries = []
+        for day in range(YEARS * 365):
+            vata = rng.uniform(20, 50)
+            pitta = rng.uniform(20, 50)
+            percentages = {"vata": vata, "pitta": pitta, "kapha": 100 - vata - pitta}
+            symptoms = rng.sample(["Headache", "Acidity", "Insomnia", "Anxiety", "Constipation"], 2)
+            probabilities = {dosha: value / 100 for dosha, value in percentages.items()}
+            history.append_assessment(percentages, when=start + day * DAY)
+            history.append_checkin(symptoms, probabilities, when=start + day * DAY + 3600)
+            entries.append({"time": start + day * DAY, "percentages": percentages})
+            entries.append({"time": start + day * DAY + 3600, "symptoms": symptoms, "probabilities": probabilities})
+        as_json = json.dumps(entries)
+
+        def json_load(i):
+            loaded = json.loads(as_json)
+            recent = [entry["percentages"] for entry in loaded[-60:] if "percentages" in entry]
+            return {dosha: sum(p[dosha] for p in recent) / len(recent) for dosha in recent[0]}
+
+        def summaries(history):
+            history.assessments.latest(), history.assessments.trend(), history.checkins.trend()
+            history.symptom_counts(since=time.time() - 90 * DAY)
+
+        def chart_full(i):
+            import utils
+            series = history.assessments
+            utils.generate_trend_chart(series.times.tolist(), dict(zip("vpk", series.rolling().T.tolist())), "").to_json()
+
+        def chart_downsampled(i):
+            history._charts.clear()
+            history.chart(ASSESSMENT).to_json()
+
+        history.chart(ASSESSMENT)
+        rows = [
+            ("JSON list in a profile: parse + 30-day mean", per_call_ms(json_load, 20)),
+            ("cold load from column files", per_call_ms(lambda i: HistoryStore(root).history("bench"), 20)),
+            ("journey rerun: refresh + summaries", per_call_ms(lambda i: summaries(store.history("bench")))),
+            ("append one check-in", per_call_ms(
+                lambda i: history.append_checkin(["Headache"], {"vata": 0.5, "pitta": 0.3, "kapha": 0.2}))),
+            (f"chart, all {len(history.assessments)} points", per_call_ms(chart_full, 10)),
+            ("chart, downsampled", per_call_ms(chart_downsampled, 10)),
+            ("chart, cached", per_call_ms(lambda i: history.chart(ASSESSMENT), 10000)),
+        ]
+        print(f"{len(history)} entries over {YEARS} years")
+        print(f"{'case':<46} {'ms per call':>12}")
+        for name, ms in rows:
+            print(f"{name:<46} {ms:>12.3f}")
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
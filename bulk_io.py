@@ -0,0 +1,263 @@
+# bulk_io.py
+#
+# Streaming bulk import and export of herbs and remedies as JSONL or CSV.
+#
+#     python bulk_io.py import herbs new_herbs.jsonl
+#     python bulk_io.py import remedies remedies.csv
+#     python bulk_io.py export herbs herbs.csv
+#
+# Input is read, validated and normalized one chunk of records at a time, so
+# memory does not grow with the size of the input file. Valid records are
+# merged into the section and written once at the end; the shared knowledge
+# base then reloads and rebuilds its indexes once, for the whole import.
+# Invalid records are skipped and reported by record number.
+
+import argparse
+import csv
+import itertools
+import json
+import sys
+
+from dosha_index import ALL_DOSHAS, DOSHA_BITS, parse_doshas
+from kb_store import KnowledgeStore
+
+# Records validated and merged per step
+CHUNK_SIZE = 10000
+
+# Errors kept in a report; later ones are only counted
+MAX_REPORTED_ERRORS = 1000
+
+MAX_FIELD_LENGTH = 2000
+
+FIELDS = {
+    "herbs": ("key", "name", "sanskrit", "benefits", "dosha", "dosage", "aliases"),
+    "remedies": ("symptom", "remedy"),
+}
+
+# List fields, and their separator in CSV files
+LIST_FIELDS = ("benefits", "aliases")
+LIST_SEPARATOR = ";"
+
+
+class ImportReport:
+    """Counts of an import and the errors of its rejected records."""
+
+    def __init__(self, section: str):
+        self.section = section
+        self.read = 0
+        self.added = 0
+        self.updated = 0
+        self.errors = []  # (record number, message), at most MAX_REPORTED_ERRORS
+        self.failed = 0
+
+    def error(self, record_number: int, message: str):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((record_number, message))
+
+    def summary(self) -> str:
+        lines = [f"{self.section}: {self.read} records read, {self.added} added, "
+                 f"{self.updated} updated, {self.failed} rejected"]
+        lines += [f"  record {number}: {message}" for number, message in self.errors]
+        if self.failed > len(self.errors):
+            lines.append(f"  ... and {self.failed - len(self.errors)} more")
+        return "\n".join(lines)
+
+    def to_dict(self) -> dict:
+        return {
+            "section": self.section,
+            "read": self.read,
+            "added": self.added,
+            "updated": self.updated,
+            "failed": self.failed,
+            "errors": [{"record": number, "error": message} for number, message in self.errors]
+        }
+
+
+def _text(record: dict, field: str, required: bool = False) -> str:
+    value = record.get(field)
+    if value is None or value == "":
+        if required:
+            raise ValueError(f"'{field}' is required.")
+        return ""
+    if not isinstance(value, str):
+        raise ValueError(f"'{field}' must be a string.")
+    value = " ".join(value.split())
+    if len(value) > MAX_FIELD_LENGTH:
+        raise ValueError(f"'{field}' is longer than {MAX_FIELD_LENGTH} characters.")
+    if required and not value:
+        raise ValueError(f"'{field}' is required.")
+    return value
+
+
+def _list(record: dict, field: str) -> list:
+    values = record.get(field) or []
+    if isinstance(values, str):
+        values = values.split(LIST_SEPARATOR)
+    if not isinstance(values, list) or not all(isinstance(value, str) for value in values):
+        raise ValueError(f"'{field}' must be a list of strings.")
+    return list(dict.fromkeys(" ".join(value.split()) for value in values if value.strip()))
+
+
+def normalize_herb(record: dict):
+    """Validate a herb record and return (key, herb dict) in the stored format."""
+    name = _text(record, "name", required=True)
+    key = _text(record, "key").lower() or name.lower()
+
+    benefits = _list(record, "benefits")
+    mask = parse_doshas(_text(record, "dosha", required=True))
+    if not mask:
+        raise ValueError(f"'dosha' must name Vata, Pitta, Kapha or all doshas, not '{record['dosha']}'.")
+    dosha = "All doshas" if mask == ALL_DOSHAS else ", ".join(
+        name.title() for name, bit in DOSHA_BITS.items() if mask & bit
+    )
+    return key, {
+        "name": name,
+        "sanskrit": _text(record, "sanskrit"),
+        "benefits": benefits,
+        "dosha": dosha,
+        "dosage": _text(record, "dosage"),
+        "aliases": _list(record, "aliases")
+    }
+
+
+def normalize_remedy(record: dict):
+    """Validate a remedy record and return (symptom key, remedy)."""
+    return _text(record, "symptom", required=True).lower(), _text(record, "remedy", required=True)
+
+
+NORMALIZERS = {"herbs": normalize_herb, "remedies": normalize_remedy}
+
+
+def file_format(path: str, format: str = None) -> str:
+    if format:
+        return format
+    if path.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    if path.endswith(".csv"):
+        return "csv"
+    raise ValueError(f"Cannot tell the format of '{path}'; pass jsonl or csv.")
+
+
+def read_records(f, format: str):
+    """
+    Yield (record number, record dict or ValueError) for each record of an
+    open JSONL or CSV file, without reading the file into memory.
+    """
+    if format == "jsonl":
+        number = 0
+        for line in f:
+            if not line.strip():
+                continue
+            number += 1
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                yield number, ValueError(f"invalid JSON ({e})")
+                continue
+            yield number, record if isinstance(record, dict) else ValueError("not a JSON object")
+    elif format == "csv":
+        for number, record in enumerate(csv.DictReader(f), 1):
+            if None in record:
+                yield number, ValueError("more values than columns")
+            else:
+                yield number, record
+    else:
+        raise ValueError(f"Unknown format '{format}'.")
+
+
+def import_records(store: KnowledgeStore, section: str, records, chunk_size: int = CHUNK_SIZE) -> ImportReport:
+    """
+    Validate and merge (record number, record) pairs from read_records into
+    a section of store, a chunk at a time, and save the section once.
+    Records with an existing key replace the stored entry.
+    """
+    normalize = NORMALIZERS[section]
+    report = ImportReport(section)
+    data = store.load(section)
+    records = iter(records)
+    while chunk := list(itertools.islice(records, chunk_size)):
+        report.read += len(chunk)
+        for number, record in chunk:
+            try:
+                if isinstance(record, ValueError):
+                    raise record
+                key, value = normalize(record)
+            except ValueError as e:
+                report.error(number, str(e))
+                continue
+            if key in data:
+                report.updated += 1
+            else:
+                report.added += 1
+            data[key] = value
+    if report.added or report.updated:
+        store.save(section, data)
+    return report
+
+
+def import_file(store: KnowledgeStore, section: str, path: str, format: str = None) -> ImportReport:
+    format = file_format(path, format)
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        return import_records(store, section, read_records(f, format))
+
+
+def export_records(store: KnowledgeStore, section: str, f, format: str) -> int:
+    """Write every record of a section to an open text file; returns the number written."""
+    fields = FIELDS[section]
+    writer = csv.writer(f) if format == "csv" else None
+    if writer:
+        writer.writerow(fields)
+    count = 0
+    for key, value in store.load(section).items():
+        if section == "herbs":
+            record = {"key": key, **value}
+        else:
+            record = {"symptom": key, "remedy": value}
+        if writer:
+            writer.writerow(
+                f"{LIST_SEPARATOR} ".join(record.get(field, ())) if field in LIST_FIELDS else record.get(field, "")
+                for field in fields
+            )
+        else:
+            f.write(json.dumps({field: record.get(field, [] if field in LIST_FIELDS else "") for field in fields},
+                               ensure_ascii=False) + "\n")
+        count += 1
+    return count
+
+
+def export_file(store: KnowledgeStore, section: str, path: str, format: str = None) -> int:
+    format = file_format(path, format)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        return export_records(store, section, f, format)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import and export of herbs and remedies")
+    parser.add_argument("command", choices=("import", "export"))
+    parser.add_argument("section", choices=sorted(FIELDS))
+    parser.add_argument("path", help="a .jsonl or .csv file, or - for stdin/stdout with --format")
+    parser.add_argument("--format", choices=("jsonl", "csv"))
+    parser.add_argument("--data-dir", help="knowledge base directory (default: data/)")
+    args = parser.parse_args()
+
+    store = KnowledgeStore(args.data_dir) if args.data_dir else KnowledgeStore()
+    if args.path == "-":
+        if not args.format:
+            parser.error("--format is required with -")
+        if args.command == "import":
+            report = import_records(store, args.section, read_records(sys.stdin, args.format))
+        else:
+            export_records(store, args.section, sys.stdout, args.format)
+            return
+    elif args.command == "import":
+        report = import_file(store, args.section, args.path, args.format)
+    else:
+        print(f"Exported {export_file(store, args.section, args.path, args.format)} {args.section}")
+        return
+    print(report.summary())
+    sys.exit(1 if report.failed else 0)
+
+
+if __name__ == "__main__":
+    main()
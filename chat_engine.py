@@ -0,0 +1,196 @@
+# chat_engine.py
+
+import re
+from functools import lru_cache
+
+from symptom_matcher import KeywordMatcher
+from text_keys import lookup_key
+
+# Composed answer parts kept per engine
+RESPONSE_CACHE_SIZE = 1024
+
+# Corpus passages quoted when a message names nothing the engine recognizes
+SEARCH_ANSWERS = 2
+
+# Words that ask for a kind of advice, matched as whole words
+TOPIC_WORDS = {
+    "diet": ("eat", "eating", "food", "foods", "diet", "meal", "meals", "nutrition"),
+    "routine": ("routine", "schedule", "daily", "habit", "habits", "dinacharya", "sleep"),
+    "yoga": ("yoga", "asana", "asanas", "pose", "poses", "exercise", "stretch"),
+}
+
+_TOPIC_NAMES = {"diet": "foods", "routine": "a daily routine", "yoga": "yoga poses"}
+
+HELP_TEXT = (
+    "I can help with Ayurvedic wellness. Tell me how you feel (for example "
+    "\"I have a headache and acidity\"), ask about a herb such as Ashwagandha, "
+    "or ask what to eat, which yoga to practice or how to plan your day for "
+    "Vata, Pitta or Kapha."
+)
+
+_TOKEN = re.compile(r"\s*\S+")
+
+
+def tokens(text: str) -> tuple:
+    """Split text into the word-sized chunks that are streamed, each with its leading whitespace."""
+    return tuple(_TOKEN.findall(text))
+
+
+class Conversation:
+    """
+    Running context of one chat. Each turn folds only the new message into
+    it, so the cost of a turn does not grow with the length of the chat.
+    """
+
+    __slots__ = ("dosha", "scores", "symptoms", "turns")
+
+    def __init__(self, dosha: str = None, doshas: tuple = ()):
+        self.dosha = dosha  # dosha the conversation is about, if known
+        self.scores = [0] * len(doshas)  # symptom keyword hits per dosha so far
+        self.symptoms = set()  # known symptoms already answered
+        self.turns = 0
+
+
+class ChatEngine:
+    """
+    Rule-based, offline chat over the knowledge base. A message is scanned
+    once for symptoms, herbs, doshas and advice topics; the answer is built
+    from cached parts and streamed token by token. Other questions are
+    answered with the best matching passages of the corpus index.
+    """
+
+    def __init__(self, kb):
+        self.kb = kb
+        self.doshas = kb.symptom_matcher.doshas
+        # Keyed by lookup key, so names match in any script or spelling. The
+        # first entity keeps a key, and aliases come last, so an alias never
+        # hides a name that folds to the same key.
+        names = []
+        for name in kb.symptom_index.names:
+            names.append((name, ("symptom", kb.symptom_index.canonical(name))))
+        for key, herb in kb.herbs.items():
+            for name in (key, herb.name, herb.sanskrit):
+                names.append((name, ("herb", key)))
+        for dosha in self.doshas:
+            names.append((dosha, ("dosha", dosha)))
+        for topic, words in TOPIC_WORDS.items():
+            for word in words:
+                names.append((word, ("topic", topic)))
+        for key, aliases in kb.symptom_index.aliases.items():
+            for alias in aliases:
+                names.append((alias, ("symptom", key)))
+        for key, herb in kb.herbs.items():
+            for alias in herb.aliases:
+                names.append((alias, ("herb", key)))
+        entities = {}
+        for name, entity in names:
+            if name:
+                entities.setdefault(lookup_key(name), entity)
+
+        # Padded with spaces so keywords only match whole words of the padded message
+        self._entities = list(entities.values())
+        self._matcher = KeywordMatcher(f" {phrase} " for phrase in entities)
+        self._part = lru_cache(maxsize=RESPONSE_CACHE_SIZE)(self._compose_part)
+
+    def new_conversation(self, dosha: str = None) -> Conversation:
+        """Start a conversation, optionally about the user's known dosha."""
+        return Conversation(dosha, self.doshas)
+
+    def respond(self, conversation: Conversation, message: str):
+        """
+        Fold message into conversation and return a generator streaming
+        the answer token by token.
+        """
+        found = self._matcher.find(f" {lookup_key(message)} ")
+        mentioned = {"symptom": [], "herb": [], "dosha": [], "topic": []}
+        for entity_id in sorted(found):
+            kind, key = self._entities[entity_id]
+            if key not in mentioned[kind]:
+                mentioned[kind].append(key)
+
+        parts = []
+        new_symptoms = [key for key in mentioned["symptom"] if key not in conversation.symptoms]
+        conversation.symptoms.update(new_symptoms)
+        parts += [("symptom", key) for key in new_symptoms]
+
+        hits = self.kb.symptom_matcher.score(message)
+        if any(hits):
+            conversation.scores = [total + hit for total, hit in zip(conversation.scores, hits)]
+            primary = self.doshas[conversation.scores.index(max(conversation.scores))]
+            conversation.dosha = primary
+            parts.append(("imbalance", primary))
+
+        parts += [("herb", key) for key in mentioned["herb"]]
+        if mentioned["dosha"]:
+            conversation.dosha = mentioned["dosha"][-1]
+            parts += [("dosha", dosha) for dosha in mentioned["dosha"]]
+        parts += [("topic", topic, conversation.dosha) for topic in mentioned["topic"]]
+
+        if not parts:
+            # Nothing recognized: answer from the passages that best match the whole question
+            parts += [("passage", passage) for passage, _ in self.kb.corpus_index.search(message, SEARCH_ANSWERS)]
+        if not parts:
+            parts.append(("help",))
+        conversation.turns += 1
+        return self._stream(parts)
+
+    def _stream(self, parts):
+        for index, part in enumerate(parts):
+            if index:
+                yield "\n\n"
+            yield from self._part(*part)
+
+    def _compose_part(self, kind, *args) -> tuple:
+        return tokens(getattr(self, f"_compose_{kind}")(*args))
+
+    def _compose_symptom(self, key):
+        entry = self.kb.symptom_index.get(key)
+        return f"**For {entry.name.lower()}:** " + " ".join(
+            remedy if remedy.endswith(".") else f"{remedy}." for remedy in entry.remedies
+        )
+
+    def _compose_imbalance(self, dosha):
+        herbs = self.kb.dosha_herbs.get(dosha, ())[:3]
+        text = f"What you describe points to a **{dosha.title()}** imbalance."
+        if herbs:
+            text += " Herbs that may help: " + ", ".join(f"{herb.name} ({herb.dosage})" for herb in herbs) + "."
+        return text
+
+    def _compose_herb(self, key):
+        herb = self.kb.herbs[key]
+        return (
+            f"**{herb.name}** ({herb.sanskrit}) is used for {herb.uses.lower()}. "
+            f"Best for: {herb.dosha}. Typical dosage: {herb.dosage}."
+        )
+
+    def _compose_dosha(self, dosha):
+        info = self.kb.get_dosha_info(dosha)
+        if info is None:
+            return f"I have no description of {dosha.title()} yet."
+        return f"**{dosha.title()}**: {info.description} To stay in balance: {info.balance.rstrip('.')}."
+
+    def _compose_topic(self, topic, dosha):
+        if dosha is None:
+            return (
+                f"Tell me about your symptoms or take the Dosha Analysis, and I can suggest "
+                f"{_TOPIC_NAMES[topic]} suited to your dosha."
+            )
+        name = dosha.title()
+        if topic == "diet":
+            diet = self.kb.get_dietary_advice(dosha)
+            return (
+                f"For {name}, favour {', '.join(diet['increase'][:5]).lower()}, "
+                f"and reduce {', '.join(diet['decrease'][:5]).lower()}."
+            )
+        if topic == "routine":
+            return f"Daily routine tips for {name}: " + "; ".join(self.kb.get_dosha_specific_routine(dosha)) + "."
+        asanas = self.kb.yoga_asanas.get(dosha, ())
+        return f"Yoga for {name}: " + "; ".join(
+            f"{asana['name']} ({asana['duration']}, {asana['benefits'].lower()})" for asana in asanas
+        ) + "."
+
+    def _compose_passage(self, passage):
+        return f"**{passage.title}:** {passage.text}"
+
+    def _compose_help(self):
+        return HELP_TEXT
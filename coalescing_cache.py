@@ -0,0 +1,85 @@
+# coalescing_cache.py
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+import metrics
+
+
+class CoalescingCache:
+    """
+    Bounded LRU cache of compute(key), shared by every thread. Concurrent
+    get()s of a key that is not cached yet wait for the first caller's
+    computation instead of repeating it. clear() also drops computations
+    still running, so nothing computed from replaced data is cached.
+    Hits, misses and coalesced waits are counted here and, with
+    AYURVEDA_METRICS=1, in the ayurveda_cache_* counters labelled by name.
+    """
+
+    def __init__(self, compute, maxsize: int, name: str):
+        self.compute = compute
+        self.maxsize = maxsize
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._entries = OrderedDict()
+        self._running = {}  # key -> Future of the computation in progress
+        self._generation = 0  # bumped by clear()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                value = self._entries[key]
+                outcome = "hits"
+            else:
+                future = self._running.get(key)
+                if future is None:
+                    future = self._running[key] = Future()
+                    generation = self._generation
+                    self.misses += 1
+                    outcome = "misses"
+                else:
+                    self.coalesced += 1
+                    outcome = "coalesced"
+        metrics.count(f"ayurveda_cache_{outcome}_total", "cache", self.name)
+        if outcome == "hits":
+            return value
+        if outcome == "coalesced":
+            return future.result()
+
+        try:
+            value = self.compute(key)
+        except BaseException as e:
+            with self._lock:
+                if self._running.get(key) is future:
+                    del self._running[key]
+            future.set_exception(e)
+            raise
+        with self._lock:
+            if self._running.get(key) is future:
+                del self._running[key]
+            if generation == self._generation:
+                self._entries[key] = value
+                if len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        future.set_result(value)
+        return value
+
+    def clear(self):
+        """Forget every cached value, e.g. after the data they were computed from changed."""
+        with self._lock:
+            self._entries.clear()
+            self._running.clear()
+            self._generation += 1
+
+    def info(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "coalesced": self.coalesced,
+                "size": len(self._entries), "maxsize": self.maxsize}
@@ -0,0 +1,191 @@
+# corpus_index.py
+
+import re
+import threading
+from collections import Counter
+
+import numpy as np
+from scipy import sparse
+
+from metrics import timed
+from models import Passage
+from utils import SEASONAL_ADVICE, get_seasonal_advice
+
+# BM25 term-frequency saturation and document-length normalization
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# Passages returned per query by default
+TOP_K = 5
+
+# Words include Devanagari vowel signs and viramas, which \w alone splits on
+_WORD = re.compile(r"[\w\u0900-\u097f]+")
+
+STOPWORDS = frozenset(
+    "a about after an and any are as at be before by can could do does during for from good "
+    "has have help helps how i if in is it its me my of on or should so than that the their "
+    "there this to use what when which who why will with would you your".split()
+)
+
+# Suffixes stripped so "acidity" finds "acid" and "foods" finds "food"
+_SUFFIXES = (("ities", ""), ("ness", ""), ("ity", ""), ("ing", ""), ("ies", "y"), ("ed", ""), ("ly", ""), ("s", ""))
+
+
+def stem(word: str) -> str:
+    for suffix, replacement in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3 and not word.endswith("ss"):
+            return word[:-len(suffix)] + replacement
+    return word
+
+
+def terms(text: str) -> list:
+    """Return the stemmed, stopword-free terms of text."""
+    return [stem(word) for word in _WORD.findall(text.lower()) if word not in STOPWORDS]
+
+
+def remedy_passage(symptom: str, remedy: str) -> Passage:
+    key = symptom.lower().strip()
+    return Passage(f"remedy:{key}", "remedy", f"Remedy for {key}", remedy)
+
+
+def kb_passages(kb):
+    """
+    Yield the passages of a knowledge base: herbs, dosha descriptions,
+    foods, yoga asanas, routines, symptom and store remedies and the
+    seasonal advice from utils.
+    """
+    for key, herb in kb.herbs.items():
+        sanskrit = f" ({herb.sanskrit})" if herb.sanskrit else ""
+        yield Passage(f"herb:{key}", "herb", herb.name,
+                      f"{herb.name}{sanskrit} helps with {herb.uses.lower()}. "
+                      f"Suits {herb.dosha}. Dosage: {herb.dosage}.")
+    for name, dosha in kb.dosha_info.items():
+        yield Passage(f"dosha:{name}", "dosha", name.title(),
+                      f"{dosha.description} Characteristics: {dosha.characteristics}. "
+                      f"Signs of imbalance: {dosha.imbalance}. Balanced by: {dosha.balance}.")
+    for dosha, diet in kb.foods.items():
+        yield Passage(f"food:{dosha}", "food", f"Diet for {dosha.title()}",
+                      f"Favour {', '.join(diet['increase']).lower()}. Reduce {', '.join(diet['decrease']).lower()}.")
+    for dosha, asanas in kb.yoga_asanas.items():
+        for asana in asanas:
+            yield Passage(f"asana:{dosha}:{asana['name'].lower()}", "asana", asana["name"],
+                          f"{asana['name']} for {dosha.title()}, {asana['duration']}: {asana['benefits'].lower()}.")
+    for dosha, routine in kb.routines.items():
+        yield Passage(f"routine:{dosha}", "routine", f"Daily routine for {dosha.title()}", "; ".join(routine) + ".")
+    for key, symptom in kb.symptoms.items():
+        yield Passage(f"symptom:{key}", "symptom", symptom["name"],
+                      f"For {symptom['name'].lower()}: " + "; ".join(symptom["remedies"]) + ".")
+    for symptom, remedy in kb.remedy_kb.remedies.items():
+        yield remedy_passage(symptom, remedy)
+    for season in SEASONAL_ADVICE:
+        yield Passage(f"season:{season}", "season", f"{season.title()} season", get_seasonal_advice(season))
+
+
+class CorpusIndex:
+    """
+    BM25 retrieval index over free-text passages. Term counts are kept in a
+    SciPy sparse passage x term matrix; its BM25 weights are computed in one
+    vectorized pass and a batch of queries is scored with one sparse matrix
+    product. add() tokenizes only the new passages; a passage whose key is
+    already indexed replaces the old one, and the weights are refreshed on
+    the next query.
+    """
+
+    def __init__(self, passages=()):
+        self.passages = []  # row -> Passage, including replaced ones
+        self._rows = {}  # passage key -> its current row
+        self._vocabulary = {}  # term -> column
+        self._counts = []  # CSR term-count blocks, one per add() since the last refresh
+        self._live = np.zeros(0, dtype=bool)
+        self._weights = None  # term x passage BM25 weights, None when stale
+        self._lock = threading.Lock()
+        self.add(passages)
+
+    def __len__(self):
+        return len(self._rows)
+
+    def add(self, passages) -> int:
+        """Index passages, replacing those with an already indexed key. Returns how many were added."""
+        indptr, columns, counts, replaced = [0], [], [], []
+        with self._lock:
+            start = len(self.passages)
+            for passage in passages:
+                for term, count in Counter(terms(f"{passage.title} {passage.text}")).items():
+                    columns.append(self._vocabulary.setdefault(term, len(self._vocabulary)))
+                    counts.append(count)
+                indptr.append(len(columns))
+                old = self._rows.get(passage.key)
+                if old is not None:
+                    replaced.append(old)
+                self._rows[passage.key] = len(self.passages)
+                self.passages.append(passage)
+            added = len(self.passages) - start
+            if not added:
+                return 0
+            self._counts.append(sparse.csr_matrix(
+                (np.array(counts, dtype=np.float64), np.array(columns, dtype=np.int32), np.array(indptr)),
+                shape=(added, len(self._vocabulary))
+            ))
+            self._live = np.concatenate((self._live, np.ones(added, dtype=bool)))
+            self._live[replaced] = False
+            self._weights = None
+        return added
+
+    def add_remedies(self, pairs):
+        self.add(remedy_passage(symptom, remedy) for symptom, remedy in pairs)
+
+    def _refresh(self):
+        """Merge the count blocks and recompute every BM25 weight."""
+        columns = len(self._vocabulary)
+        blocks = [sparse.csr_matrix((block.data, block.indices, block.indptr), shape=(block.shape[0], columns))
+                  for block in self._counts]
+        counts = sparse.vstack(blocks, format="csr") if len(blocks) > 1 else blocks[0]
+        self._counts = [counts]
+
+        live = sparse.diags(self._live.astype(np.float64)) @ counts
+        live.eliminate_zeros()
+        lengths = np.asarray(live.sum(axis=1)).ravel()
+        passages = max(int(self._live.sum()), 1)
+        average_length = max(lengths.sum() / passages, 1.0)
+        frequencies = np.bincount(live.indices, minlength=columns)
+        idf = np.log1p((passages - frequencies + 0.5) / (frequencies + 0.5))
+
+        rows = np.repeat(np.arange(live.shape[0]), np.diff(live.indptr))
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths[rows] / average_length)
+        weights = idf[live.indices] * live.data * (BM25_K1 + 1) / (live.data + norm)
+        self._weights = sparse.csr_matrix((weights, live.indices, live.indptr), shape=live.shape).T.tocsr()
+
+    @timed("ayurveda_kb_call_seconds", "method")
+    def search(self, query: str, k: int = TOP_K) -> list:
+        """Return the k best (passage, score) pairs for query, best first."""
+        return self.search_batch([query], k)[0]
+
+    @timed("ayurveda_kb_call_seconds", "method")
+    def search_batch(self, queries, k: int = TOP_K) -> list:
+        """Return one list of the k best (passage, score) pairs per query."""
+        with self._lock:
+            if not self.passages:
+                return [[] for _ in queries]
+            if self._weights is None:
+                self._refresh()
+            weights, passages = self._weights, self.passages
+            indptr, columns = [0], []
+            for query in queries:
+                columns.extend({self._vocabulary[term] for term in terms(query) if term in self._vocabulary})
+                indptr.append(len(columns))
+
+        query_terms = sparse.csr_matrix(
+            (np.ones(len(columns)), np.array(columns, dtype=np.int32), np.array(indptr)),
+            shape=(len(queries), weights.shape[0])
+        )
+        scores = (query_terms @ weights).tocsr()
+        results = []
+        for i in range(len(queries)):
+            rows = scores.indices[scores.indptr[i]:scores.indptr[i + 1]]
+            row_scores = scores.data[scores.indptr[i]:scores.indptr[i + 1]]
+            if len(rows) > k:
+                best = np.argpartition(-row_scores, k - 1)[:k]
+                rows, row_scores = rows[best], row_scores[best]
+            order = np.lexsort((rows, -row_scores))
+            results.append([(passages[row], float(row_scores[j])) for j, row in zip(order, rows[order])])
+        return results
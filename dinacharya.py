@@ -0,0 +1,158 @@
+# dinacharya.py
+
+from datetime import date as Date
+from functools import cached_property, lru_cache
+
+import numpy as np
+
+from utils import SEASONAL_ADVICE, get_seasonal_advice
+
+# Templates are few (dosha x season); personalized schedules are kept per distinct input
+TEMPLATE_CACHE_SIZE = 64
+SCHEDULE_CACHE_SIZE = 4096
+
+ANCHORS = ("wake", "midday", "sleep")
+OPTIONS = {"exercise": 1, "meditation": 2}
+MINUTES_PER_DAY = 24 * 60
+
+# Season of each month, in the seasons of utils.get_seasonal_advice
+MONTH_SEASONS = (
+    "winter", "winter", "spring", "spring", "summer", "summer",
+    "rainy", "rainy", "rainy", "winter", "winter", "winter",
+)
+
+# "6:05 AM" for every minute of the day, indexed by minute
+_CLOCK = tuple(f"{(minute // 60 - 1) % 12 + 1}:{minute % 60:02d} {'AM' if minute < 720 else 'PM'}"
+               for minute in range(MINUTES_PER_DAY))
+
+
+def parse_time(text: str) -> int:
+    """Minutes after midnight of an "HH:MM" time."""
+    hours, minutes = text.split(":")
+    return int(hours) * 60 + int(minutes)
+
+
+def current_season(day: Date = None) -> str:
+    return MONTH_SEASONS[(day or Date.today()).month - 1]
+
+
+class ScheduleTemplate:
+    """
+    The activities of one (dosha, season) as arrays, with their start
+    offsets from their anchor (wake time, midday or sleep time) computed
+    for every combination of options. Personalizing it is one vectorized
+    add of the user's anchor times.
+    """
+
+    def __init__(self, activities: list, dosha: str, season: str, midday: int, scales: dict):
+        self.season = season
+        self.midday = midday
+        self.advice = get_seasonal_advice(season)
+        self.activities = tuple(activity["activity"] for activity in activities)
+        self.descriptions = tuple(_for_dosha(activity["description"], dosha) for activity in activities)
+        self.anchors = np.array([ANCHORS.index(activity["anchor"]) for activity in activities], dtype=np.intp)
+        self.durations = np.array([
+            round(_for_dosha(activity["duration"], dosha) * scales.get(activity["id"], 1.0)) for activity in activities
+        ], dtype=np.int64)
+        requires = np.array([OPTIONS.get(activity.get("requires"), 0) for activity in activities], dtype=np.int64)
+
+        # keep[options] and offsets[options] for every options bitmask
+        masks = np.arange(1 << len(OPTIONS))[:, None]
+        self.keep = (requires & ~masks) == 0
+        kept = np.where(self.keep, self.durations, 0)
+        self.offsets = np.zeros_like(kept)
+        for anchor in range(len(ANCHORS)):
+            group = self.anchors == anchor
+            if ANCHORS[anchor] == "sleep":
+                # Activities before sleep end at the sleep time
+                self.offsets[:, group] = -np.cumsum(kept[:, group][:, ::-1], axis=1)[:, ::-1]
+            else:
+                self.offsets[:, group] = np.cumsum(kept[:, group], axis=1) - kept[:, group]
+        self.morning = kept[:, self.anchors == 0].sum(axis=1)  # minutes of the wake block per options
+
+    def personalize(self, wake: int, sleep: int, options: int) -> "Schedule":
+        """Schedule for wake and sleep in minutes after midnight and an options bitmask."""
+        if sleep <= wake:
+            sleep += MINUTES_PER_DAY
+        # A late riser has the midday block after their morning routine
+        bases = np.array([wake, max(self.midday, wake + self.morning[options]), sleep])
+        starts = bases[self.anchors] + self.offsets[options]
+        rows = np.flatnonzero(self.keep[options])
+        rows = rows[np.argsort(starts[rows], kind="stable")]
+        return Schedule(self, rows, starts[rows], starts[rows] + self.durations[rows])
+
+
+class Schedule:
+    """One personalized daily routine; its table is built once, on first use."""
+
+    def __init__(self, template: ScheduleTemplate, rows, starts, ends):
+        self.template = template
+        self.rows = rows
+        self.starts = starts
+        self.ends = ends
+
+    @property
+    def advice(self) -> str:
+        return self.template.advice
+
+    @cached_property
+    def times(self) -> tuple:
+        starts, ends = self.starts % MINUTES_PER_DAY, self.ends % MINUTES_PER_DAY
+        return tuple(_CLOCK[start] if start == end else f"{_CLOCK[start]} - {_CLOCK[end]}"
+                     for start, end in zip(starts.tolist(), ends.tolist()))
+
+    @cached_property
+    def table(self) -> dict:
+        """Column -> values."""
+        return {
+            "Time": self.times,
+            "Activity": tuple(self.template.activities[row] for row in self.rows),
+            "Description": tuple(self.template.descriptions[row] for row in self.rows)
+        }
+
+    @cached_property
+    def frame(self):
+        """The table as a DataFrame for st.dataframe, shared by every rerun showing this schedule."""
+        import pandas as pd
+        return pd.DataFrame(self.table)
+
+    def current(self, minute: int):
+        """Index of the activity under way at minute after midnight, or None."""
+        for minute in (minute, minute + MINUTES_PER_DAY):
+            index = int(np.searchsorted(self.starts, minute, side="right")) - 1
+            if index >= 0 and minute < self.ends[index]:
+                return index
+        return None
+
+
+class ScheduleEngine:
+    """
+    Daily routine (dinacharya) timelines built from the dinacharya data.
+    Templates are memoized per (dosha, season) and personalized schedules
+    per (dosha, season, wake, sleep, options).
+    """
+
+    def __init__(self, dinacharya: dict):
+        self.activities = list(dinacharya["activities"])
+        self.midday = parse_time(dinacharya["midday"])
+        self.seasons = dinacharya.get("seasons", {})
+        self.template = lru_cache(maxsize=TEMPLATE_CACHE_SIZE)(self._build_template)
+        self._schedule = lru_cache(maxsize=SCHEDULE_CACHE_SIZE)(self._build_schedule)
+
+    def _build_template(self, dosha: str, season: str) -> ScheduleTemplate:
+        return ScheduleTemplate(self.activities, dosha, season, self.midday, self.seasons.get(season, {}))
+
+    def _build_schedule(self, dosha, season, wake, sleep, options):
+        return self.template(dosha, season).personalize(wake, sleep, options)
+
+    def schedule(self, dosha: str, season: str = None, wake_time: str = "06:00", sleep_time: str = "22:00",
+                 exercise: bool = True, meditation: bool = True) -> Schedule:
+        """The routine for a dosha and season (the current one by default) and the user's preferences."""
+        season = season if season in SEASONAL_ADVICE else current_season()
+        options = OPTIONS["exercise"] * bool(exercise) | OPTIONS["meditation"] * bool(meditation)
+        return self._schedule(dosha.lower(), season, parse_time(wake_time), parse_time(sleep_time), options)
+
+
+def _for_dosha(value, dosha: str):
+    """A template field is either one value or a {dosha: value} mapping."""
+    return value.get(dosha, next(iter(value.values()))) if isinstance(value, dict) else value
@@ -0,0 +1,41 @@
+# dosha_index.py
+
+import re
+
+DOSHA_BITS = {"vata": 1, "pitta": 2, "kapha": 4}
+ALL_DOSHAS = 7
+
+_ALL_WORDS = ("all", "tridoshic", "tridosha")
+
+
+def parse_doshas(text: str) -> int:
+    """
+    Parse a free-text dosha field such as "Vata, Kapha" or "All doshas"
+    into a bitmask of DOSHA_BITS.
+    """
+    words = re.findall(r"[a-z]+", text.lower())
+    if any(word in _ALL_WORDS for word in words):
+        return ALL_DOSHAS
+    mask = 0
+    for word in words:
+        mask |= DOSHA_BITS.get(word, 0)
+    return mask
+
+
+def suits_dosha(herb, dosha: str) -> bool:
+    """Whether a herb with a parsed dosha_mask is suitable for dosha."""
+    return bool(herb.dosha_mask & DOSHA_BITS.get(dosha.lower(), 0))
+
+
+def build_dosha_index(herbs) -> dict:
+    """
+    Return {dosha: tuple of suitable herbs}, most targeted first: herbs
+    listed for fewer doshas rank above general ones, then catalogue order.
+    """
+    herbs = list(herbs)
+    index = {}
+    for dosha, bit in DOSHA_BITS.items():
+        suitable = [herb for herb in herbs if herb.dosha_mask & bit]
+        suitable.sort(key=lambda herb: bin(herb.dosha_mask).count("1"))
+        index[dosha] = tuple(suitable)
+    return index
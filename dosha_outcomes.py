@@ -0,0 +1,114 @@
+# dosha_outcomes.py
+
+import itertools
+import math
+import threading
+from functools import lru_cache
+
+import utils
+from wellness_kb import freeze
+
+# Answer combinations (and distinct outcomes) kept per questionnaire
+OUTCOME_CACHE_SIZE = 4096
+
+
+class DoshaOutcome:
+    """
+    The result of one distinct set of dosha percentages: the read-only
+    result payload the UI stores and the Plotly chart serialized to JSON.
+    The chart is built on first use, or ahead of time by warm().
+    """
+
+    __slots__ = ("result", "_chart_json")
+
+    def __init__(self, result):
+        self.result = result
+        self._chart_json = None
+
+    @property
+    def chart_json(self) -> str:
+        if self._chart_json is None:
+            scores = {dosha.title(): pct for dosha, pct in self.result["percentages"].items()}
+            self._chart_json = utils.generate_dosha_chart(scores).to_json()
+        return self._chart_json
+
+    def to_dict(self) -> dict:
+        return {**self.result, "chart": self.chart_json}
+
+    def __repr__(self):
+        return f"DoshaOutcome(primary={self.result['primary']})"
+
+
+class DoshaOutcomeCache:
+    """
+    Bounded LRU cache from quiz answers to DoshaOutcome records.
+    Answer combinations with the same percentages share one outcome, so the
+    243 combinations of the five-question quiz hold only 21 outcomes and
+    21 charts. Once warmed, analyzing a quiz is a cache lookup.
+    """
+
+    def __init__(self, quiz, maxsize: int = OUTCOME_CACHE_SIZE):
+        self.quiz = quiz
+        self.maxsize = maxsize
+        self._get = lru_cache(maxsize=maxsize)(self._analyze)
+        self._outcome = lru_cache(maxsize=maxsize)(self._build_outcome)
+
+    def get(self, answers) -> DoshaOutcome:
+        """Return the outcome for a list of 0-based option indices."""
+        return self._get(tuple(answers))
+
+    def _analyze(self, answers):
+        result = self.quiz.analyze(answers)
+        return self._outcome(result["primary"], tuple(result["percentages"].values()))
+
+    def _build_outcome(self, primary, percentages):
+        return DoshaOutcome(freeze({"percentages": dict(zip(self.quiz.doshas, percentages)), "primary": primary}))
+
+    def warm(self, charts: bool = True) -> int:
+        """
+        Analyze every answer combination, and build every chart if charts
+        is true. Questionnaires with more combinations than the cache holds
+        are not warmed. Returns the number of distinct outcomes.
+        """
+        option_counts = [len(option_list) for option_list in self.quiz.options]
+        if math.prod(option_counts) > self.maxsize:
+            return 0
+        outcomes = set(map(self.get, itertools.product(*map(range, option_counts))))
+        if charts:
+            for outcome in outcomes:
+                outcome.chart_json
+        return len(outcomes)
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+_warmer = None
+
+
+def shared_outcome_cache() -> DoshaOutcomeCache:
+    """
+    Return the process-wide outcome cache for the dosha quiz, with every
+    result warmed on first use. Charts are built when first asked for;
+    call warm() to build them all ahead of time.
+    """
+    global _shared_cache
+    if _shared_cache is None:
+        with _shared_cache_lock:
+            if _shared_cache is None:
+                from questionnaire import DOSHA_QUIZ
+                cache = DoshaOutcomeCache(DOSHA_QUIZ)
+                cache.warm(charts=False)
+                _shared_cache = cache
+    return _shared_cache
+
+
+def warm_in_background():
+    """
+    Build the shared outcome cache in a daemon thread, once per process,
+    so the first quiz submission does not pay for it.
+    """
+    global _warmer
+    with _shared_cache_lock:
+        if _warmer is None:
+            _warmer = threading.Thread(target=shared_outcome_cache, name="dosha-outcome-warmer", daemon=True)
+            _warmer.start()
@@ -0,0 +1,170 @@
+# herb_search.py
+
+import re
+from collections import defaultdict
+
+import numpy as np
+
+from metrics import timed
+from text_keys import KeyIndex, lookup_key
+
+# Relevance weight of a match in each herb field
+FIELD_WEIGHTS = {"name": 3.0, "sanskrit": 3.0, "aliases": 3.0, "benefits": 1.0, "dosha": 1.0}
+
+# Fields also indexed under their lookup keys, so transliterations match,
+# and the weight of a match on those keys
+NAME_FIELDS = ("name", "sanskrit", "aliases")
+NAME_KEY_WEIGHT = 3.0
+
+# Added to the score of a herb whose name, Sanskrit name or alias is the query
+EXACT_MATCH_BONUS = 100.0
+
+# Similarity one field of a herb must reach for the herb to match
+MIN_SIMILARITY = 0.5
+
+# Words include Devanagari vowel signs and viramas, which \w alone splits on
+_WORD = re.compile(r"[\w\u0900-\u097f]+")
+
+
+def trigrams(text: str) -> set:
+    """
+    Return the set of word-boundary padded character trigrams in text.
+    """
+    grams = set()
+    for word in _WORD.findall(text.lower()):
+        padded = f" {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class _WordIndex:
+    """
+    Trigram postings of the words of many cells (one field of one herb
+    each), scored against query words by the Dice coefficient.
+    """
+
+    def __init__(self):
+        self._cells = []  # word slot -> cell
+        self._sizes = []  # word slot -> number of trigrams of the word
+        self._postings = defaultdict(list)  # trigram -> word slots containing it
+
+    def add(self, cell: int, words):
+        for word in dict.fromkeys(words):
+            grams = trigrams(word)
+            for gram in grams:
+                self._postings[gram].append(len(self._cells))
+            self._cells.append(cell)
+            self._sizes.append(len(grams))
+
+    def freeze(self):
+        """Convert the postings to NumPy arrays once every cell is added."""
+        self._cells = np.array(self._cells, dtype=np.intp)
+        self._sizes = np.array(self._sizes, dtype=np.float64)
+        self._postings = {gram: np.array(slots, dtype=np.intp) for gram, slots in self._postings.items()}
+
+    def similarity(self, words):
+        """
+        (cells, similarities) of every cell some query word matches: the
+        mean over words of each word's best Dice coefficient in the cell.
+        """
+        found_cells, found_scores = [], []
+        for word in words:
+            grams = trigrams(word)
+            found = [self._postings[gram] for gram in grams if gram in self._postings]
+            if not found:
+                continue
+            slots, shared = np.unique(np.concatenate(found), return_counts=True)
+            dice = 2 * shared / (len(grams) + self._sizes[slots])
+            # Best word of each cell: sort by cell, then by score, and keep the last of each cell
+            cells = self._cells[slots]
+            order = np.lexsort((dice, cells))
+            cells, dice = cells[order], dice[order]
+            last = np.append(cells[1:] != cells[:-1], True)
+            found_cells.append(cells[last])
+            found_scores.append(dice[last])
+        if not found_cells:
+            return np.zeros(0, dtype=np.intp), np.zeros(0)
+        cells, inverse = np.unique(np.concatenate(found_cells), return_inverse=True)
+        return cells, np.bincount(inverse, weights=np.concatenate(found_scores)) / len(words)
+
+
+class HerbSearchIndex:
+    """
+    Trigram index over the words of herb name, Sanskrit name, aliases,
+    benefits and dosha. Each query word is compared with the words of a
+    field by the Dice coefficient of their trigrams, which tolerates typos
+    ("ashwaganda", "tumeric") but not a long word that merely shares a few
+    trigrams. A field's similarity is the mean over the query words of
+    their best match in it, and a herb's score is the weighted sum over
+    the fields that reach MIN_SIMILARITY.
+    The lookup keys of the names are indexed as one more field, matched
+    only by the lookup key of the query, so Devanagari and Romanized
+    spellings ("अश्वगंधा", "ashvagandha") find each other without folded
+    benefit words matching unrelated queries. A query that is exactly a
+    herb's name ranks that herb first. Posting lists are NumPy arrays, so
+    a query only touches the postings of its own trigrams and only the
+    requested page is sorted.
+    """
+
+    def __init__(self, herbs):
+        self.herbs = list(herbs)
+        # The name keys are the field after the last one in FIELD_WEIGHTS
+        self._weights = np.array([*FIELD_WEIGHTS.values(), NAME_KEY_WEIGHT])
+        self._words = _WordIndex()
+        self._name_keys = _WordIndex()
+        self._exact = KeyIndex()  # name -> herb position
+        key_field = len(FIELD_WEIGHTS)
+        for position, herb in enumerate(self.herbs):
+            key_words = []
+            for field_number, field in enumerate(FIELD_WEIGHTS):
+                value = getattr(herb, field, "")
+                values = value if isinstance(value, (list, tuple)) else (value,)
+                self._words.add(position * len(self._weights) + field_number,
+                                _WORD.findall(" ".join(values).lower()))
+                if field in NAME_FIELDS:
+                    for name in values:
+                        if name:
+                            self._exact.add(name, position)
+                            key_words += lookup_key(name).split()
+            self._name_keys.add(position * len(self._weights) + key_field, key_words)
+        self._words.freeze()
+        self._name_keys.freeze()
+
+    @timed("ayurveda_kb_call_seconds", "method")
+    def search(self, query: str, page: int = 0, page_size: int = 10):
+        """
+        Return (herbs on the requested page, total number of matches),
+        ranked by relevance. An empty query lists every herb in catalogue order.
+        """
+        words = list(dict.fromkeys(_WORD.findall(query.lower())))
+        if not words:
+            return self.herbs[page * page_size:(page + 1) * page_size], len(self.herbs)
+
+        cells, similarity = self._words.similarity(words)
+        key_words = list(dict.fromkeys(lookup_key(query).split()))
+        if key_words:
+            key_cells, key_similarity = self._name_keys.similarity(key_words)
+            cells, similarity = np.concatenate((cells, key_cells)), np.concatenate((similarity, key_similarity))
+        passing = similarity >= MIN_SIMILARITY
+        cells, similarity = cells[passing], similarity[passing]
+        positions, fields = np.divmod(cells, len(self._weights))
+        scores = np.bincount(positions, weights=similarity * self._weights[fields], minlength=len(self.herbs))
+        exact = self._exact.get(query)
+        if exact is not None:
+            scores[exact] += EXACT_MATCH_BONUS
+
+        matches = np.flatnonzero(scores)
+        total = len(matches)
+
+        # Keep only the best (page + 1) * page_size matches before sorting;
+        # ties go to catalogue order for a stable listing
+        wanted = (page + 1) * page_size
+        if total > wanted:
+            match_scores = scores[matches]
+            cutoff = np.partition(match_scores, total - wanted)[total - wanted]
+            above = matches[match_scores > cutoff]
+            tied = matches[match_scores == cutoff][:wanted - len(above)]
+            matches = np.concatenate((above, tied))
+        order = np.lexsort((matches, -scores[matches]))
+        top = matches[order][page * page_size:wanted]
+        return [self.herbs[position] for position in top], total
@@ -0,0 +1,52 @@
+# kb_store.py
+
+import hashlib
+import json
+import os
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+
+class KnowledgeStore:
+    """
+    File-backed storage for knowledge base content.
+    Each section (herbs, foods, remedies, ...) lives in its own <section>.json
+    file under data_dir and is only read when a caller asks for it.
+    """
+
+    def __init__(self, data_dir: str = DATA_DIR):
+        self.data_dir = data_dir
+
+    def path(self, section: str) -> str:
+        return os.path.join(self.data_dir, f"{section}.json")
+
+    def load(self, section: str):
+        """
+        Read and return a single section.
+        """
+        with open(self.path(section), encoding="utf-8") as f:
+            return json.load(f)
+
+    def save(self, section: str, data):
+        """
+        Atomically replace a section on disk.
+        """
+        path = self.path(section)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=4)
+            f.write("\n")
+        os.replace(tmp_path, path)
+
+    def signature(self) -> str:
+        """
+        Return a short fingerprint of the section files' names, sizes and
+        modification times. It changes whenever any section changes on disk.
+        """
+        entries = []
+        with os.scandir(self.data_dir) as it:
+            for entry in it:
+                if entry.name.endswith(".json"):
+                    stat = entry.stat()
+                    entries.append((entry.name, stat.st_size, stat.st_mtime_ns))
+        return hashlib.sha1(repr(sorted(entries)).encode()).hexdigest()[:12]
@@ -1,30 +1,70 @@
 # knowledge_base.py
 
+from functools import cached_property
+from kb_store import KnowledgeStore
+from text_keys import KeyIndex
+
+
 class AyurvedicKnowledgeBase:
-    def __init__(self):
-        # A simple dictionary mapping symptoms to remedies
-        self.remedies = {
-            "headache": "Drink ginger tea or apply peppermint oil to the temples.",
-            "cold": "Consume tulsi leaves with honey, or drink warm turmeric milk.",
-            "indigestion": "Sip cumin seed water or chew fennel seeds after meals.",
-            "stress": "Practice pranayama breathing and drink ashwagandha tea.",
-            "fever": "Drink coriander seed tea and rest well."
-        }
+    def __init__(self, store: KnowledgeStore = None, symptom_index=None, corpus_index=None):
+        self.store = store or KnowledgeStore()
+        # Optional SymptomIndex and CorpusIndex kept in sync by add_remedy
+        self.symptom_index = symptom_index
+        self.corpus_index = corpus_index
+
+    @cached_property
+    def remedies(self) -> dict:
+        """
+        A simple dictionary mapping symptoms to remedies,
+        read from the store on first access.
+        """
+        return self.store.load("remedies")
+
+    @cached_property
+    def remedy_keys(self) -> KeyIndex:
+        """
+        Every symptom in remedies -> its key in remedies, so any spelling
+        or script of a symptom finds its remedy.
+        """
+        return KeyIndex((symptom, symptom) for symptom in self.remedies)
 
     def get_remedy(self, symptom: str) -> str:
         """
         Look up a remedy for the given symptom.
         Returns a string with the remedy or a default message if not found.
+        With a symptom index, the symptom's aliases find its remedy too.
         """
-        symptom = symptom.lower().strip()
-        return self.remedies.get(
-            symptom,
-            "Sorry, I don't have a remedy for that symptom yet."
-        )
+        if self.symptom_index is not None:
+            key = self.symptom_index.canonical(symptom)
+        else:
+            key = self.remedy_keys.get(symptom)
+        return self.remedies.get(key, "Sorry, I don't have a remedy for that symptom yet.")
+
+    def _remedy_key(self, symptom: str) -> str:
+        """Key a new remedy for symptom is stored under: the symptom it names exactly, if any."""
+        if self.symptom_index is not None:
+            return self.symptom_index.canonical(symptom, exact=True)
+        return self.remedy_keys.get_exact(symptom) or symptom.lower().strip()
 
     def add_remedy(self, symptom: str, remedy: str):
         """
         Add a new symptom-remedy pair to the knowledge base.
         """
-        self.remedies[symptom.lower().strip()] = remedy
-        return f"Remedy for '{symptom}' added successfully."
\ No newline at end of file
+        self.add_remedies([(symptom, remedy)])
+        return f"Remedy for '{symptom}' added successfully."
+
+    def add_remedies(self, pairs) -> int:
+        """
+        Add many symptom-remedy pairs; the symptom and corpus indexes are
+        updated once for the whole batch. Returns the number of pairs.
+        """
+        # Resolved once, so the remedies, the indexes and the corpus agree on the symptom
+        pairs = [(self._remedy_key(symptom), remedy) for symptom, remedy in pairs]
+        for key, remedy in pairs:
+            self.remedies[key] = remedy
+            self.remedy_keys.add(key, key)
+        if self.symptom_index is not None:
+            self.symptom_index.add_remedies(pairs)
+        if self.corpus_index is not None:
+            self.corpus_index.add_remedies(pairs)
+        return len(pairs)
\ No newline at end of file
@@ -1,9 +1,16 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-import plotly.graph_objects as go
 from datetime import datetime
 import random
+import re
+import uuid
+import metrics
+from analytics import is_admin, shared_population_stats
+from dosha_index import suits_dosha
+from dosha_outcomes import shared_outcome_cache, warm_in_background
+from models import UserProfile
+from profile_store import shared_profile_store
+from session_backend import session_key, shared_session_backend, sync_session
+from wellness_kb import shared_knowledge_base
 
 # ==================== PAGE CONFIG ====================
 st.set_page_config(
@@ -59,209 +66,87 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# ==================== AYURVEDIC KNOWLEDGE BASE ====================
-class AyurvedicKnowledgeBase:
-    def __init__(self):
-        self.herbs = self._load_herbs()
-        self.dosha_info = self._load_dosha_info()
-        self.foods = self._load_foods()
-        self.yoga_asanas = self._load_yoga_asanas()
-        self.routines = self._load_routines()
-    
-    def _load_herbs(self):
-        return {
-            "ashwagandha": {
-                "name": "Ashwagandha",
-                "sanskrit": "अश्वगन्धा",
-                "benefits": ["Stress Relief", "Better Sleep", "Energy Boost"],
-                "dosha": "Vata, Kapha",
-                "dosage": "500-1000mg daily"
-            },
-            "turmeric": {
-                "name": "Turmeric",
-                "sanskrit": "हरिद्रा",
-                "benefits": ["Anti-inflammatory", "Antioxidant", "Digestive Aid"],
-                "dosha": "All doshas",
-                "dosage": "1-3g daily"
-            },
-            "triphala": {
-                "name": "Triphala",
-                "sanskrit": "त्रिफला",
-                "benefits": ["Digestive Cleanser", "Detoxifier", "Improves Elimination"],
-                "dosha": "All doshas",
-                "dosage": "1-5g at night"
-            },
-            "brahmi": {
-                "name": "Brahmi",
-                "sanskrit": "ब्राह्मी",
-                "benefits": ["Memory Boost", "Calms Mind", "Cognitive Function"],
-                "dosha": "Vata, Pitta",
-                "dosage": "300-500mg daily"
-            },
-            "ginger": {
-                "name": "Ginger",
-                "sanskrit": "आर्द्रक",
-                "benefits": ["Improves Digestion", "Reduces Nausea", "Clears Congestion"],
-                "dosha": "Kapha, Vata",
-                "dosage": "1-3g daily"
-            }
-        }
-    
-    def _load_dosha_info(self):
-        return {
-            "vata": {
-                "description": "Represents air and space. Governs movement, creativity, and nervous system.",
-                "characteristics": "Creative, energetic, thin build, dry skin",
-                "imbalance": "Anxiety, constipation, dry skin, insomnia",
-                "balance": "Warm foods, regular routine, oil massage"
-            },
-            "pitta": {
-                "description": "Represents fire and water. Governs digestion, metabolism, and transformation.",
-                "characteristics": "Intelligent, focused, medium build, warm body",
-                "imbalance": "Acidity, inflammation, skin rashes, irritability",
-                "balance": "Cooling foods, moderation, meditation"
-            },
-            "kapha": {
-                "description": "Represents earth and water. Governs structure, stability, and lubrication.",
-                "characteristics": "Calm, loving, sturdy build, excellent stamina",
-                "imbalance": "Weight gain, congestion, lethargy, attachment",
-                "balance": "Light foods, exercise, stimulation"
-            }
-        }
-    
-    def _load_foods(self):
-        return {
-            "vata": {
-                "increase": ["Warm cooked vegetables", "Whole grains", "Nuts", "Dairy", "Sweet fruits"],
-                "decrease": ["Raw vegetables", "Cold foods", "Beans", "Dry foods"]
-            },
-            "pitta": {
-                "increase": ["Sweet fruits", "Bitter greens", "Coconut", "Milk", "Grains"],
-                "decrease": ["Spicy foods", "Sour fruits", "Fermented foods", "Alcohol"]
-            },
-            "kapha": {
-                "increase": ["Light fruits", "Steamed vegetables", "Legumes", "Spices", "Honey"],
-                "decrease": ["Sweet fruits", "Dairy", "Oily foods", "Wheat"]
-            }
-        }
-    
-    def _load_yoga_asanas(self):
-        return {
-            "vata": [
-                {"name": "Balasana", "duration": "5 minutes", "benefits": "Calms mind"},
-                {"name": "Vrikshasana", "duration": "3 minutes", "benefits": "Improves balance"},
-                {"name": "Shavasana", "duration": "10 minutes", "benefits": "Deep relaxation"}
-            ],
-            "pitta": [
-                {"name": "Chandra Namaskar", "duration": "10 rounds", "benefits": "Cooling effect"},
-                {"name": "Forward Bends", "duration": "2 minutes", "benefits": "Calms mind"},
-                {"name": "Moon Breathing", "duration": "5 minutes", "benefits": "Reduces heat"}
-            ],
-            "kapha": [
-                {"name": "Surya Namaskar", "duration": "12 rounds", "benefits": "Energizes"},
-                {"name": "Backbends", "duration": "3 minutes", "benefits": "Opens chest"},
-                {"name": "Twists", "duration": "2 minutes", "benefits": "Stimulates digestion"}
-            ]
-        }
-    
-    def _load_routines(self):
-        return {
-            "vata": [
-                "Warm oil self-massage daily",
-                "Gentle yoga practice",
-                "Regular meal times",
-                "Warm beverages",
-                "Early bedtime"
-            ],
-            "pitta": [
-                "Cooling pranayama",
-                "Moon bathing",
-                "Moderate exercise",
-                "Regular breaks",
-                "Avoid competition"
-            ],
-            "kapha": [
-                "Vigorous morning exercise",
-                "Dry massage",
-                "Stimulating yoga",
-                "Light breakfast",
-                "Variety in routine"
-            ]
-        }
-    
-    def get_all_herbs(self):
-        return list(self.herbs.values())
-    
-    def get_dosha_info(self, dosha):
-        return self.dosha_info.get(dosha.lower(), {})
-    
-    def get_dosha_specific_routine(self, dosha):
-        """Get dosha-specific routine"""
-        return self.routines.get(dosha.lower(), [])
-    
-    def analyze_symptoms(self, symptoms):
-        # Simple analysis - returns primary dosha
-        dosha_scores = {"vata": 0, "pitta": 0, "kapha": 0}
-        
-        vata_keywords = ["anxiety", "insomnia", "dry", "constipation", "worry"]
-        pitta_keywords = ["acidity", "inflammation", "irritability", "heat", "rash"]
-        kapha_keywords = ["congestion", "lethargy", "weight", "slow", "heavy"]
-        
-        for symptom in symptoms:
-            symptom_lower = symptom.lower()
-            for keyword in vata_keywords:
-                if keyword in symptom_lower:
-                    dosha_scores["vata"] += 1
-            for keyword in pitta_keywords:
-                if keyword in symptom_lower:
-                    dosha_scores["pitta"] += 1
-            for keyword in kapha_keywords:
-                if keyword in symptom_lower:
-                    dosha_scores["kapha"] += 1
-        
-        primary_dosha = max(dosha_scores, key=dosha_scores.get) if sum(dosha_scores.values()) > 0 else "vata"
-        
-        total = max(sum(dosha_scores.values()), 1)
-        return {
-            "dosha_probabilities": {
-                "vata": dosha_scores["vata"] / total,
-                "pitta": dosha_scores["pitta"] / total,
-                "kapha": dosha_scores["kapha"] / total
-            },
-            "primary_dosha": primary_dosha
-        }
-    
-    def get_recommended_herbs(self, symptoms):
-        analysis = self.analyze_symptoms(symptoms)
-        primary_dosha = analysis["primary_dosha"]
-        
-        recommended = []
-        for herb in self.herbs.values():
-            if primary_dosha.lower() in herb["dosha"].lower():
-                recommended.append(herb)
-        
-        return recommended[:3]
-    
-    def get_dietary_advice(self, dosha):
-        return self.foods.get(dosha.lower(), {"increase": [], "decrease": []})
-
 # ==================== INITIALIZE SESSION STATE ====================
-if 'kb' not in st.session_state:
-    st.session_state.kb = AyurvedicKnowledgeBase()
+profiles = shared_profile_store()
+sessions = shared_session_backend()
+population = shared_population_stats()
 
-if 'user_profile' not in st.session_state:
-    st.session_state.user_profile = None
+def session_snapshot():
+    """The part of the session kept in the shared session backend"""
+    return {
+        "current_page": st.session_state.current_page,
+        "user_profile": st.session_state.user_profile.to_dict() if st.session_state.user_profile else None,
+        "dosha_results": st.session_state.dosha_results,
+        "routine": st.session_state.routine
+    }
 
-if 'dosha_results' not in st.session_state:
-    st.session_state.dosha_results = None
+def restore_session(snapshot):
+    st.session_state.current_page = snapshot["current_page"]
+    st.session_state.user_profile = UserProfile.from_dict(snapshot["user_profile"]) if snapshot["user_profile"] else None
+    st.session_state.dosha_results = snapshot["dosha_results"]
+    st.session_state.routine = snapshot["routine"]
 
-if 'current_page' not in st.session_state:
-    st.session_state.current_page = "home"
+def sync_session_state():
+    """Publish this run's changes to the session backend, or pick up another worker's"""
+    snapshot = session_snapshot()
+    synced = sync_session(sessions, st.session_state.session_key, snapshot, st.session_state.synced_state)
+    if synced is not snapshot:
+        restore_session(synced)
+    st.session_state.synced_state = synced
 
-# Create shortcut for knowledge base
-kb = st.session_state.kb
+def query_id(name):
+    """The 32-hex-digit id in ?name=, created and put in the URL if missing"""
+    value = st.query_params.get(name, "")
+    if not re.fullmatch(r"[0-9a-f]{32}", value):
+        value = uuid.uuid4().hex
+        st.query_params[name] = value
+    return value
+
+# Returning visitors are recognised by the ?uid= in their URL, and each tab by
+# its ?sid=, so two tabs of one user keep separate live state. A tab that
+# another worker is already serving continues where it is; otherwise the
+# saved profile is loaded.
+if 'user_id' not in st.session_state:
+    st.session_state.user_id = query_id("uid")
+    st.session_state.session_key = session_key(st.session_state.user_id, query_id("sid"))
+    st.session_state.is_admin = is_admin(st.query_params.get("admin", ""))
+    live = sessions.load(st.session_state.session_key)
+    if live is None:
+        saved = profiles.load(st.session_state.user_id)
+        live = {"current_page": "home", "user_profile": saved["profile"],
+                "dosha_results": saved["dosha_results"], "routine": saved["routine"]}
+    restore_session(live)
+    st.session_state.synced_state = live
+
+sync_session_state()
+
+# Shared, read-only knowledge base (loaded once per server process)
+kb = shared_knowledge_base()
+
+# Quiz outcomes are precomputed off the render path, once per server process
+warm_in_background()
+
+# With AYURVEDA_METRICS=1, ?profile=N from an admin captures a cProfile profile of the next N reruns
+if metrics.ENABLED and st.session_state.get("is_admin") and st.query_params.get("profile", "").isdigit():
+    metrics.PROFILER.request(int(st.query_params.pop("profile")))
+
+# ==================== NAVIGATION ====================
+# Buttons change page in an on_click callback, which runs before the script,
+# so the click costs one run instead of a run plus an st.rerun()
+def go_to(page):
+    st.session_state.current_page = page
+
+def reset_session():
+    sessions.delete(st.session_state.session_key)
+    for key in list(st.session_state.keys()):
+        del st.session_state[key]
 
 # ==================== PAGE FUNCTIONS ====================
+HERBS_PER_PAGE = 10
+
+# Render-time histogram per page when AYURVEDA_METRICS=1, a no-op otherwise
+timed_page = metrics.timed("ayurveda_page_render_seconds", "page")
+
 def display_header():
     st.markdown("""
     <div class="main-header">
@@ -270,6 +155,7 @@ def display_header():
     </div>
     """, unsafe_allow_html=True)
 
+@timed_page
 def home_page():
     display_header()
     
@@ -282,9 +168,7 @@ def home_page():
             <p>Discover your Ayurvedic constitution</p>
         </div>
         """, unsafe_allow_html=True)
-        if st.button("Start Analysis", key="home_dosha", use_container_width=True):
-            st.session_state.current_page = "dosha"
-            st.rerun()
+        st.button("Start Analysis", key="home_dosha", use_container_width=True, on_click=go_to, args=("dosha",))
     
     with col2:
         st.markdown("""
@@ -293,9 +177,7 @@ def home_page():
             <p>Explore Ayurvedic herbs</p>
         </div>
         """, unsafe_allow_html=True)
-        if st.button("Browse Herbs", key="home_herbs", use_container_width=True):
-            st.session_state.current_page = "herbs"
-            st.rerun()
+        st.button("Browse Herbs", key="home_herbs", use_container_width=True, on_click=go_to, args=("herbs",))
     
     with col3:
         st.markdown("""
@@ -304,9 +186,7 @@ def home_page():
             <p>Personalized daily schedule</p>
         </div>
         """, unsafe_allow_html=True)
-        if st.button("View Routine", key="home_routine", use_container_width=True):
-            st.session_state.current_page = "routine"
-            st.rerun()
+        st.button("View Routine", key="home_routine", use_container_width=True, on_click=go_to, args=("routine",))
     
     # Welcome section
     st.markdown("---")
@@ -331,7 +211,19 @@ def home_page():
         ]
         st.info(random.choice(tips))
 
+@st.fragment
+@timed_page
+def dosha_questions(quiz):
+    """Quiz questions; answering one reruns only this fragment."""
+    for i, (question, option_list) in enumerate(zip(quiz.questions, quiz.options)):
+        st.radio(question, option_list, key=f"q_{i}", index=None)
+
+@timed_page
 def dosha_analysis_page():
+    # Heavy dependencies are imported by the pages that use them to keep cold starts fast
+    from questionnaire import DOSHA_QUIZ
+    from wellness_history import shared_history_store
+    
     st.markdown("## 🔍 Dosha Analysis Test")
     
     # Profile section
@@ -339,75 +231,42 @@ def dosha_analysis_page():
         col1, col2 = st.columns(2)
         with col1:
             name = st.text_input("Name", 
-                value=st.session_state.user_profile.get('name', '') if st.session_state.user_profile else '')
+                value=st.session_state.user_profile.name if st.session_state.user_profile else '')
             age = st.number_input("Age", min_value=1, max_value=120, value=30)
         with col2:
             gender = st.selectbox("Gender", ["Male", "Female", "Other"])
             weight = st.number_input("Weight (kg)", min_value=30, max_value=200, value=70)
         
         if st.button("Save Profile"):
-            st.session_state.user_profile = {
-                'name': name,
-                'age': age,
-                'gender': gender,
-                'weight': weight
-            }
+            st.session_state.user_profile = UserProfile(name=name, age=age, gender=gender, weight=weight)
+            profiles.save(st.session_state.user_id, profile=st.session_state.user_profile.to_dict())
             st.success("Profile saved!")
     
     # Dosha test questions
     st.markdown("### Answer these questions to discover your dosha:")
     
-    questions = [
-        "1. What best describes your body frame?",
-        "2. How is your skin type?",
-        "3. What is your typical appetite like?",
-        "4. How do you handle stress?",
-        "5. What is your sleep pattern?"
-    ]
-    
-    options = [
-        ["Thin, light, prominent bones", "Medium, muscular, well-proportioned", "Large, sturdy, well-padded"],
-        ["Dry, rough, cool to touch", "Oily, warm, prone to rashes", "Thick, smooth, cool"],
-        ["Irregular, sometimes hungry, sometimes not", "Strong, get irritable if meal is delayed", "Steady but can skip meals easily"],
-        ["Worry, anxiety, nervousness", "Irritability, anger, frustration", "Withdraw, avoid, become inactive"],
-        ["Light sleeper, easily disturbed", "Moderate sleeper, wake up hot", "Deep sleeper, hard to wake up"]
-    ]
+    dosha_questions(DOSHA_QUIZ)
     
     answers = []
-    
-    for i, (question, option_list) in enumerate(zip(questions, options)):
-        answer = st.radio(question, option_list, key=f"q_{i}", index=None)
-        if answer:
-            answers.append(option_list.index(answer) + 1)  # 1 for vata, 2 for pitta, 3 for kapha
-        else:
-            answers.append(0)
+    for i, option_list in enumerate(DOSHA_QUIZ.options):
+        answer = st.session_state.get(f"q_{i}")
+        answers.append(option_list.index(answer) if answer else None)
     
     if st.button("📊 Analyze My Dosha", type="primary", use_container_width=True):
-        if 0 in answers:
+        if None in answers:
             st.warning("Please answer all questions!")
         else:
-            # Calculate scores
-            vata_score = answers.count(1)
-            pitta_score = answers.count(2)
-            kapha_score = answers.count(3)
-            
-            total = vata_score + pitta_score + kapha_score
-            if total > 0:
-                vata_pct = (vata_score / total) * 100
-                pitta_pct = (pitta_score / total) * 100
-                kapha_pct = (kapha_score / total) * 100
-            else:
-                vata_pct = pitta_pct = kapha_pct = 33.3
-            
-            # Determine primary dosha
-            percentages = {"vata": vata_pct, "pitta": pitta_pct, "kapha": kapha_pct}
-            primary_dosha = max(percentages, key=percentages.get)
-            
-            # Store results
-            st.session_state.dosha_results = {
-                "percentages": percentages,
-                "primary": primary_dosha
-            }
+            # Every answer combination is precomputed, so this is a cache lookup
+            st.session_state.dosha_results = shared_outcome_cache().get(answers).result
+            profiles.save(st.session_state.user_id, dosha_results=st.session_state.dosha_results)
+            population.record_analysis(st.session_state.dosha_results)
+            shared_history_store().history(st.session_state.user_id).append_assessment(
+                st.session_state.dosha_results["percentages"])
+            percentages = st.session_state.dosha_results["percentages"]
+            primary_dosha = st.session_state.dosha_results["primary"]
+            vata_pct = percentages["vata"]
+            pitta_pct = percentages["pitta"]
+            kapha_pct = percentages["kapha"]
             
             # Display results
             st.markdown("### 📈 Your Dosha Analysis Results")
@@ -436,10 +295,10 @@ def dosha_analysis_page():
             dosha_data = kb.get_dosha_info(primary_dosha)
             if dosha_data:
                 with st.expander(f"📖 About {primary_dosha.upper()} Dosha"):
-                    st.markdown(f"**Description:** {dosha_data['description']}")
-                    st.markdown(f"**Characteristics:** {dosha_data['characteristics']}")
-                    st.markdown(f"**Imbalance Signs:** {dosha_data['imbalance']}")
-                    st.markdown(f"**Balancing Tips:** {dosha_data['balance']}")
+                    st.markdown(f"**Description:** {dosha_data.description}")
+                    st.markdown(f"**Characteristics:** {dosha_data.characteristics}")
+                    st.markdown(f"**Imbalance Signs:** {dosha_data.imbalance}")
+                    st.markdown(f"**Balancing Tips:** {dosha_data.balance}")
             
             # Recommendations
             st.markdown("### 💡 Personalized Recommendations")
@@ -448,13 +307,11 @@ def dosha_analysis_page():
             
             with tabs[0]:
                 st.markdown("**Recommended herbs for you:**")
-                herbs = kb.get_all_herbs()
-                for herb in herbs:
-                    if primary_dosha.lower() in herb["dosha"].lower():
-                        with st.expander(herb["name"]):
-                            st.markdown(f"**Sanskrit:** {herb['sanskrit']}")
-                            st.markdown(f"**Benefits:** {', '.join(herb['benefits'])}")
-                            st.markdown(f"**Dosage:** {herb['dosage']}")
+                for herb in kb.get_herbs_for_dosha(primary_dosha):
+                    with st.expander(herb.name):
+                        st.markdown(f"**Sanskrit:** {herb.sanskrit}")
+                        st.markdown(f"**Benefits:** {', '.join(herb.benefits)}")
+                        st.markdown(f"**Dosage:** {herb.dosage}")
             
             with tabs[1]:
                 st.markdown("**Dietary recommendations:**")
@@ -469,54 +326,87 @@ def dosha_analysis_page():
                     for food in diet.get("decrease", [])[:5]:
                         st.markdown(f"❌ {food}")
 
+@timed_page
 def herb_library_page():
     st.markdown("## 🌿 Ayurvedic Herb Library")
-    
-    # Search
-    search_term = st.text_input("🔍 Search herbs:", "")
-    
-    # Display herbs
-    herbs = kb.get_all_herbs()
-    
-    if search_term:
-        herbs = [h for h in herbs if search_term.lower() in h['name'].lower() or 
-                any(search_term.lower() in b.lower() for b in h['benefits'])]
-    
-    for herb in herbs:
+    herb_search()
+
+def record_herb_view(details_key, herb_name):
+    """Expander callback; only opening the details counts as a view."""
+    if st.session_state[details_key]:
+        population.record_herb_view(herb_name)
+
+@st.fragment
+@timed_page
+def herb_search():
+    """Search box and results; typing and paging rerun only this fragment."""
+    # Search (a new search starts again from the first page)
+    search_term = st.text_input("🔍 Search herbs:", "", on_change=lambda: st.session_state.update(herb_page=1))
+    
+    # Display one page of ranked results
+    page = st.session_state.get("herb_page", 1)
+    herbs, total = kb.herb_search_index.search(search_term, page - 1, HERBS_PER_PAGE)
+    pages = max(1, -(-total // HERBS_PER_PAGE))
+    if page > pages:
+        page = st.session_state.herb_page = 1
+        herbs, total = kb.herb_search_index.search(search_term, 0, HERBS_PER_PAGE)
+    
+    st.caption(f"{total} herbs found · page {page} of {pages}")
+    
+    for i, herb in enumerate(herbs):
         with st.container():
             st.markdown(f"""
             <div class="herb-card">
-                <h4>{herb['name']} ({herb['sanskrit']})</h4>
-                <p><strong>Best for:</strong> {herb['dosha']}</p>
-                <p><strong>Dosage:</strong> {herb['dosage']}</p>
+                <h4>{herb.name} ({herb.sanskrit})</h4>
+                <p><strong>Best for:</strong> {herb.dosha}</p>
+                <p><strong>Dosage:</strong> {herb.dosage}</p>
             </div>
             """, unsafe_allow_html=True)
             
-            with st.expander("View Details"):
+            details_key = f"herb_details_{i}_{herb.name}"
+            with st.expander("View Details", key=details_key, on_change=record_herb_view, args=(details_key, herb.name)):
                 st.markdown("**Benefits:**")
-                for benefit in herb["benefits"]:
+                for benefit in herb.benefits:
                     st.markdown(f"• {benefit}")
                 
                 # Show related recommendations
                 if st.session_state.dosha_results:
                     primary_dosha = st.session_state.dosha_results["primary"]
-                    if primary_dosha.lower() in herb["dosha"].lower():
+                    if suits_dosha(herb, primary_dosha):
                         st.success(f"✅ This herb is recommended for your {primary_dosha.upper()} dosha!")
                     else:
                         st.warning(f"⚠️ This herb may not be ideal for your {primary_dosha.upper()} dosha")
+    
+    if pages > 1:
+        st.number_input("Page", min_value=1, max_value=pages, key="herb_page")
 
+def save_routine():
+    """Form callback, so the schedule shown in the same run already uses the new preferences."""
+    st.session_state.routine = {
+        "wake_time": st.session_state.routine_wake.strftime("%H:%M"),
+        "sleep_time": st.session_state.routine_sleep.strftime("%H:%M"),
+        "season": st.session_state.routine_season,
+        "meditation": st.session_state.routine_meditation,
+        "exercise": st.session_state.routine_exercise
+    }
+    profiles.save(st.session_state.user_id, routine=st.session_state.routine)
+
+@timed_page
 def daily_routine_page():
+    from dinacharya import current_season
+    from utils import SEASONAL_ADVICE
+    
     st.markdown("## 📅 Ayurvedic Daily Routine (Dinacharya)")
     
     # Check if user has done dosha analysis
     if not st.session_state.dosha_results:
         st.warning("Please complete the dosha analysis first for personalized recommendations!")
-        if st.button("Take Dosha Test"):
-            st.session_state.current_page = "dosha"
-            st.rerun()
+        st.button("Take Dosha Test", on_click=go_to, args=("dosha",))
         return
     
     primary_dosha = st.session_state.dosha_results["primary"]
+    routine = st.session_state.get("routine") or {}
+    season = routine.get("season") or current_season()
     
     # Current time info
     current_hour = datetime.now().hour
@@ -535,20 +425,18 @@ def daily_routine_page():
     
     st.info(f"**Current Time:** {time_of_day} - {suggestion}")
     
-    # Basic daily routine
-    st.markdown("### 📋 Basic Daily Schedule")
-    
-    routine_data = {
-        "Time": ["5:00-6:00 AM", "6:00-7:00 AM", "7:00-8:00 AM", "8:00-9:00 AM", 
-                "12:00-1:00 PM", "6:00-7:00 PM", "9:00-10:00 PM"],
-        "Activity": ["Wake up", "Oral hygiene & Oil pulling", "Exercise & Yoga", "Bath & Meditation",
-                    "Main Meal", "Light Dinner", "Sleep"],
-        "Description": ["Best time to wake up", "Cleanse with oil", "Gentle exercise", "15-min meditation",
-                       "Largest meal of day", "2-3 hours before sleep", "Digital detox before bed"]
-    }
+    # Personalized daily schedule; the engine caches it per dosha, season and preferences
+    st.markdown("### 📋 Your Daily Schedule")
     
-    df_routine = pd.DataFrame(routine_data)
-    st.dataframe(df_routine, use_container_width=True, hide_index=True)
+    schedule = kb.schedule_engine.schedule(
+        primary_dosha, season,
+        wake_time=routine.get("wake_time", "06:00"),
+        sleep_time=routine.get("sleep_time", "22:00"),
+        exercise=routine.get("exercise", True),
+        meditation=routine.get("meditation", True)
+    )
+    st.caption(f"{primary_dosha.title()} dosha · {season.title()} season: {schedule.advice}")
+    st.dataframe(schedule.frame, use_container_width=True, hide_index=True)
     
     # Dosha-specific routine
     st.markdown(f"### 🎯 Special Tips for {primary_dosha.upper()} Dosha")
@@ -563,28 +451,30 @@ def daily_routine_page():
     # Interactive planner
     st.markdown("### ✍️ Customize Your Routine")
     
+    seasons = list(SEASONAL_ADVICE)
     with st.form("routine_form"):
-        wake_time = st.time_input("Wake up time", value=datetime.strptime("06:00", "%H:%M").time())
-        sleep_time = st.time_input("Sleep time", value=datetime.strptime("22:00", "%H:%M").time())
-        meditation = st.checkbox("Include meditation", value=True)
-        exercise = st.checkbox("Include exercise", value=True)
+        st.time_input("Wake up time", value=datetime.strptime(routine.get("wake_time", "06:00"), "%H:%M").time(), key="routine_wake")
+        st.time_input("Sleep time", value=datetime.strptime(routine.get("sleep_time", "22:00"), "%H:%M").time(), key="routine_sleep")
+        st.selectbox("Season", seasons, index=seasons.index(season), format_func=str.title, key="routine_season")
+        st.checkbox("Include meditation", value=routine.get("meditation", True), key="routine_meditation")
+        st.checkbox("Include exercise", value=routine.get("exercise", True), key="routine_exercise")
         
-        submitted = st.form_submit_button("Save My Routine")
-        if submitted:
+        if st.form_submit_button("Save My Routine", on_click=save_routine):
             st.success("Routine preferences saved!")
 
+@timed_page
 def symptom_checker_page():
+    from wellness_history import shared_history_store
+    
     st.markdown("## 🤒 Symptom Checker")
     
     # Common symptoms
-    symptoms_list = [
-        "Headache", "Fatigue", "Insomnia", "Acidity", "Constipation",
-        "Anxiety", "Joint Pain", "Skin Rash", "Poor Digestion", "Low Immunity"
-    ]
+    symptoms_list = kb.symptom_index.names
     
     selected_symptoms = st.multiselect(
         "Select your symptoms:",
         symptoms_list,
+        format_func=kb.symptom_index.label,
         placeholder="Choose all that apply..."
     )
     
@@ -593,8 +483,11 @@ def symptom_checker_page():
             st.warning("Please select at least one symptom")
         else:
             with st.spinner("Analyzing symptoms..."):
-                # Analyze symptoms
-                analysis = kb.analyze_symptoms(selected_symptoms)
+                # One index lookup gives the analysis, herbs and remedies
+                result = kb.symptom_index.check(selected_symptoms)
+                shared_history_store().history(st.session_state.user_id).append_checkin(
+                    selected_symptoms, result["dosha_probabilities"])
+                population.record_symptom_check(selected_symptoms)
                 
                 st.markdown("### 📋 Analysis Results")
                 
@@ -603,37 +496,131 @@ def symptom_checker_page():
                 
                 with col1:
                     st.markdown("##### 🎯 Probable Dosha Imbalance")
-                    for dosha, prob in analysis["dosha_probabilities"].items():
+                    for dosha, prob in result["dosha_probabilities"].items():
                         progress = int(prob * 100)
                         st.markdown(f"**{dosha.upper()}**: {progress}%")
                         st.progress(progress / 100)
                 
                 with col2:
                     st.markdown("##### 💡 Recommendations")
-                    herbs = kb.get_recommended_herbs(selected_symptoms)
-                    for herb in herbs[:2]:
-                        st.markdown(f"**{herb['name']}** - {herb['dosage']}")
+                    for herb in result["herbs"][:2]:
+                        st.markdown(f"**{herb.name}** - {herb.dosage}")
                 
                 # Immediate remedies
                 st.markdown("### 🏥 Immediate Home Remedies")
-                remedies = {
-                    "Headache": ["Apply sandalwood paste on forehead", "Drink ginger tea"],
-                    "Acidity": ["Drink cold milk", "Take amla powder with honey"],
-                    "Constipation": ["Warm water with ghee", "Triphala powder at night"],
-                    "Anxiety": ["Ashwagandha with warm milk", "Meditation"],
-                    "Fatigue": ["Ashwagandha with warm milk", "Proper rest"],
-                    "Insomnia": ["Warm milk with nutmeg before bed", "Foot massage with warm oil"],
-                    "Joint Pain": ["Apply warm sesame oil", "Turmeric with warm milk"],
-                    "Skin Rash": ["Apply neem paste", "Turmeric with honey"],
-                    "Poor Digestion": ["Ginger tea before meals", "Triphala powder"],
-                    "Low Immunity": ["Ashwagandha", "Tulsi tea"]
-                }
-                
-                for symptom in selected_symptoms:
-                    if symptom in remedies:
-                        st.markdown(f"**For {symptom}:**")
-                        for remedy in remedies[symptom]:  # CORRECTED LINE: symptom instead of symptome
-                            st.markdown(f"• {remedy}")
+                for symptom, remedies in result["remedies"].items():
+                    st.markdown(f"**For {symptom}:**")
+                    for remedy in remedies:
+                        st.markdown(f"• {remedy}")
+
+@timed_page
+def journey_page():
+    from wellness_history import ASSESSMENT, CHECKIN, DAY, ROLLING_DAYS, TREND_DAYS, shared_history_store
+    
+    st.markdown("## 📈 Your Wellness Journey")
+    
+    # Loaded once per server process; later visits only read new entries
+    history = shared_history_store().history(st.session_state.user_id)
+    if not len(history):
+        st.info("Your dosha analyses and symptom checks will be tracked here.")
+        st.button("Take Dosha Test", on_click=go_to, args=("dosha",))
+        return
+    
+    first = min(series.times[0] for series in (history.assessments, history.checkins) if len(series))
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Dosha analyses", len(history.assessments))
+    col2.metric("Symptom checks", len(history.checkins))
+    col3.metric("Tracking since", datetime.fromtimestamp(first).strftime("%d %b %Y"))
+    
+    for kind, title in ((ASSESSMENT, "### 🔍 Dosha Balance"), (CHECKIN, "### 🤒 Symptom Checks")):
+        series = history.series(kind)
+        if not len(series):
+            continue
+        st.markdown(title)
+        latest = series.latest()
+        trend = series.trend() or {}
+        for col, dosha in zip(st.columns(len(latest)), latest):
+            delta = f"{trend[dosha]:+.1f} per week" if dosha in trend else None
+            col.metric(dosha.upper(), f"{latest[dosha]:.0f}%", delta, delta_color="off")
+        st.caption(f"Latest entry, with the trend over the last {TREND_DAYS} days")
+        st.plotly_chart(history.chart(kind, ROLLING_DAYS), use_container_width=True)
+    
+    frequent = history.symptom_counts(since=datetime.now().timestamp() - 90 * DAY)[:5]
+    if frequent:
+        st.markdown("### 🔁 Most Frequent Symptoms (last 90 days)")
+        for name, count in frequent:
+            st.markdown(f"• **{name}**: {count} {'check' if count == 1 else 'checks'}")
+
+@timed_page
+def analytics_page():
+    if not st.session_state.get("is_admin"):
+        st.warning("The analytics dashboard is only available to administrators.")
+        return
+    
+    st.markdown("## 📊 Population Analytics")
+    
+    # Counters merged from every worker, re-read at most every few seconds
+    snapshot = population.snapshot()
+    st.caption(f"All users, as of {datetime.fromtimestamp(snapshot.taken_at).strftime('%H:%M:%S')}")
+    
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Dosha analyses", snapshot.totals["analyses"])
+    col2.metric("Symptom checks", snapshot.totals["symptom_checks"])
+    col3.metric("Herb views", snapshot.totals["herb_views"])
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("##### Primary Dosha")
+        st.plotly_chart(snapshot.dosha_chart, use_container_width=True)
+    with col2:
+        st.markdown("##### Dosha Percentages")
+        st.plotly_chart(snapshot.band_chart, use_container_width=True)
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("##### 🤒 Most Selected Symptoms")
+        for name, count in snapshot.top_symptoms:
+            st.markdown(f"• **{name}**: {count}")
+    with col2:
+        st.markdown("##### 🌿 Most Viewed Herbs")
+        for name, count in snapshot.top_herbs:
+            st.markdown(f"• **{name}**: {count}")
+    
+    cache = kb.symptom_index.results.info()
+    st.caption(f"Symptom analysis cache (this worker): {cache['hits']} hits, {cache['misses']} misses, "
+               f"{cache['coalesced']} coalesced, {cache['size']} of {cache['maxsize']} entries")
+
+@timed_page
+def chat_page():
+    st.markdown("## 💬 Ayurvedic Chat")
+    st.caption("Ask about symptoms, herbs, your dosha, diet, yoga or daily routine.")
+    chat_conversation()
+
+@st.fragment
+@timed_page
+def chat_conversation():
+    """Chat history and input; sending a message reruns only this fragment."""
+    if "chat_conversation" not in st.session_state:
+        st.session_state.chat_conversation = kb.chat_engine.new_conversation()
+        st.session_state.chat_messages = []
+    conversation = st.session_state.chat_conversation
+    
+    # Answers follow the analyzed dosha until the chat itself settles on one
+    if conversation.dosha is None and st.session_state.dosha_results:
+        conversation.dosha = st.session_state.dosha_results["primary"]
+    
+    for role, text in st.session_state.chat_messages:
+        with st.chat_message(role):
+            st.markdown(text)
+    
+    message = st.chat_input("How are you feeling today?")
+    if message:
+        st.session_state.chat_messages.append(("user", message))
+        with st.chat_message("user"):
+            st.markdown(message)
+        with st.chat_message("assistant"):
+            answer = st.write_stream(kb.chat_engine.respond(conversation, message))
+        st.session_state.chat_messages.append(("assistant", answer))
 
 # ==================== SIDEBAR ====================
 with st.sidebar:
@@ -641,60 +628,62 @@ with st.sidebar:
     
     # User info
     if st.session_state.user_profile:
-        st.markdown(f"**Welcome, {st.session_state.user_profile['name']}!**")
+        st.markdown(f"**Welcome, {st.session_state.user_profile.name}!**")
         if st.session_state.dosha_results:
             st.markdown(f"**Primary Dosha:** {st.session_state.dosha_results['primary'].upper()}")
     
     st.markdown("---")
     
     # Navigation buttons
-    if st.button("🏠 Home", use_container_width=True, key="nav_home"):
-        st.session_state.current_page = "home"
-        st.rerun()
+    st.button("🏠 Home", use_container_width=True, key="nav_home", on_click=go_to, args=("home",))
     
-    if st.button("🔍 Dosha Analysis", use_container_width=True, key="nav_dosha"):
-        st.session_state.current_page = "dosha"
-        st.rerun()
+    st.button("🔍 Dosha Analysis", use_container_width=True, key="nav_dosha", on_click=go_to, args=("dosha",))
     
-    if st.button("🌿 Herb Library", use_container_width=True, key="nav_herbs"):
-        st.session_state.current_page = "herbs"
-        st.rerun()
+    st.button("🌿 Herb Library", use_container_width=True, key="nav_herbs", on_click=go_to, args=("herbs",))
     
-    if st.button("📅 Daily Routine", use_container_width=True, key="nav_routine"):
-        st.session_state.current_page = "routine"
-        st.rerun()
+    st.button("📅 Daily Routine", use_container_width=True, key="nav_routine", on_click=go_to, args=("routine",))
     
-    if st.button("🤒 Symptom Checker", use_container_width=True, key="nav_symptoms"):
-        st.session_state.current_page = "symptoms"
-        st.rerun()
+    st.button("🤒 Symptom Checker", use_container_width=True, key="nav_symptoms", on_click=go_to, args=("symptoms",))
+    
+    st.button("💬 Chat", use_container_width=True, key="nav_chat", on_click=go_to, args=("chat",))
+    
+    st.button("📈 My Journey", use_container_width=True, key="nav_journey", on_click=go_to, args=("journey",))
+    
+    if st.session_state.is_admin:
+        st.button("📊 Analytics", use_container_width=True, key="nav_analytics", on_click=go_to, args=("analytics",))
     
     st.markdown("---")
     
     # Quick actions
     st.markdown("### ⚡ Quick Actions")
     
-    if st.button("🔄 Reset Session", use_container_width=True):
-        for key in list(st.session_state.keys()):
-            del st.session_state[key]
-        st.rerun()
+    st.button("🔄 Reset Session", use_container_width=True, on_click=reset_session)
     
     if st.session_state.dosha_results:
-        if st.button("📊 View Dosha Report", use_container_width=True):
-            st.session_state.current_page = "dosha"
-            st.rerun()
+        st.button("📊 View Dosha Report", use_container_width=True, on_click=go_to, args=("dosha",))
     
     st.markdown("---")
     st.caption("© 2024 Ayurvedic Wellness AI")
     st.caption("*For educational purposes only*")
 
 # ==================== MAIN APP ROUTING ====================
-if st.session_state.current_page == "home":
-    home_page()
-elif st.session_state.current_page == "dosha":
-    dosha_analysis_page()
-elif st.session_state.current_page == "herbs":
-    herb_library_page()
-elif st.session_state.current_page == "routine":
-    daily_routine_page()
-elif st.session_state.current_page == "symptoms":
-    symptom_checker_page()
\ No newline at end of file
+with metrics.PROFILER.rerun():
+    if st.session_state.current_page == "home":
+        home_page()
+    elif st.session_state.current_page == "dosha":
+        dosha_analysis_page()
+    elif st.session_state.current_page == "herbs":
+        herb_library_page()
+    elif st.session_state.current_page == "routine":
+        daily_routine_page()
+    elif st.session_state.current_page == "symptoms":
+        symptom_checker_page()
+    elif st.session_state.current_page == "chat":
+        chat_page()
+    elif st.session_state.current_page == "journey":
+        journey_page()
+    elif st.session_state.current_page == "analytics":
+        analytics_page()
+
+sync_session_state()
+metrics.write_if_due()
\ No newline at end of file
@@ -0,0 +1,217 @@
+# metrics.py
+#
+# Opt-in instrumentation: latency histograms per page and per knowledge base
+# method and cache hit/miss counters, rendered in the Prometheus text format,
+# and cProfile capture of the next N Streamlit reruns.
+#
+#     AYURVEDA_METRICS=1 streamlit run main.py    # writes metrics.prom; an admin's ?profile=N profiles N reruns
+#     AYURVEDA_METRICS=1 python api.py            # serves GET /metrics
+#
+# With AYURVEDA_METRICS unset, timed() returns the function unchanged and the
+# per-rerun hooks return after one flag check.
+
+import bisect
+import cProfile
+import itertools
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+ENABLED = os.environ.get("AYURVEDA_METRICS", "") == "1"
+METRICS_PATH = os.environ.get("AYURVEDA_METRICS_PATH", os.path.join(ROOT, "metrics.prom"))
+PROFILE_DIR = os.environ.get("AYURVEDA_PROFILE_DIR", os.path.join(ROOT, "profiles"))
+
+# Upper bounds in seconds of the histogram buckets
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+# Minimum seconds between rewrites of the metrics file
+WRITE_INTERVAL = 5.0
+
+# Most reruns one ?profile=N request can profile
+MAX_PROFILE_RERUNS = 50
+
+_HELP = {
+    "ayurveda_page_render_seconds": "Time to render a page or page fragment.",
+    "ayurveda_kb_call_seconds": "Time spent in a knowledge base method.",
+    "ayurveda_api_request_seconds": "Time to handle one JSON API request.",
+    "ayurveda_cache_hits_total": "Lookups answered from a shared cache.",
+    "ayurveda_cache_misses_total": "Lookups that computed and cached their value.",
+    "ayurveda_cache_coalesced_total": "Lookups that waited for an identical lookup already computing.",
+}
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram in the Prometheus style."""
+
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)  # the last bucket is +Inf
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float):
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+
+
+class Registry:
+    """Histograms and counters keyed by metric name and label value."""
+
+    def __init__(self):
+        self._histograms = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, label: str, value: str, seconds: float):
+        key = (name, label, value)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(seconds)
+
+    def count(self, name: str, label: str, value: str, amount: int = 1):
+        key = (name, label, value)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def render(self) -> str:
+        """Return every histogram and counter in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            items = sorted(self._histograms.items())
+            seen = set()
+            for (name, label, value), histogram in items:
+                if name not in seen:
+                    seen.add(name)
+                    lines.append(f"# HELP {name} {_HELP.get(name, name)}")
+                    lines.append(f"# TYPE {name} histogram")
+                cumulative = 0
+                for bound, count in zip(BUCKETS + ("+Inf",), histogram.counts):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{{label}="{value}",le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_sum{{{label}="{value}"}} {histogram.total:.6f}')
+                lines.append(f'{name}_count{{{label}="{value}"}} {histogram.count}')
+            for (name, label, value), count in sorted(self._counters.items()):
+                if name not in seen:
+                    seen.add(name)
+                    lines.append(f"# HELP {name} {_HELP.get(name, name)}")
+                    lines.append(f"# TYPE {name} counter")
+                lines.append(f'{name}{{{label}="{value}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str = METRICS_PATH):
+        """Atomically replace path with the current metrics."""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(self.render())
+        os.replace(tmp_path, path)
+
+
+REGISTRY = Registry()
+_next_write = 0.0
+
+
+def timed(name: str, label: str):
+    """
+    Decorator recording each call's duration in histogram name, labelled
+    with the function's qualified name. Returns the function itself when
+    disabled.
+    """
+    def decorate(func):
+        if not ENABLED:
+            return func
+        value = func.__qualname__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                REGISTRY.observe(name, label, value, time.perf_counter() - start)
+        return wrapper
+    return decorate
+
+
+def observe(name: str, label: str, value: str, seconds: float):
+    if ENABLED:
+        REGISTRY.observe(name, label, value, seconds)
+
+
+def count(name: str, label: str, value: str, amount: int = 1):
+    if ENABLED:
+        REGISTRY.count(name, label, value, amount)
+
+
+def write_if_due():
+    """Rewrite the metrics file at most once every WRITE_INTERVAL seconds."""
+    global _next_write
+    if not ENABLED:
+        return
+    now = time.monotonic()
+    if now >= _next_write:
+        _next_write = now + WRITE_INTERVAL
+        REGISTRY.write()
+
+
+class RerunProfiler:
+    """
+    Profiles the next N reruns with cProfile and dumps their combined stats
+    to PROFILE_DIR as one .prof file (view with python -m pstats or snakeviz).
+    """
+
+    def __init__(self):
+        self._remaining = int(os.environ.get("AYURVEDA_PROFILE_RERUNS", "0") or 0)
+        self._profile = None
+        self._lock = threading.Lock()
+        self._dumps = itertools.count()
+
+    def request(self, reruns: int):
+        """
+        Start profiling the next reruns runs (at most MAX_PROFILE_RERUNS),
+        replacing any pending request.
+        """
+        with self._lock:
+            self._remaining = min(reruns, MAX_PROFILE_RERUNS)
+
+    def rerun(self):
+        """Context manager profiling the enclosed rerun if one was requested."""
+        return self._profiled() if self._remaining else nullcontext()
+
+    @contextmanager
+    def _profiled(self):
+        # Reruns of different sessions run in parallel threads; profile one at a time
+        if not self._lock.acquire(blocking=False):
+            yield
+            return
+        try:
+            if self._profile is None:
+                self._profile = cProfile.Profile()
+            self._profile.enable()
+            try:
+                yield
+            finally:
+                self._profile.disable()
+                self._remaining -= 1
+                if self._remaining <= 0:
+                    self._remaining = 0
+                    self._dump()
+        finally:
+            self._lock.release()
+
+    def _dump(self):
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        # pid and a counter keep dumps from the same second, or from other workers, apart
+        name = f"rerun-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{next(self._dumps)}.prof"
+        path = os.path.join(PROFILE_DIR, name)
+        self._profile.dump_stats(path)
+        self._profile = None
+
+
+PROFILER = RerunProfiler()
@@ -1,46 +1,165 @@
 # models.py
+#
+# Compact, immutable domain records. Each is a slotted frozen dataclass (no
+# per-instance __dict__), list fields are stored as tuples and repeated text
+# such as dosha fields, benefits and dosages is interned so equal strings are
+# shared across records.
 
+import sys
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+from dosha_index import parse_doshas
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _intern_all(values) -> tuple:
+    return tuple(_intern(value) for value in values)
+
+
+@dataclass(frozen=True, slots=True, repr=False)
 class UserProfile:
-    def __init__(self, name: str, age: int, dosha_type: str):
-        self.name = name
-        self.age = age
-        self.dosha_type = dosha_type
+    name: str
+    age: int
+    dosha_type: str = ""
+    gender: str = ""
+    weight: Optional[float] = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "UserProfile":
+        return cls(
+            name=data.get("name", ""),
+            age=data.get("age"),
+            dosha_type=_intern(data.get("dosha_type", "")),
+            gender=_intern(data.get("gender", "")),
+            weight=data.get("weight")
+        )
+
+    def to_dict(self) -> dict:
+        return asdict(self)
 
     def __repr__(self):
         return f"UserProfile(name={self.name}, age={self.age}, dosha_type={self.dosha_type})"
 
 
+@dataclass(frozen=True, slots=True, repr=False)
 class Prescription:
-    def __init__(self, user: UserProfile, remedies: list):
-        self.user = user
-        self.remedies = remedies
+    user: UserProfile
+    remedies: tuple
+
+    def __post_init__(self):
+        object.__setattr__(self, "remedies", _intern_all(self.remedies))
 
     def __repr__(self):
         return f"Prescription(for={self.user.name}, remedies={self.remedies})"
 
 
+@dataclass(frozen=True, slots=True, repr=False)
 class Dosha:
-    def __init__(self, name: str, description: str):
-        self.name = name
-        self.description = description
+    name: str
+    description: str
+    characteristics: str = ""
+    imbalance: str = ""
+    balance: str = ""
+
+    @classmethod
+    def from_dict(cls, name: str, data: dict) -> "Dosha":
+        return cls(
+            name=_intern(name),
+            description=data.get("description", ""),
+            characteristics=data.get("characteristics", ""),
+            imbalance=data.get("imbalance", ""),
+            balance=data.get("balance", "")
+        )
+
+    def to_dict(self) -> dict:
+        return asdict(self)
 
     def __repr__(self):
         return f"Dosha(name={self.name})"
 
 
+@dataclass(frozen=True, slots=True, repr=False)
 class Symptom:
-    def __init__(self, name: str, description: str = ""):
-        self.name = name
-        self.description = description
+    name: str
+    description: str = ""
+    scores: tuple = ()
+    remedies: tuple = ()
+    herbs: tuple = ()
+
+    def __post_init__(self):
+        object.__setattr__(self, "name", _intern(self.name))
+        object.__setattr__(self, "remedies", _intern_all(self.remedies))
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "description": self.description,
+            "scores": list(self.scores),
+            "remedies": list(self.remedies),
+            "herbs": [herb.to_dict() for herb in self.herbs]
+        }
 
     def __repr__(self):
         return f"Symptom(name={self.name})"
 
 
+@dataclass(frozen=True, slots=True, repr=False)
 class AyurvedicHerb:
-    def __init__(self, name: str, uses: str):
-        self.name = name
-        self.uses = uses
+    name: str
+    sanskrit: str = ""
+    benefits: tuple = ()
+    dosha: str = ""
+    dosage: str = ""
+    aliases: tuple = ()
+    dosha_mask: int = 0
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "AyurvedicHerb":
+        dosha = data.get("dosha", "")
+        return cls(
+            name=_intern(data["name"]),
+            sanskrit=_intern(data.get("sanskrit", "")),
+            benefits=_intern_all(data.get("benefits", ())),
+            dosha=_intern(dosha),
+            dosage=_intern(data.get("dosage", "")),
+            aliases=tuple(data.get("aliases", ())),
+            dosha_mask=data.get("dosha_mask", parse_doshas(dosha))
+        )
+
+    @property
+    def uses(self) -> str:
+        return ", ".join(self.benefits)
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "sanskrit": self.sanskrit,
+            "benefits": list(self.benefits),
+            "dosha": self.dosha,
+            "dosage": self.dosage,
+            "aliases": list(self.aliases)
+        }
+
+    def __repr__(self):
+        return f"AyurvedicHerb(name={self.name})"
+
+
+@dataclass(frozen=True, slots=True, repr=False)
+class Passage:
+    key: str
+    kind: str
+    title: str
+    text: str
+
+    def __post_init__(self):
+        object.__setattr__(self, "kind", _intern(self.kind))
+
+    def to_dict(self) -> dict:
+        return asdict(self)
 
     def __repr__(self):
-        return f"AyurvedicHerb(name={self.name})"
\ No newline at end of file
+        return f"Passage(key={self.key})"
@@ -0,0 +1,166 @@
+# profile_store.py
+
+import atexit
+import json
+import os
+import sqlite3
+import threading
+import time
+
+DB_PATH = os.environ.get(
+    "AYURVEDA_DB_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "wellness.db")
+)
+
+# Pending writes are flushed after this many seconds or this many users, whichever comes first
+FLUSH_INTERVAL = 0.5
+FLUSH_BATCH_SIZE = 500
+
+FIELDS = ("profile", "dosha_results", "routine")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    user_id TEXT PRIMARY KEY,
+    profile TEXT,
+    dosha_results TEXT,
+    routine TEXT,
+    updated_at REAL NOT NULL
+) WITHOUT ROWID
+"""
+
+_UPSERT = """
+INSERT INTO users (user_id, profile, dosha_results, routine, updated_at)
+VALUES (?, ?, ?, ?, ?)
+ON CONFLICT(user_id) DO UPDATE SET
+    profile = COALESCE(excluded.profile, users.profile),
+    dosha_results = COALESCE(excluded.dosha_results, users.dosha_results),
+    routine = COALESCE(excluded.routine, users.routine),
+    updated_at = excluded.updated_at
+"""
+
+
+class ProfileStore:
+    """
+    SQLite store for user profiles, dosha results and routine preferences.
+    One connection is shared by the whole process (WAL mode, so reads are not
+    blocked by the writer). save() only queues the change; a background
+    thread writes queued changes in batches, one transaction per batch.
+    """
+
+    def __init__(self, path: str = DB_PATH):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(_SCHEMA)
+        self._conn_lock = threading.Lock()
+
+        # Changes waiting for the writer, and the batch it is currently writing
+        self._pending = {}
+        self._inflight = {}
+        self._pending_lock = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._closed = False
+        self._writer = threading.Thread(target=self._write_behind, name="profile-store-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def save(self, user_id: str, **fields):
+        """
+        Queue profile, dosha_results and/or routine (JSON-serializable values)
+        for user_id. Returns immediately; later saves for the same user are
+        merged into one write.
+        """
+        unknown = set(fields) - set(FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown profile fields: {', '.join(sorted(unknown))}")
+        with self._pending_lock:
+            self._pending.setdefault(user_id, {}).update(fields)
+            if len(self._pending) >= FLUSH_BATCH_SIZE:
+                self._pending_lock.notify()
+
+    def load(self, user_id: str) -> dict:
+        """
+        Return {"profile", "dosha_results", "routine"} for user_id with one
+        primary-key read. Queued but unwritten changes are included.
+        """
+        with self._conn_lock:
+            row = self._conn.execute(
+                "SELECT profile, dosha_results, routine FROM users WHERE user_id = ?", (user_id,)
+            ).fetchone()
+            # Still under the connection lock, so a batch cannot commit in between
+            with self._pending_lock:
+                unwritten = {**self._inflight.get(user_id, {}), **self._pending.get(user_id, {})}
+        saved = {field: json.loads(value) if value else None for field, value in zip(FIELDS, row or (None,) * 3)}
+        saved.update(unwritten)
+        return saved
+
+    def flush(self):
+        """
+        Write every queued change now.
+        """
+        with self._flush_lock:
+            with self._pending_lock:
+                self._inflight, self._pending = self._pending, {}
+            if not self._inflight:
+                return
+            now = time.time()
+            rows = [
+                (user_id, *(json.dumps(fields[field]) if field in fields else None for field in FIELDS), now)
+                for user_id, fields in self._inflight.items()
+            ]
+            with self._conn_lock:
+                self._conn.execute("BEGIN")
+                try:
+                    self._conn.executemany(_UPSERT, rows)
+                    self._conn.execute("COMMIT")
+                except BaseException:
+                    self._conn.execute("ROLLBACK")
+                    # Put the batch back so it is retried, without overwriting newer saves
+                    with self._pending_lock:
+                        for user_id, fields in self._inflight.items():
+                            self._pending[user_id] = {**fields, **self._pending.get(user_id, {})}
+                        self._inflight = {}
+                    raise
+                with self._pending_lock:
+                    self._inflight = {}
+
+    def close(self):
+        with self._pending_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._pending_lock.notify()
+        self._writer.join()
+        self.flush()
+        with self._conn_lock:
+            self._conn.close()
+
+    def _write_behind(self):
+        while True:
+            with self._pending_lock:
+                if not self._closed:
+                    self._pending_lock.wait(FLUSH_INTERVAL)
+                closed = self._closed
+            try:
+                self.flush()
+            except sqlite3.Error:
+                # The batch was re-queued by flush(); retry on the next interval
+                if closed:
+                    raise
+            if closed:
+                return
+
+
+_shared_store = None
+_shared_store_lock = threading.Lock()
+
+
+def shared_profile_store() -> ProfileStore:
+    """Return the process-wide profile store, opening it on first use."""
+    global _shared_store
+    if _shared_store is None:
+        with _shared_store_lock:
+            if _shared_store is None:
+                _shared_store = ProfileStore()
+    return _shared_store
@@ -0,0 +1,115 @@
+# questionnaire.py
+
+import numpy as np
+
+DOSHAS = ("vata", "pitta", "kapha")
+
+# Respondents scored per matrix multiply; bounds the one-hot selection matrix
+BLOCK_SIZE = 8192
+
+
+class Questionnaire:
+    """
+    A dosha questionnaire stored as an option -> dosha weight matrix.
+    Every option of every question owns one row of the matrix, so an option
+    may carry fractional weight towards several doshas. Respondents are scored
+    as a one-hot selection matrix multiplied by the weight matrix.
+    """
+
+    def __init__(self, questions: list, options: list, weights: list = None, doshas: tuple = DOSHAS):
+        if len(questions) != len(options):
+            raise ValueError("Every question needs a list of options.")
+        self.questions = list(questions)
+        self.options = [list(option_list) for option_list in options]
+        self.doshas = tuple(doshas)
+
+        if weights is None:
+            # Default: option i is one vote for dosha i
+            weights = [np.eye(len(option_list), len(self.doshas)) for option_list in self.options]
+        elif len(weights) != len(self.questions):
+            raise ValueError("Every question needs a weight matrix.")
+
+        rows = []
+        for question, option_list, question_weights in zip(self.questions, self.options, weights):
+            question_weights = np.asarray(question_weights, dtype=np.float64)
+            if question_weights.shape != (len(option_list), len(self.doshas)):
+                raise ValueError(
+                    f"Weights for '{question}' must have shape ({len(option_list)}, {len(self.doshas)})."
+                )
+            rows.append(question_weights)
+
+        self.weights = np.vstack(rows)
+        self.weights.flags.writeable = False
+        self._option_counts = np.array([len(option_list) for option_list in self.options], dtype=np.intp)
+        self._offsets = np.concatenate(([0], np.cumsum(self._option_counts)[:-1])).astype(np.intp)
+
+    def score(self, answers) -> np.ndarray:
+        """
+        Return raw dosha scores for 0-based option indices.
+        answers is a (questions,) vector for one respondent or a
+        (respondents, questions) array; the result has a trailing dosha axis.
+        """
+        answers = np.asarray(answers, dtype=np.intp)
+        single = answers.ndim == 1
+        answers = np.atleast_2d(answers)
+        if answers.ndim != 2 or answers.shape[1] != len(self.questions):
+            raise ValueError(f"Expected answers for {len(self.questions)} questions.")
+        if ((answers < 0) | (answers >= self._option_counts)).any():
+            raise ValueError("Every question must be answered with a valid option index.")
+
+        columns = self._offsets + answers
+        scores = np.empty((answers.shape[0], len(self.doshas)))
+        for start in range(0, answers.shape[0], BLOCK_SIZE):
+            block = columns[start:start + BLOCK_SIZE]
+            selected = np.zeros((block.shape[0], self.weights.shape[0]))
+            selected[np.arange(block.shape[0])[:, None], block] = 1.0
+            scores[start:start + BLOCK_SIZE] = selected @ self.weights
+        return scores[0] if single else scores
+
+    def percentages(self, answers) -> np.ndarray:
+        """
+        Return dosha percentages for one or many respondents.
+        Respondents with no weight at all are split evenly as 33.3% each.
+        """
+        scores = self.score(answers)
+        totals = scores.sum(axis=-1, keepdims=True)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            percentages = scores / totals * 100
+        return np.where(totals > 0, percentages, 33.3)
+
+    def primary_doshas(self, answers) -> np.ndarray:
+        """
+        Return the index of the primary dosha for one or many respondents.
+        Ties go to the dosha listed first.
+        """
+        return self.percentages(answers).argmax(axis=-1)
+
+    def analyze(self, answers) -> dict:
+        """
+        Score a single respondent and return the dosha result payload.
+        """
+        percentages = self.percentages(answers)
+        if percentages.ndim != 1:
+            raise ValueError("analyze() scores a single respondent; use percentages() for bulk scoring.")
+        return {
+            "percentages": {dosha: float(pct) for dosha, pct in zip(self.doshas, percentages)},
+            "primary": self.doshas[int(percentages.argmax())]
+        }
+
+
+DOSHA_QUIZ = Questionnaire(
+    questions=[
+        "1. What best describes your body frame?",
+        "2. How is your skin type?",
+        "3. What is your typical appetite like?",
+        "4. How do you handle stress?",
+        "5. What is your sleep pattern?"
+    ],
+    options=[
+        ["Thin, light, prominent bones", "Medium, muscular, well-proportioned", "Large, sturdy, well-padded"],
+        ["Dry, rough, cool to touch", "Oily, warm, prone to rashes", "Thick, smooth, cool"],
+        ["Irregular, sometimes hungry, sometimes not", "Strong, get irritable if meal is delayed", "Steady but can skip meals easily"],
+        ["Worry, anxiety, nervousness", "Irritability, anger, frustration", "Withdraw, avoid, become inactive"],
+        ["Light sleeper, easily disturbed", "Moderate sleeper, wake up hot", "Deep sleeper, hard to wake up"]
+    ]
+)
@@ -0,0 +1,177 @@
+# session_backend.py
+#
+# Shared storage for the small, JSON-serializable part of each Streamlit
+# session (current page, profile, dosha results, routine), so any worker
+# process behind a load balancer can serve any rerun of a session. Each
+# browser tab is its own session, keyed by session_key(uid, sid).
+#
+# Chosen with AYURVEDA_SESSION_BACKEND:
+#     sqlite                  (default) sessions.db next to this file, shared by workers on one host
+#     sqlite:///path/to/file  another SQLite file
+#     redis://host:6379/0     a Redis server, through the optional redis package
+#     local-redis             LocalRedis, an in-process stand-in with the same interface
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+SESSION_BACKEND = os.environ.get("AYURVEDA_SESSION_BACKEND", "sqlite")
+SESSION_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sessions.db")
+
+# Sessions untouched for this many seconds are forgotten
+SESSION_TTL = 24 * 60 * 60
+
+
+class SessionBackend:
+    """Interface: load/save/delete one session's state as a JSON-serializable dict."""
+
+    def load(self, session_id: str):
+        """Return the stored state of session_id, or None."""
+        raise NotImplementedError
+
+    def save(self, session_id: str, state: dict):
+        raise NotImplementedError
+
+    def delete(self, session_id: str):
+        raise NotImplementedError
+
+
+class SQLiteSessionBackend(SessionBackend):
+    """
+    Sessions in a SQLite file in WAL mode, one row per session. Writes are
+    committed immediately so other processes see them on their next read.
+    """
+
+    def __init__(self, path: str = SESSION_DB_PATH, ttl: float = SESSION_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sessions "
+            "(session_id TEXT PRIMARY KEY, state TEXT NOT NULL, expires_at REAL NOT NULL) WITHOUT ROWID"
+        )
+        self._conn.execute("DELETE FROM sessions WHERE expires_at < ?", (time.time(),))
+        self._lock = threading.Lock()
+
+    def load(self, session_id: str):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT state FROM sessions WHERE session_id = ? AND expires_at >= ?", (session_id, time.time())
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save(self, session_id: str, state: dict):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sessions (session_id, state, expires_at) VALUES (?, ?, ?)",
+                (session_id, json.dumps(state), time.time() + self.ttl)
+            )
+
+    def delete(self, session_id: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+
+
+class RedisSessionBackend(SessionBackend):
+    """
+    Sessions as JSON strings under prefix + session_id in Redis, expiring
+    after ttl seconds. client is anything with the redis-py get/set/delete
+    interface, such as redis.Redis or LocalRedis.
+    """
+
+    def __init__(self, client, prefix: str = "ayurveda:session:", ttl: float = SESSION_TTL):
+        self.client = client
+        self.prefix = prefix
+        self.ttl = int(ttl)
+
+    def load(self, session_id: str):
+        value = self.client.get(self.prefix + session_id)
+        return json.loads(value) if value is not None else None
+
+    def save(self, session_id: str, state: dict):
+        self.client.set(self.prefix + session_id, json.dumps(state), ex=self.ttl)
+
+    def delete(self, session_id: str):
+        self.client.delete(self.prefix + session_id)
+
+
+class LocalRedis:
+    """
+    In-process stand-in for a Redis client: the get/set/delete subset used
+    by RedisSessionBackend, with expiry. For tests and single-process runs.
+    """
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str):
+        with self._lock:
+            value, expires_at = self._data.get(name, (None, None))
+            if expires_at is not None and expires_at < time.time():
+                del self._data[name]
+                return None
+            return value
+
+    def set(self, name: str, value, ex=None):
+        with self._lock:
+            self._data[name] = (value.encode() if isinstance(value, str) else value,
+                                time.time() + ex if ex else None)
+        return True
+
+    def delete(self, *names) -> int:
+        with self._lock:
+            return sum(self._data.pop(name, None) is not None for name in names)
+
+
+def create_backend(spec: str = SESSION_BACKEND) -> SessionBackend:
+    """Build the backend named by an AYURVEDA_SESSION_BACKEND value."""
+    if spec == "sqlite":
+        return SQLiteSessionBackend()
+    if spec.startswith("sqlite:///"):
+        return SQLiteSessionBackend(spec[len("sqlite:///"):])
+    if spec == "local-redis":
+        return RedisSessionBackend(LocalRedis())
+    if spec.startswith(("redis://", "rediss://", "unix://")):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError(f"AYURVEDA_SESSION_BACKEND={spec} needs the redis package (pip install redis).")
+        return RedisSessionBackend(redis.Redis.from_url(spec))
+    raise ValueError(f"Unknown session backend '{spec}'.")
+
+
+def session_key(user_id: str, session_id: str) -> str:
+    """Backend key of one browser tab (session_id) of a user."""
+    return f"{user_id}:{session_id}"
+
+
+def sync_session(backend: SessionBackend, session_id: str, local: dict, last_synced: dict):
+    """
+    Reconcile one session with the backend and return the state to use.
+    If local changed since last_synced it is written and wins; otherwise
+    the stored state, which another worker may have updated, is returned.
+    """
+    if local != last_synced:
+        backend.save(session_id, local)
+        return local
+    stored = backend.load(session_id)
+    return local if stored is None else stored
+
+
+_shared_backend = None
+_shared_backend_lock = threading.Lock()
+
+
+def shared_session_backend() -> SessionBackend:
+    """Return the process-wide session backend, creating it on first use."""
+    global _shared_backend
+    if _shared_backend is None:
+        with _shared_backend_lock:
+            if _shared_backend is None:
+                _shared_backend = create_backend()
+    return _shared_backend
@@ -0,0 +1,164 @@
+# symptom_index.py
+
+import threading
+
+from coalescing_cache import CoalescingCache
+from metrics import timed
+from models import Symptom
+from symptom_matcher import KeywordMatcher
+from text_keys import KeyIndex
+
+# Candidate herbs kept per symptom and per symptom-checker result
+HERBS_PER_SYMPTOM = 3
+
+# Distinct symptom sets whose checker results are kept
+CHECK_CACHE_SIZE = 4096
+
+
+def canonical_symptom(symptom: str) -> str:
+    return symptom.lower().strip()
+
+
+class SymptomIndex:
+    """
+    Precomputed symptom -> result index for the symptom checker.
+    Each canonical symptom maps to its dosha keyword scores, home remedies
+    and candidate herbs, merged from the symptom table, the remedy store
+    and the symptom keyword matcher. Symptoms are looked up by their key,
+    name or any alias, in English, Hindi or Devanagari: exactly first, then
+    by lookup key.
+    Checker results are cached per multiset of canonical symptoms and
+    shared by every session; changing a remedy clears them.
+    """
+
+    def __init__(self, symptoms: dict, remedies: dict, matcher, herbs, herbs_by_dosha: dict):
+        self.matcher = matcher
+        self.herbs = list(herbs)
+        self._herbs_by_dosha = herbs_by_dosha
+        # Herb names are found in remedy texts in one pass, however many herbs there are
+        self._herbs_by_name = {}
+        for position, herb in enumerate(self.herbs):
+            self._herbs_by_name.setdefault(herb.name.lower(), []).append(position)
+        self._herb_names = KeywordMatcher(self._herbs_by_name)
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._keys = KeyIndex()  # symptom key, name or alias -> canonical symptom
+        self.aliases = {}  # canonical symptom -> alternative names from the symptom table
+        # Home remedies from the symptom table; the remedy store adds one more per symptom
+        self._home_remedies = {}
+        for key, symptom in symptoms.items():
+            key = canonical_symptom(key)
+            self._home_remedies[key] = tuple(symptom["remedies"])
+            self._entries[key] = self._build_entry(symptom["name"], self._home_remedies[key], remedies.get(key))
+            self.aliases[key] = tuple(symptom.get("aliases", ()))
+            self._keys.add(key, key)
+            self._keys.add(symptom["name"], key)
+        for key, remedy in remedies.items():
+            if key not in self._entries:
+                self._entries[key] = self._build_entry(key.title(), (), remedy)
+                self._keys.add(key, key)
+        # Aliases last, so they never take a key that names a symptom
+        for key, aliases in self.aliases.items():
+            for alias in aliases:
+                self._keys.add(alias, key)
+        self.results = CoalescingCache(self._check, CHECK_CACHE_SIZE, "symptom_check")
+
+    def _build_entry(self, name, home_remedies, remedy=None):
+        remedies = tuple(home_remedies)
+        if remedy and remedy not in remedies:
+            remedies += (remedy,)
+        scores = tuple(self.matcher.score(name))
+
+        # Herbs named in the remedies first, then herbs for the symptom's dosha
+        text = " ".join(remedies).lower()
+        names = self._herb_names.keywords
+        positions = sorted(position for name_id in self._herb_names.find(text)
+                           for position in self._herbs_by_name[names[name_id]])
+        candidates = [self.herbs[position] for position in positions]
+        if any(scores):
+            dosha = self.matcher.doshas[scores.index(max(scores))]
+            candidates += [herb for herb in self._herbs_by_dosha[dosha] if herb not in candidates]
+
+        return Symptom(name, scores=scores, remedies=remedies, herbs=tuple(candidates[:HERBS_PER_SYMPTOM]))
+
+    @property
+    def names(self) -> list:
+        """Display names of every indexed symptom."""
+        return [entry.name for entry in list(self._entries.values())]
+
+    def get(self, symptom: str):
+        """Return the index entry for a symptom, or None if it is unknown."""
+        return self._entries.get(self._keys.get(symptom))
+
+    def label(self, name: str) -> str:
+        """Display name with its aliases, so pickers can be filtered in Hindi too."""
+        aliases = self.aliases.get(self._keys.get(name))
+        return f"{name} ({', '.join(aliases)})" if aliases else name
+
+    def canonical(self, symptom: str, exact: bool = False) -> str:
+        """
+        The canonical symptom: the indexed symptom named by a key, name or
+        alias, or the normalized text of an unknown symptom. With exact,
+        only names that match exactly (ignoring case and spacing) count,
+        so a new symptom is never merged into one it merely resembles.
+        """
+        key = self._keys.get_exact(symptom) if exact else self._keys.get(symptom)
+        return key or canonical_symptom(symptom)
+
+    def canonical_key(self, symptoms) -> tuple:
+        """
+        The canonical symptoms of a list (see canonical()), sorted. Repeats
+        are kept, since a symptom named twice counts twice.
+        """
+        return tuple(sorted(self.canonical(symptom) for symptom in symptoms))
+
+    @timed("ayurveda_kb_call_seconds", "method")
+    def check(self, symptoms) -> dict:
+        """
+        Return the full symptom-checker result for a list of symptoms:
+        dosha probabilities, primary dosha, recommended herbs and the home
+        remedies of every known symptom. Unknown symptoms still count
+        towards the dosha analysis. The result is read-only and shared by
+        every caller naming the same symptoms, in any order or spelling.
+        """
+        return self.results.get(self.canonical_key(symptoms))
+
+    def _check(self, canonical: tuple) -> dict:
+        from wellness_kb import freeze  # wellness_kb imports this module
+
+        scores = []
+        remedies = {}
+        for symptom in canonical:
+            entry = self._entries.get(symptom)
+            if entry is None:
+                scores.append(self.matcher.score(symptom))
+                continue
+            scores.append(entry.scores)
+            if entry.remedies:
+                remedies[entry.name] = entry.remedies
+
+        result = self.matcher.summarize(scores)
+        result["herbs"] = list(self._herbs_by_dosha[result["primary_dosha"]][:HERBS_PER_SYMPTOM])
+        result["remedies"] = remedies
+        return freeze(result)
+
+    def add_remedy(self, symptom: str, remedy: str):
+        """
+        Set the remedy-store remedy of a symptom, creating the symptom if
+        needed. Only that symptom's entry is rebuilt.
+        """
+        self.add_remedies([(symptom, remedy)])
+
+    def add_remedies(self, pairs):
+        """
+        Set the remedies of many (symptom, remedy) pairs under one lock.
+        A symptom is the indexed one only if it names it exactly.
+        """
+        with self._lock:
+            for symptom, remedy in pairs:
+                key = self.canonical(symptom, exact=True)
+                self._keys.add(key, key)
+                entry = self._entries.get(key)
+                name = entry.name if entry else symptom.strip().title()
+                self._entries[key] = self._build_entry(name, self._home_remedies.get(key, ()), remedy)
+            self.results.clear()
@@ -0,0 +1,142 @@
+# symptom_matcher.py
+
+from collections import deque
+from functools import lru_cache
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton over a fixed keyword vocabulary.
+    Finds every keyword contained in a text with a single pass over the text,
+    so the cost no longer grows with the number of keywords.
+    """
+
+    def __init__(self, keywords):
+        self.keywords = tuple(dict.fromkeys(keywords))
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [set()]
+
+        for keyword_id, keyword in enumerate(self.keywords):
+            state = 0
+            for char in keyword:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(set())
+                state = next_state
+            self._out[state].add(keyword_id)
+
+        # Breadth-first pass to wire failure links and merge suffix outputs
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._out[next_state] |= self._out[self._fail[next_state]]
+
+        self._out = [frozenset(ids) for ids in self._out]
+        # The empty keyword (if any) is contained in every text
+        self._always = self._out[0]
+
+    def find(self, text: str) -> frozenset:
+        """
+        Return the ids of all distinct keywords contained in text.
+        """
+        goto, fail, out = self._goto, self._fail, self._out
+        found = set(self._always)
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if out[state]:
+                found |= out[state]
+        return frozenset(found)
+
+
+class SymptomMatcher:
+    """
+    Compiled symptom scorer built from a {dosha: [keywords]} table.
+    Scores are identical to testing every keyword with `in` against the
+    lowercased symptom and adding one per hit.
+    """
+
+    def __init__(self, keywords_by_dosha: dict):
+        self.doshas = tuple(keywords_by_dosha)
+        weights = {}
+        for index, dosha in enumerate(self.doshas):
+            for keyword in keywords_by_dosha[dosha]:
+                weight = weights.setdefault(keyword, [0] * len(self.doshas))
+                weight[index] += 1
+        self._matcher = KeywordMatcher(weights)
+        self._weights = [tuple(weights[keyword]) for keyword in self._matcher.keywords]
+
+    def score(self, symptom: str) -> list:
+        """
+        Return the per-dosha keyword hit counts for a single symptom.
+        """
+        scores = [0] * len(self.doshas)
+        for keyword_id in self._matcher.find(symptom.lower()):
+            for index, weight in enumerate(self._weights[keyword_id]):
+                scores[index] += weight
+        return scores
+
+    def analyze(self, symptoms) -> dict:
+        """
+        Score a list of symptoms and return dosha probabilities and the primary dosha.
+        """
+        return self.summarize([self.score(symptom) for symptom in symptoms])
+
+    def analyze_batch(self, symptom_lists) -> list:
+        """
+        Analyze many symptom lists at once.
+        Each distinct symptom string is scanned only once per batch.
+        """
+        memo = {}
+        results = []
+        for symptoms in symptom_lists:
+            symptom_scores = []
+            for symptom in symptoms:
+                scores = memo.get(symptom)
+                if scores is None:
+                    scores = memo[symptom] = self.score(symptom)
+                symptom_scores.append(scores)
+            results.append(self.summarize(symptom_scores))
+        return results
+
+    def summarize(self, symptom_scores) -> dict:
+        """
+        Combine per-symptom scores into dosha probabilities and the primary dosha.
+        """
+        totals = [sum(column) for column in zip(*symptom_scores)] or [0] * len(self.doshas)
+        dosha_scores = dict(zip(self.doshas, totals))
+        score_sum = sum(totals)
+        primary_dosha = max(dosha_scores, key=dosha_scores.get) if score_sum > 0 else self.doshas[0]
+
+        total = max(score_sum, 1)
+        return {
+            "dosha_probabilities": {dosha: dosha_scores[dosha] / total for dosha in self.doshas},
+            "primary_dosha": primary_dosha
+        }
+
+
+@lru_cache(maxsize=32)
+def _compile(frozen_keywords):
+    return SymptomMatcher({dosha: list(keywords) for dosha, keywords in frozen_keywords})
+
+
+def compile_symptom_matcher(keywords_by_dosha: dict) -> SymptomMatcher:
+    """
+    Return a compiled matcher for the keyword table.
+    Matchers are shared between knowledge bases with identical keyword tables.
+    """
+    frozen_keywords = tuple((dosha, tuple(keywords)) for dosha, keywords in keywords_by_dosha.items())
+    return _compile(frozen_keywords)
@@ -0,0 +1,30 @@
+# tests/conftest.py
+#
+# Run from the repository root:
+#     python -m pytest -q
+
+import os
+import shutil
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from kb_store import DATA_DIR, KnowledgeStore  # noqa: E402
+
+
+@pytest.fixture
+def store(tmp_path):
+    """A copy of the shipped knowledge base sections, safe to modify."""
+    data_dir = tmp_path / "data"
+    shutil.copytree(DATA_DIR, data_dir)
+    return KnowledgeStore(str(data_dir))
+
+
+@pytest.fixture
+def kb(store):
+    """A private knowledge base over the copied sections, not the shared one."""
+    from wellness_kb import AyurvedicKnowledgeBase
+    return AyurvedicKnowledgeBase(store)
@@ -0,0 +1,108 @@
+# tests/test_bulk_io.py
+import io
+import json
+
+import pytest
+
+import bulk_io
+from kb_store import KnowledgeStore
+
+
+def empty_store_at(directory):
+    """A store with empty herbs and remedies sections."""
+    directory.mkdir()
+    store = KnowledgeStore(str(directory))
+    for section in bulk_io.FIELDS:
+        store.save(section, {})
+    return store
+
+
+@pytest.fixture
+def empty_store(tmp_path):
+    return empty_store_at(tmp_path / "empty")
+
+
+def round_trip(source, target, section, format):
+    """Export section from source and import it into target; returns the import report."""
+    out = io.StringIO()
+    exported = bulk_io.export_records(source, section, out, format)
+    assert exported == len(source.load(section))
+    out.seek(0)
+    return bulk_io.import_records(target, section, bulk_io.read_records(out, format), chunk_size=7)
+
+
+def jsonl(*records):
+    return io.StringIO("".join(json.dumps(record) + "\n" for record in records))
+
+
+@pytest.mark.parametrize("section,format", [(s, f) for s in bulk_io.FIELDS for f in ("jsonl", "csv")])
+def test_export_import_round_trip(store, tmp_path, section, format):
+    first, second = empty_store_at(tmp_path / "first"), empty_store_at(tmp_path / "second")
+    report = round_trip(store, first, section, format)
+    count = len(store.load(section))
+    assert (report.read, report.added, report.failed) == (count, count, 0)
+    assert first.load(section).keys() == store.load(section).keys()
+
+    # Imported records are already normalized, so a second round trip changes nothing
+    round_trip(first, second, section, format)
+    assert second.load(section) == first.load(section)
+
+
+def test_records_are_normalized(empty_store):
+    report = bulk_io.import_records(empty_store, "herbs", bulk_io.read_records(jsonl(
+        {"name": "  Holy   Basil ", "benefits": ["Immunity", "Immunity", " Stress  relief"], "dosha": "kapha and vata"},
+    ), "jsonl"))
+    assert report.added == 1
+    assert empty_store.load("herbs") == {"holy basil": {
+        "name": "Holy Basil", "sanskrit": "", "benefits": ["Immunity", "Stress relief"],
+        "dosha": "Vata, Kapha", "dosage": "", "aliases": []
+    }}
+
+
+def test_existing_keys_are_updated(store):
+    existing = next(iter(store.load("remedies")))
+    report = bulk_io.import_records(store, "remedies", bulk_io.read_records(jsonl(
+        {"symptom": existing.upper(), "remedy": "Rest."},
+    ), "jsonl"))
+    assert (report.added, report.updated) == (0, 1)
+    assert store.load("remedies")[existing] == "Rest."
+
+
+def test_invalid_records_are_reported(empty_store):
+    lines = io.StringIO(
+        '{"symptom": "cough", "remedy": "Honey with ginger."}\n'
+        "not json\n"
+        '["cough"]\n'
+        '{"symptom": "fever"}\n'
+        '{"symptom": "cold", "remedy": 3}\n'
+    )
+    report = bulk_io.import_records(empty_store, "remedies", bulk_io.read_records(lines, "jsonl"))
+    assert (report.read, report.added, report.failed) == (5, 1, 4)
+    assert [number for number, _ in report.errors] == [2, 3, 4, 5]
+    assert empty_store.load("remedies") == {"cough": "Honey with ginger."}
+
+
+def test_invalid_dosha_is_rejected(empty_store):
+    report = bulk_io.import_records(empty_store, "herbs", bulk_io.read_records(jsonl(
+        {"name": "Neem", "dosha": "Fire"},
+    ), "jsonl"))
+    assert report.failed == 1 and "dosha" in report.errors[0][1]
+
+
+def test_reported_errors_are_capped(empty_store, monkeypatch):
+    monkeypatch.setattr(bulk_io, "MAX_REPORTED_ERRORS", 2)
+    report = bulk_io.import_records(empty_store, "remedies", bulk_io.read_records(jsonl(*[{}] * 5), "jsonl"))
+    assert report.failed == 5 and len(report.errors) == 2
+    assert report.summary().endswith("... and 3 more")
+
+
+def test_csv_benefits_and_extra_values(empty_store):
+    lines = io.StringIO(
+        "name,benefits,dosha\n"
+        "Triphala,Digestion; Detox;Digestion,All doshas\n"
+        "Neem,Skin,Pitta,extra\n"
+    )
+    report = bulk_io.import_records(empty_store, "herbs", bulk_io.read_records(lines, "csv"))
+    assert (report.added, report.failed) == (1, 1)
+    assert report.errors == [(2, "more values than columns")]
+    assert empty_store.load("herbs")["triphala"]["benefits"] == ["Digestion", "Detox"]
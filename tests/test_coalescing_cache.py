@@ -0,0 +1,93 @@
+# tests/test_coalescing_cache.py
+
+import threading
+import time
+
+import pytest
+
+from coalescing_cache import CoalescingCache
+
+
+def test_hits_misses_and_lru_eviction():
+    calls = []
+    cache = CoalescingCache(lambda key: calls.append(key) or key * 2, maxsize=2, name="test")
+    assert cache.get(1) == 2
+    assert cache.get(1) == 2
+    cache.get(2)
+    cache.get(1)  # 1 is now the most recently used
+    cache.get(3)  # evicts 2
+    cache.get(1)
+    cache.get(2)
+    assert calls == [1, 2, 3, 2]
+    assert cache.info() == {"hits": 3, "misses": 4, "coalesced": 0, "size": 2, "maxsize": 2}
+
+
+def test_concurrent_gets_share_one_computation():
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def compute(key):
+        calls.append(key)
+        started.set()
+        release.wait(5)
+        return key.upper()
+
+    cache = CoalescingCache(compute, maxsize=10, name="test")
+    results = []
+    first = threading.Thread(target=lambda: results.append(cache.get("a")))
+    first.start()
+    started.wait(5)
+    waiters = [threading.Thread(target=lambda: results.append(cache.get("a"))) for _ in range(3)]
+    for thread in waiters:
+        thread.start()
+    while cache.coalesced < 3:
+        time.sleep(0.001)
+    release.set()
+    for thread in (first, *waiters):
+        thread.join()
+
+    assert calls == ["a"]
+    assert results == ["A"] * 4
+    assert (cache.misses, cache.coalesced) == (1, 3)
+
+
+def test_errors_reach_every_waiter_and_are_not_cached():
+    attempts = []
+
+    def compute(key):
+        attempts.append(key)
+        if len(attempts) == 1:
+            raise RuntimeError("data unavailable")
+        return key
+
+    cache = CoalescingCache(compute, maxsize=10, name="test")
+    with pytest.raises(RuntimeError):
+        cache.get("a")
+    assert cache.get("a") == "a"
+    assert len(attempts) == 2
+
+
+def test_clear_drops_values_computed_from_old_data():
+    data = {"a": 1}
+    started, release = threading.Event(), threading.Event()
+
+    def compute(key):
+        value = data[key]
+        started.set()
+        release.wait(5)
+        return value
+
+    cache = CoalescingCache(compute, maxsize=10, name="test")
+    results = []
+    thread = threading.Thread(target=lambda: results.append(cache.get("a")))
+    thread.start()
+    started.wait(5)
+    data["a"] = 2
+    cache.clear()
+    release.set()
+    thread.join()
+
+    # The caller that was running still gets its value, but it is not kept
+    assert results == [1]
+    assert len(cache) == 0
+    assert cache.get("a") == 2
@@ -0,0 +1,91 @@
+# tests/test_profile_store.py
+import sqlite3
+
+import pytest
+
+import profile_store
+from profile_store import ProfileStore
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "wellness.db")
+
+
+@pytest.fixture
+def profiles(db_path):
+    store = ProfileStore(db_path)
+    yield store
+    store.close()
+
+
+def test_load_unknown_user(profiles):
+    assert profiles.load("nobody") == {"profile": None, "dosha_results": None, "routine": None}
+
+
+def test_load_sees_queued_changes(profiles):
+    profiles.save("u1", profile={"name": "Asha", "age": 31})
+    assert profiles.load("u1")["profile"] == {"name": "Asha", "age": 31}
+
+
+def test_saves_merge_per_user(profiles):
+    profiles.save("u1", profile={"name": "Asha"})
+    profiles.flush()
+    profiles.save("u1", routine={"wake": "06:00"})
+    profiles.save("u2", dosha_results={"Vata": 50})
+    profiles.flush()
+
+    assert profiles.load("u1") == {"profile": {"name": "Asha"}, "dosha_results": None, "routine": {"wake": "06:00"}}
+    assert profiles.load("u2")["dosha_results"] == {"Vata": 50}
+
+
+def test_unknown_field_rejected(profiles):
+    with pytest.raises(ValueError):
+        profiles.save("u1", email="a@example.com")
+
+
+def test_close_writes_queued_changes(db_path):
+    store = ProfileStore(db_path)
+    store.save("u1", profile={"name": "Asha"}, dosha_results={"Pitta": 40})
+    store.close()
+
+    reopened = ProfileStore(db_path)
+    try:
+        assert reopened.load("u1")["profile"] == {"name": "Asha"}
+        assert reopened.load("u1")["dosha_results"] == {"Pitta": 40}
+    finally:
+        reopened.close()
+
+
+class _FailingConnection:
+    def __init__(self, conn):
+        self._conn = conn
+
+    def execute(self, *args):
+        return self._conn.execute(*args)
+
+    def executemany(self, *args):
+        raise sqlite3.OperationalError("database is locked")
+
+
+def test_failed_batch_is_requeued(db_path, monkeypatch):
+    # Keep the background writer out of the way so flush() below sees the batch
+    monkeypatch.setattr(profile_store, "FLUSH_INTERVAL", 60)
+    profiles = ProfileStore(db_path)
+    conn = profiles._conn
+    profiles._conn = _FailingConnection(conn)
+    profiles.save("u1", profile={"name": "Asha"}, dosha_results={"Kapha": 35})
+    with pytest.raises(sqlite3.OperationalError):
+        profiles.flush()
+    # A newer save made while the batch was failing is not overwritten by the retry
+    profiles.save("u1", profile={"name": "Asha R"})
+    profiles._conn = conn
+
+    profiles.close()
+    reopened = ProfileStore(db_path)
+    try:
+        saved = reopened.load("u1")
+        assert saved["profile"] == {"name": "Asha R"}
+        assert saved["dosha_results"] == {"Kapha": 35}
+    finally:
+        reopened.close()
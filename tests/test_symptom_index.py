@@ -0,0 +1,85 @@
+# tests/test_symptom_index.py
+
+def test_check_matches_analysis_and_herbs(kb):
+    for symptoms in (["Headache"], ["Anxiety", "Acidity"], ["Insomnia", "Fatigue", "Constipation"]):
+        result = kb.symptom_index.check(symptoms)
+        analysis = kb.analyze_symptoms(symptoms)
+        assert result["dosha_probabilities"] == analysis["dosha_probabilities"]
+        assert result["primary_dosha"] == analysis["primary_dosha"]
+        assert list(result["herbs"]) == list(kb.get_recommended_herbs(symptoms))
+
+
+def test_home_remedies_and_store_remedy_are_merged(kb):
+    remedies = kb.symptom_index.check(["Headache"])["remedies"]["Headache"]
+    assert "Apply sandalwood paste on forehead" in remedies
+    assert kb.remedy_kb.get_remedy("headache") in remedies
+
+
+def test_symptoms_are_found_in_any_case_and_spacing(kb):
+    assert kb.symptom_index.check(["  HEADACHE "]) == kb.symptom_index.check(["headache"])
+    assert kb.symptom_index.get("Not a symptom") is None
+
+
+def test_unknown_symptoms_still_count_towards_the_analysis(kb):
+    symptoms = ["anxious and restless with dry skin"]
+    result = kb.symptom_index.check(symptoms)
+    assert result["dosha_probabilities"] == kb.symptom_matcher.analyze(symptoms)["dosha_probabilities"]
+    assert result["remedies"] == {}
+
+
+def test_add_remedy_updates_the_index_entry(kb):
+    old = kb.remedy_kb.get_remedy("headache")
+    kb.remedy_kb.add_remedy("Headache", "Rest in a dark, quiet room")
+    remedies = kb.symptom_index.check(["Headache"])["remedies"]["Headache"]
+    assert "Rest in a dark, quiet room" in remedies
+    assert old not in remedies
+    assert "Apply sandalwood paste on forehead" in remedies
+    assert kb.remedy_kb.get_remedy("HEADACHE") == "Rest in a dark, quiet room"
+
+
+def test_add_remedy_creates_a_new_symptom(kb):
+    kb.remedy_kb.add_remedy("Hiccups", "Sip warm water slowly")
+    assert "Hiccups" in kb.symptom_index.names
+    assert kb.symptom_index.check(["hiccups"])["remedies"] == {"Hiccups": ("Sip warm water slowly",)}
+
+
+def test_aliases_find_the_symptom(kb):
+    assert kb.symptom_index.get("सिरदर्द") is kb.symptom_index.get("Headache")
+    assert kb.symptom_index.canonical("sir dard") == "headache"
+    assert kb.remedy_kb.get_remedy("सिरदर्द") == kb.remedy_kb.get_remedy("headache")
+
+
+def test_add_remedy_by_alias_updates_the_symptom_it_names(kb):
+    remedies = set(kb.remedy_kb.remedies)
+    kb.remedy_kb.add_remedy("सिरदर्द", "Massage the temples with brahmi oil")
+    assert set(kb.remedy_kb.remedies) == remedies
+    assert kb.remedy_kb.get_remedy("headache") == "Massage the temples with brahmi oil"
+    assert "Massage the temples with brahmi oil" in kb.symptom_index.check(["Headache"])["remedies"]["Headache"]
+
+
+def test_names_that_fold_alike_stay_separate(kb):
+    kb.remedy_kb.add_remedy("Sciatica", "Warm sesame oil massage")
+    kb.remedy_kb.add_remedy("sciatic", "Gentle stretching")
+    assert kb.remedy_kb.get_remedy("sciatica") == "Warm sesame oil massage"
+    assert kb.remedy_kb.get_remedy("Sciatic") == "Gentle stretching"
+    assert kb.symptom_index.check(["Sciatica"])["remedies"] == {"Sciatica": ("Warm sesame oil massage",)}
+    assert kb.symptom_index.check(["sciatic"])["remedies"] == {"Sciatic": ("Gentle stretching",)}
+
+
+def test_check_results_are_shared_in_any_order_and_spelling(kb):
+    first = kb.symptom_index.check(["Headache", "Insomnia"])
+    assert kb.symptom_index.check(["insomnia", "सिरदर्द"]) is first
+    assert kb.symptom_index.results.hits == 1
+
+
+def test_repeated_symptoms_count_twice(kb):
+    symptoms = ["Anxiety", "Anxiety", "Acidity"]
+    result = kb.symptom_index.check(symptoms)
+    assert result is not kb.symptom_index.check(["Anxiety", "Acidity"])
+    assert result["dosha_probabilities"] == kb.symptom_matcher.analyze(symptoms)["dosha_probabilities"]
+
+
+def test_add_remedy_clears_cached_results(kb):
+    kb.symptom_index.check(["Headache"])
+    kb.remedy_kb.add_remedy("Headache", "Rest in a dark, quiet room")
+    assert "Rest in a dark, quiet room" in kb.symptom_index.check(["Headache"])["remedies"]["Headache"]
@@ -0,0 +1,50 @@
+# tests/test_text_keys.py
+
+import pytest
+
+from text_keys import KeyIndex, exact_key, lookup_key
+
+
+@pytest.mark.parametrize("name", ["Ashwagandha", "ashvagandha", "aśvagandhā", "अश्वगन्धा", "अश्वगंधा"])
+def test_spellings_and_scripts_share_a_lookup_key(name):
+    assert lookup_key(name) == "asvagand"
+
+
+def test_exact_key_ignores_only_case_and_spacing():
+    assert exact_key("  Joint   PAIN ") == "joint pain"
+    assert exact_key("Sciatica") != exact_key("sciatic")
+    assert lookup_key("Sciatica") == lookup_key("sciatic")
+
+
+def test_key_index_prefers_the_exact_name():
+    index = KeyIndex([("Sciatica", "sciatica"), ("sciatic", "sciatic")])
+    assert index.get("SCIATICA") == "sciatica"
+    assert index.get("sciatic") == "sciatic"
+    # Only a name without an exact match falls back to the folded key
+    assert index.get("sciaticaa") == "sciatica"
+    assert index.get_exact("sciaticaa") is None
+
+
+def test_key_index_keeps_the_first_name_of_a_key():
+    index = KeyIndex()
+    index.add("Vata", "vata")
+    index.add("Vaata", "other")
+    assert index.get("vata") == "vata"
+    assert index.get("वात") == "vata"
+    assert index.get("Vaata") == "other"
+    assert index.get("missing", "default") == "default"
+
+
+def test_find_herb_in_any_script(kb):
+    for name in ("Turmeric", "haldi", "हल्दी", "  TURMERIC "):
+        assert kb.find_herb(name) is kb.herbs["turmeric"]
+    assert kb.find_herb("not a herb") is None
+
+
+def test_herb_search_ranks_names_and_benefits(kb):
+    index = kb.herb_search_index
+    for query in ("ashvagandha", "अश्वगंधा", "ashwaganda"):
+        assert index.search(query)[0][0].name == "Ashwagandha"
+    # Only Brahmi has a benefit word ("Calms") close to the query
+    herbs, _ = index.search("calm")
+    assert [herb.name for herb in herbs] == ["Brahmi"]
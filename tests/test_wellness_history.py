@@ -0,0 +1,103 @@
+# tests/test_wellness_history.py
+
+import multiprocessing
+import os
+import threading
+
+import numpy as np
+import pytest
+
+from wellness_history import ASSESSMENT, DAY, HistoryStore
+
+START = 1_700_000_000
+
+
+def test_appended_rows_are_read_back(tmp_path):
+    store = HistoryStore(str(tmp_path))
+    history = store.history("u1")
+    history.append_assessment({"vata": 50, "pitta": 30, "kapha": 20}, when=START)
+    history.append_checkin(["Headache", "Insomnia"], {"vata": 0.6, "pitta": 0.3, "kapha": 0.1}, when=START + DAY)
+    history.append_checkin(["Headache"], {"vata": 0.2, "pitta": 0.7, "kapha": 0.1}, when=START + 2 * DAY)
+
+    reloaded = HistoryStore(str(tmp_path)).history("u1")
+    assert len(reloaded) == 3
+    assert reloaded.assessments.latest() == {"vata": 50.0, "pitta": 30.0, "kapha": 20.0}
+    assert reloaded.checkins.mean() == pytest.approx({"vata": 40.0, "pitta": 50.0, "kapha": 10.0})
+    assert reloaded.symptom_counts() == [("Headache", 2), ("Insomnia", 1)]
+    assert reloaded.symptom_counts(since=START + 2 * DAY) == [("Headache", 1)]
+
+
+def test_rolling_mean_and_trend(tmp_path):
+    history = HistoryStore(str(tmp_path)).history("u1")
+    for day in range(10):
+        history.append_assessment({"vata": day, "pitta": 0, "kapha": 0}, when=START + day * DAY)
+    series = history.series(ASSESSMENT)
+    # Each row averages the rows of the ROLLING_DAYS days before it
+    assert series.rolling()[-1, 0] == pytest.approx(np.mean(range(3, 10)))
+    assert history.series(ASSESSMENT).trend()["vata"] == pytest.approx(7.0)
+
+
+def test_other_writers_rows_are_picked_up(tmp_path):
+    reader = HistoryStore(str(tmp_path)).history("u1")
+    HistoryStore(str(tmp_path)).history("u1").append_assessment({"vata": 10}, when=START)
+    assert len(reader) == 0
+    assert len(reader.refresh()) == 1
+
+
+def test_torn_row_is_ignored_and_overwritten(tmp_path):
+    store = HistoryStore(str(tmp_path))
+    store.history("u1").append_assessment({"vata": 10}, when=START)
+    # A crash after writing part of the next row: its columns are longer than time.i8
+    with open(os.path.join(str(tmp_path), "u1", "vata.f4"), "ab") as f:
+        f.write(np.array([99.0], dtype="<f4").tobytes())
+
+    history = HistoryStore(str(tmp_path)).history("u1")
+    assert len(history) == 1
+    history.append_assessment({"vata": 20}, when=START + DAY)
+    reloaded = HistoryStore(str(tmp_path)).history("u1")
+    assert reloaded.assessments.values[:, 0].tolist() == [10.0, 20.0]
+    assert os.path.getsize(os.path.join(str(tmp_path), "u1", "vata.f4")) == 2 * 4
+
+
+def _append_checkins(root, worker, rows):
+    history = HistoryStore(root).history("shared")
+    for row in range(rows):
+        history.append_checkin([f"worker {worker}", f"row {row % 2}"], {"vata": worker / 10})
+
+
+def test_concurrent_processes_write_whole_rows(tmp_path):
+    root, workers, rows = str(tmp_path), 4, 25
+    context = multiprocessing.get_context("fork")
+    processes = [context.Process(target=_append_checkins, args=(root, worker, rows)) for worker in range(workers)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+        assert process.exitcode == 0
+
+    history = HistoryStore(root).history("shared")
+    assert len(history) == workers * rows
+    counts = dict(history.symptom_counts())
+    assert counts == {**{f"worker {worker}": rows for worker in range(workers)},
+                      "row 0": workers * 13, "row 1": workers * 12}
+    values = sorted(history.checkins.values[:, 0].round().tolist())
+    assert values == sorted(10.0 * worker for worker in range(workers) for _ in range(rows))
+
+
+def test_threads_with_separate_histories_write_whole_rows(tmp_path):
+    root, workers, rows = str(tmp_path), 4, 25
+    # One store per thread, so only the file lock keeps their rows apart
+    threads = [threading.Thread(target=_append_checkins, args=(root, worker, rows)) for worker in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    history = HistoryStore(root).history("shared")
+    assert len(history) == workers * rows
+    assert dict(history.symptom_counts())["worker 0"] == rows
+
+
+def test_invalid_user_id_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        HistoryStore(str(tmp_path)).history("../etc")
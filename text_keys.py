@@ -0,0 +1,150 @@
+# text_keys.py
+#
+# Normalized lookup keys, so herbs, symptoms and doshas can be found by
+# their English, Devanagari, IAST or Romanized Hindi names. lookup_key()
+# folds all of these to the same plain ASCII key:
+#
+#     "Ashwagandha", "ashvagandha", "aśvagandhā", "अश्वगन्धा", "अश्वगंधा"  ->  "asvagand"
+#
+# Folding also merges some distinct names ("Sciatica" and "sciatic" both give
+# "sciatic"), so KeyIndex looks a name up by its exact_key() first and falls
+# back to its lookup key only when no name matches exactly.
+#
+# Keys are computed once per entry when an index is built and once per query.
+
+import re
+import unicodedata
+from functools import lru_cache
+
+# Distinct query strings whose keys are remembered
+KEY_CACHE_SIZE = 4096
+
+_VOWELS = {
+    "अ": "a", "आ": "aa", "इ": "i", "ई": "ii", "उ": "u", "ऊ": "uu", "ऋ": "ri", "ॠ": "ri",
+    "ए": "e", "ऐ": "ai", "ओ": "o", "औ": "au", "ऍ": "e", "ऑ": "o",
+}
+_VOWEL_SIGNS = {
+    "ा": "aa", "ि": "i", "ी": "ii", "ु": "u", "ू": "uu", "ृ": "ri", "ॄ": "ri",
+    "े": "e", "ै": "ai", "ो": "o", "ौ": "au", "ॅ": "e", "ॉ": "o",
+}
+_CONSONANTS = {
+    "क": "k", "ख": "kh", "ग": "g", "घ": "gh", "ङ": "n",
+    "च": "ch", "छ": "chh", "ज": "j", "झ": "jh", "ञ": "n",
+    "ट": "t", "ठ": "th", "ड": "d", "ढ": "dh", "ण": "n",
+    "त": "t", "थ": "th", "द": "d", "ध": "dh", "न": "n",
+    "प": "p", "फ": "ph", "ब": "b", "भ": "bh", "म": "m",
+    "य": "y", "र": "r", "ल": "l", "ळ": "l", "व": "v",
+    "श": "sh", "ष": "sh", "स": "s", "ह": "h",
+}
+# Consonants changed by a following nukta (Urdu and Persian sounds)
+_NUKTA = {"क": "q", "ख": "kh", "ग": "g", "ज": "z", "ड": "r", "ढ": "rh", "फ": "f", "य": "y"}
+_MARKS = {"ं": "n", "ँ": "n", "ः": "h", "ऽ": "", "।": " ", "॥": " "}
+_VIRAMA = "्"
+_NUKTA_SIGN = "़"
+
+# IAST letters whose ASCII form is not just the letter without its accent
+_IAST = str.maketrans({"ṛ": "ri", "ṝ": "ri", "ḷ": "li", "ḹ": "li"})
+
+_FOLDS = (
+    (re.compile(r"[^a-z0-9]+"), " "),
+    (re.compile(r"w"), "v"),
+    (re.compile(r"z"), "j"),  # nukta sounds are often written without the nukta
+    (re.compile(r"f"), "ph"),
+    (re.compile(r"q"), "k"),
+    (re.compile(r"ee"), "i"),
+    (re.compile(r"oo"), "u"),
+    (re.compile(r"sh"), "s"),
+    (re.compile(r"([kgcjtdpb])h"), r"\1"),  # aspirates: "dh" and "d" are spelled interchangeably
+    (re.compile(r"(.)\1+"), r"\1"),  # long vowels and doubled consonants
+    (re.compile(r"(?<=[a-z]{2})a\b"), ""),  # final schwa: "gandha" and "gandh"
+    (re.compile(r"(?<=[aeiou][b-df-hj-np-tv-z])a(?=[b-df-hj-np-tv-z][aeiou])"), ""),  # medial schwa: "adarak" and "adrak"
+)
+
+
+def transliterate(text: str) -> str:
+    """Transliterate the Devanagari in text to lowercase ASCII; other characters are kept."""
+    out = []
+    pending = None  # consonant whose inherent "a" is not yet written
+    for char in unicodedata.normalize("NFC", text):
+        if pending is not None:
+            if char == _NUKTA_SIGN:
+                out[-1] = _NUKTA.get(pending, out[-1])
+                continue
+            if char in _VOWEL_SIGNS:
+                out.append(_VOWEL_SIGNS[char])
+                pending = None
+                continue
+            if char == _VIRAMA:
+                pending = None
+                continue
+            out.append("a")
+            pending = None
+        if char in _CONSONANTS:
+            out.append(_CONSONANTS[char])
+            pending = char
+        elif char in _VOWELS:
+            out.append(_VOWELS[char])
+        elif char in _MARKS:
+            out.append(_MARKS[char])
+        elif "०" <= char <= "९":
+            out.append(str(ord(char) - ord("०")))
+        elif char != _NUKTA_SIGN:
+            out.append(char)
+    if pending is not None:
+        out.append("a")
+    return "".join(out)
+
+
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def exact_key(text: str) -> str:
+    """Return text NFC-normalized and casefolded, with whitespace collapsed."""
+    return " ".join(unicodedata.normalize("NFC", text).casefold().split())
+
+
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def lookup_key(text: str) -> str:
+    """
+    Return the folded lookup key of text: NFC and casefolded, Devanagari
+    transliterated, accents removed and common spelling variants of
+    Romanized Sanskrit and Hindi (w/v, z/j, sh/s, aspirates, long vowels,
+    Hindi schwa deletion) merged.
+    """
+    text = unicodedata.normalize("NFC", text).casefold()
+    if not text.isascii():
+        text = transliterate(text).translate(_IAST)
+        text = "".join(char for char in unicodedata.normalize("NFKD", text) if not unicodedata.combining(char))
+    for pattern, replacement in _FOLDS:
+        text = pattern.sub(replacement, text)
+    return text.strip()
+
+
+class KeyIndex:
+    """
+    Maps names to values, looked up by exact_key() first and by lookup_key()
+    only when no name matches exactly. The first name added under a key
+    keeps it, so a name never replaces the value of a different name whose
+    folded key happens to be the same.
+    """
+
+    __slots__ = ("_exact", "_folded")
+
+    def __init__(self, pairs=()):
+        self._exact = {}
+        self._folded = {}
+        for name, value in pairs:
+            self.add(name, value)
+
+    def add(self, name: str, value):
+        self._exact.setdefault(exact_key(name), value)
+        self._folded.setdefault(lookup_key(name), value)
+
+    def get(self, text: str, default=None):
+        """Value of the name matching text exactly, else of one with the same lookup key."""
+        value = self._exact.get(exact_key(text))
+        if value is None:
+            value = self._folded.get(lookup_key(text), default)
+        return value
+
+    def get_exact(self, text: str, default=None):
+        """Value of the name matching text exactly, ignoring case and spacing."""
+        return self._exact.get(exact_key(text), default)
@@ -1,12 +1,23 @@
 # utils.py
 
-import plotly.graph_objects as go
+def _graph_objects():
+    """
+    Import Plotly on first use so importing utils stays cheap.
+    Plotly uses pandas if it is in sys.modules; importing it first waits out an
+    import of pandas on another thread instead of finding it half-initialized.
+    """
+    import pandas  # noqa: F401
+    import plotly.graph_objects as go
+    return go
+
 
 def generate_dosha_chart(dosha_scores: dict):
     """
     Generate a pie chart of dosha distribution using Plotly.
     dosha_scores should be a dictionary like {"Vata": 30, "Pitta": 40, "Kapha": 30}.
     """
+    go = _graph_objects()
+
     labels = list(dosha_scores.keys())
     values = list(dosha_scores.values())
 
@@ -15,6 +26,31 @@ def generate_dosha_chart(dosha_scores: dict):
     return fig
 
 
+def generate_trend_chart(times: list, series: dict, title: str):
+    """
+    Generate a line chart of values over time using Plotly.
+    series maps a line name to its values, one per entry of times. Callers
+    downsample long histories first, so the figure stays small.
+    """
+    go = _graph_objects()
+
+    fig = go.Figure(data=[go.Scatter(x=times, y=values, name=name, mode="lines") for name, values in series.items()])
+    fig.update_layout(title_text=title, hovermode="x unified")
+    return fig
+
+
+def generate_band_chart(bands: list, series: dict, title: str):
+    """
+    Generate a grouped bar chart of counts per band using Plotly.
+    series maps a bar group name to its counts, one per band.
+    """
+    go = _graph_objects()
+
+    fig = go.Figure(data=[go.Bar(x=bands, y=counts, name=name) for name, counts in series.items()])
+    fig.update_layout(title_text=title, barmode="group")
+    return fig
+
+
 def calculate_prakriti(answers: dict) -> str:
     """
     Calculate prakriti (dominant dosha) based on user answers.
@@ -27,16 +63,18 @@ def calculate_prakriti(answers: dict) -> str:
     return f"Your dominant prakriti is {dominant_dosha}."
 
 
+SEASONAL_ADVICE = {
+    "summer": "Stay cool with coconut water, avoid spicy foods, and practice cooling pranayama.",
+    "winter": "Eat warming foods like soups, use sesame oil for massage, and keep warm.",
+    "spring": "Detox with light foods, drink herbal teas, and practice yoga to balance Kapha.",
+    "rainy": "Avoid heavy foods, drink ginger tea, and protect digestion with warm meals."
+}
+
+
 def get_seasonal_advice(season: str) -> str:
     """
     Return Ayurvedic seasonal advice based on the season.
     """
     season = season.lower().strip()
-    advice_map = {
-        "summer": "Stay cool with coconut water, avoid spicy foods, and practice cooling pranayama.",
-        "winter": "Eat warming foods like soups, use sesame oil for massage, and keep warm.",
-        "spring": "Detox with light foods, drink herbal teas, and practice yoga to balance Kapha.",
-        "rainy": "Avoid heavy foods, drink ginger tea, and protect digestion with warm meals."
-    }
-    return advice_map.get(season, "No specific advice for this season.")
+    return SEASONAL_ADVICE.get(season, "No specific advice for this season.")
   
\ No newline at end of file
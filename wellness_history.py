@@ -0,0 +1,345 @@
+# wellness_history.py
+#
+# Append-only history of each user's dosha analyses and symptom checks,
+# kept column by column in one directory per user:
+#
+#     history/<user id>/kind.u1       ASSESSMENT or CHECKIN
+#     history/<user id>/vata.f4       dosha percentages; for a symptom check, the
+#     history/<user id>/pitta.f4      checker's imbalance probability in percent
+#     history/<user id>/kapha.f4
+#     history/<user id>/count.u2      number of symptoms of each row
+#     history/<user id>/symptoms.u2   symptom ids of every row, back to back
+#     history/<user id>/symptoms.txt  symptom names, one per line; line n is id n
+#     history/<user id>/time.i8       seconds since the epoch
+#     history/<user id>/lock          flock()ed while a row is appended
+#
+# time.i8 is written last, so its length is the number of complete rows; the
+# rest of a row torn by a crash is cut off before the next append. Appends
+# hold an exclusive flock() on the lock file, taken through a new file
+# descriptor each time, so threads and worker processes appending for the
+# same user write one whole row after another. Columns
+# are read with numpy.memmap and summed once, so years of daily entries load
+# in milliseconds; later rows only extend the loaded arrays and their running
+# sums, and rolling means and trends are read off the sums.
+
+import fcntl
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from functools import lru_cache
+
+import numpy as np
+
+HISTORY_DIR = os.environ.get(
+    "AYURVEDA_HISTORY_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "history")
+)
+
+# Users whose history is kept in memory
+HISTORY_CACHE_SIZE = 1024
+
+# Points sent to the browser per chart line, however long the history
+MAX_CHART_POINTS = 365
+
+ROLLING_DAYS = 7
+TREND_DAYS = 30
+DAY = 24 * 60 * 60
+
+DOSHAS = ("vata", "pitta", "kapha")
+ASSESSMENT, CHECKIN = 0, 1
+
+# Column file -> dtype, for the columns of one value per row other than time.i8
+_COLUMNS = {"kind.u1": "<u1", "vata.f4": "<f4", "pitta.f4": "<f4", "kapha.f4": "<f4", "count.u2": "<u2"}
+_TIME = "<i8"
+_SYMPTOM_ID = "<u2"
+_DTYPES = {**_COLUMNS, "time.i8": _TIME, "symptoms.u2": _SYMPTOM_ID}
+
+_USER_ID = re.compile(r"[0-9A-Za-z_-]{1,64}")
+
+
+class Series:
+    """
+    The rows of one kind, oldest first: times in seconds and the dosha
+    values as an (n, 3) array, with running sums so the mean over any time
+    range is two lookups.
+    """
+
+    def __init__(self):
+        self.times = np.zeros(0, dtype=np.int64)
+        self.values = np.zeros((0, len(DOSHAS)))
+        self._sums = np.zeros((1, len(DOSHAS)))
+
+    def __len__(self):
+        return len(self.times)
+
+    def extend(self, times, values):
+        """Append rows no older than the last one, summing only the new rows."""
+        values = np.asarray(values, dtype=np.float64).reshape(-1, len(DOSHAS))
+        self.times = np.concatenate((self.times, np.asarray(times, dtype=np.int64)))
+        self.values = np.concatenate((self.values, values))
+        self._sums = np.concatenate((self._sums, self._sums[-1] + np.cumsum(values, axis=0)))
+
+    def latest(self):
+        return dict(zip(DOSHAS, self.values[-1].tolist())) if len(self) else None
+
+    def mean(self, since: float = None, until: float = None):
+        """{dosha: mean value} of the rows from since to until, or None if there are none."""
+        start = 0 if since is None else int(np.searchsorted(self.times, since, side="left"))
+        end = len(self) if until is None else int(np.searchsorted(self.times, until, side="right"))
+        if end <= start:
+            return None
+        return dict(zip(DOSHAS, ((self._sums[end] - self._sums[start]) / (end - start)).tolist()))
+
+    def rolling(self, days: float = ROLLING_DAYS):
+        """Every row's mean over the rows of the days up to it, as an (n, 3) array."""
+        starts = np.searchsorted(self.times, self.times - days * DAY, side="right")
+        ends = np.arange(1, len(self) + 1)
+        return (self._sums[ends] - self._sums[starts]) / (ends - starts)[:, None]
+
+    def trend(self, days: float = TREND_DAYS):
+        """
+        {dosha: least-squares change per week} over the last days of rows,
+        or None if they span no time.
+        """
+        if not len(self):
+            return None
+        start = int(np.searchsorted(self.times, self.times[-1] - days * DAY, side="left"))
+        weeks = self.times[start:] / (7 * DAY)
+        weeks = weeks - weeks.mean()
+        spread = weeks @ weeks
+        if not spread:
+            return None
+        values = self.values[start:]
+        return dict(zip(DOSHAS, (weeks @ (values - values.mean(axis=0)) / spread).tolist()))
+
+
+def downsample(times, values, max_points: int = MAX_CHART_POINTS):
+    """
+    Average times and an (n, k) array of values over max_points equal
+    spans of time, so a chart of any length of history has at most
+    max_points points.
+    """
+    if len(times) <= max_points:
+        return times, values
+    edges = np.linspace(times[0], times[-1], max_points + 1)[1:-1]
+    buckets = np.searchsorted(edges, times, side="right")
+    counts = np.bincount(buckets, minlength=max_points)
+    used = counts > 0
+    counts = counts[used]
+    mean_times = (np.bincount(buckets, times, max_points)[used] / counts).astype(np.int64)
+    mean_values = np.column_stack([np.bincount(buckets, column, max_points)[used] for column in values.T])
+    return mean_times, mean_values / counts[:, None]
+
+
+def _write_at(path: str, offset: int, data: bytes):
+    """Write data at offset of a file, dropping whatever followed (the rest of a torn row)."""
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        os.lseek(fd, offset, os.SEEK_SET)
+        os.write(fd, data)
+        os.ftruncate(fd, offset + len(data))
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def _locked(directory: str):
+    """Hold an exclusive flock() on a directory's lock file, creating both if needed."""
+    os.makedirs(directory, exist_ok=True)
+    fd = os.open(os.path.join(directory, "lock"), os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(fd)  # releases the lock
+
+
+class UserHistory:
+    """
+    One user's history, read from its column files. refresh() reads rows
+    other processes have appended since; append_*() write a row and add it
+    to the loaded series.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.assessments = Series()
+        self.checkins = Series()
+        self._lock = threading.Lock()
+        self._rows = 0
+        self._symptom_ids = np.zeros(0, dtype=np.int64)
+        self._checkin_starts = np.zeros(0, dtype=np.int64)  # first symptom id of each check-in
+        self._names = []  # symptom id -> name
+        self._ids = {}  # symptom name -> id
+        self._names_size = 0  # bytes of complete lines in symptoms.txt
+        self._charts = {}
+
+    def __len__(self):
+        return self._rows
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def _committed_rows(self) -> int:
+        try:
+            return os.path.getsize(self._file("time.i8")) // np.dtype(_TIME).itemsize
+        except FileNotFoundError:
+            return 0
+
+    def _column(self, name: str, start: int, stop: int):
+        """Rows start to stop of a column file, copied out of a read-only memmap."""
+        dtype = np.dtype(_DTYPES[name])
+        if stop <= start:
+            return np.zeros(0, dtype)
+        return np.array(np.memmap(self._file(name), dtype=dtype, mode="r",
+                                  offset=start * dtype.itemsize, shape=(stop - start,)))
+
+    def refresh(self) -> "UserHistory":
+        """Read the rows appended since the last read, by this or another process."""
+        with self._lock:
+            rows = self._committed_rows()
+            if rows > self._rows:
+                self._read(rows)
+        return self
+
+    def _read(self, rows: int):
+        start = self._rows
+        times = self._column("time.i8", start, rows)
+        kinds = self._column("kind.u1", start, rows)
+        values = np.column_stack([self._column(f"{dosha}.f4", start, rows) for dosha in DOSHAS])
+        counts = self._column("count.u2", start, rows).astype(np.int64)
+        first_id = len(self._symptom_ids)
+        ids = self._column("symptoms.u2", first_id, first_id + int(counts.sum()))
+        if len(ids) and ids.max() >= len(self._names):
+            self._read_names()
+
+        assessment, checkin = kinds == ASSESSMENT, kinds == CHECKIN
+        self.assessments.extend(times[assessment], values[assessment])
+        self.checkins.extend(times[checkin], values[checkin])
+        starts = first_id + np.cumsum(counts) - counts
+        self._checkin_starts = np.concatenate((self._checkin_starts, starts[checkin]))
+        self._symptom_ids = np.concatenate((self._symptom_ids, ids.astype(np.int64)))
+        self._rows = rows
+
+    def _read_names(self):
+        try:
+            with open(self._file("symptoms.txt"), "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            data = b""
+        # A line without its newline was torn by a crash and is rewritten by the next append
+        self._names_size = data.rfind(b"\n") + 1
+        self._names = data[:self._names_size].decode("utf-8").splitlines()
+        self._ids = {name: i for i, name in enumerate(self._names)}
+
+    def append_assessment(self, percentages: dict, when: float = None):
+        """Record a dosha analysis: {dosha: percentage}."""
+        self._append(ASSESSMENT, percentages, (), when)
+
+    def append_checkin(self, symptoms, probabilities: dict, when: float = None):
+        """Record a symptom check: the symptom names and the checker's {dosha: probability}."""
+        self._append(CHECKIN, {dosha: 100 * p for dosha, p in probabilities.items()}, symptoms, when)
+
+    def _append(self, kind: int, values: dict, symptoms, when):
+        with self._lock, _locked(self.path):
+            rows = self._committed_rows()
+            if rows > self._rows:
+                self._read(rows)
+
+            # Rows stay in time order even if the clock steps back
+            last = max(self.assessments.times[-1:].tolist() + self.checkins.times[-1:].tolist(), default=0)
+            when = max(int(time.time() if when is None else when), last)
+            symptoms = list(dict.fromkeys(" ".join(name.split()) for name in symptoms))
+            new_names = [name for name in symptoms if name and name not in self._ids]
+            if new_names:
+                data = "".join(f"{name}\n" for name in new_names).encode("utf-8")
+                _write_at(self._file("symptoms.txt"), self._names_size, data)
+                for name in new_names:
+                    self._ids[name] = len(self._names)
+                    self._names.append(name)
+                self._names_size += len(data)
+            ids = np.array([self._ids[name] for name in symptoms if name], dtype=_SYMPTOM_ID)
+            row = np.array([values.get(dosha, 0.0) for dosha in DOSHAS])
+
+            row_values = {"kind.u1": kind, "count.u2": len(ids),
+                          **{f"{dosha}.f4": value for dosha, value in zip(DOSHAS, row.tolist())}}
+            for name, dtype in _COLUMNS.items():
+                dtype = np.dtype(dtype)
+                _write_at(self._file(name), rows * dtype.itemsize, np.array([row_values[name]], dtype=dtype).tobytes())
+            _write_at(self._file("symptoms.u2"), len(self._symptom_ids) * ids.itemsize, ids.tobytes())
+            _write_at(self._file("time.i8"), rows * np.dtype(_TIME).itemsize, np.array([when], dtype=_TIME).tobytes())
+
+            (self.assessments if kind == ASSESSMENT else self.checkins).extend([when], row)
+            if kind == CHECKIN:
+                self._checkin_starts = np.append(self._checkin_starts, len(self._symptom_ids))
+            self._symptom_ids = np.concatenate((self._symptom_ids, ids.astype(np.int64)))
+            self._rows = rows + 1
+
+    def symptom_counts(self, since: float = None) -> list:
+        """(symptom name, check-ins naming it) since a time, most frequent first."""
+        with self._lock:
+            start = 0 if since is None else int(np.searchsorted(self.checkins.times, since, side="left"))
+            if start >= len(self._checkin_starts):
+                return []
+            counts = np.bincount(self._symptom_ids[self._checkin_starts[start]:], minlength=len(self._names))
+            names = self._names
+        order = np.argsort(-counts, kind="stable")
+        return [(names[i], int(counts[i])) for i in order if counts[i]]
+
+    def series(self, kind: int) -> Series:
+        return self.assessments if kind == ASSESSMENT else self.checkins
+
+    def chart(self, kind: int, days: float = ROLLING_DAYS, max_points: int = MAX_CHART_POINTS):
+        """
+        Plotly figure of the rolling mean of one kind of row, downsampled to
+        at most max_points points per dosha. Built once per number of rows.
+        """
+        import utils
+
+        series = self.series(kind)
+        key = (kind, days, max_points, len(series))
+        figure = self._charts.get(key)
+        if figure is None:
+            times, values = downsample(series.times, series.rolling(days), max_points)
+            title = "Dosha balance" if kind == ASSESSMENT else "Imbalance in symptom checks"
+            figure = utils.generate_trend_chart(
+                [datetime.fromtimestamp(t) for t in times.tolist()],
+                {dosha.title(): column for dosha, column in zip(DOSHAS, values.T.tolist())},
+                f"{title} ({days:g}-day average, %)"
+            )
+            self._charts = {key: figure, **{k: v for k, v in self._charts.items() if k[0] != kind}}
+        return figure
+
+
+class HistoryStore:
+    """Histories of every user under one directory; recently used ones stay loaded."""
+
+    def __init__(self, root: str = HISTORY_DIR, cache_size: int = HISTORY_CACHE_SIZE):
+        self.root = root
+        self._open = lru_cache(maxsize=cache_size)(self._load)
+
+    def _load(self, user_id: str) -> UserHistory:
+        return UserHistory(os.path.join(self.root, user_id))
+
+    def history(self, user_id: str) -> UserHistory:
+        """The user's history, up to date with rows appended by any process."""
+        if not _USER_ID.fullmatch(user_id):
+            raise ValueError(f"Invalid user id '{user_id}'.")
+        return self._open(user_id).refresh()
+
+
+_shared_store = None
+_shared_store_lock = threading.Lock()
+
+
+def shared_history_store() -> HistoryStore:
+    """Return the process-wide history store, creating it on first use."""
+    global _shared_store
+    if _shared_store is None:
+        with _shared_store_lock:
+            if _shared_store is None:
+                _shared_store = HistoryStore()
+    return _shared_store
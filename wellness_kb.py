@@ -0,0 +1,242 @@
+# wellness_kb.py
+
+import threading
+import time
+from functools import cached_property
+import knowledge_base
+from dosha_index import DOSHA_BITS, build_dosha_index
+from kb_store import KnowledgeStore
+from metrics import timed
+from models import AyurvedicHerb, Dosha
+from symptom_index import SymptomIndex
+from symptom_matcher import compile_symptom_matcher
+from text_keys import KeyIndex
+
+# Seconds between on-disk change checks for the shared knowledge base
+RELOAD_CHECK_INTERVAL = 2.0
+
+SECTIONS = ("herbs", "dosha_info", "foods", "yoga_asanas", "routines", "symptom_keywords", "symptoms", "dinacharya")
+
+
+class FrozenDict(dict):
+    """Read-only dict used for the shared knowledge base data."""
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("The shared knowledge base is read-only.")
+
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = __ior__ = _readonly
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+
+def freeze(value):
+    """Recursively convert dicts and lists into read-only FrozenDicts and tuples."""
+    if isinstance(value, dict):
+        return FrozenDict({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+class AyurvedicKnowledgeBase:
+    _frozen = False
+    
+    def __init__(self, store=None, version=None):
+        self.store = store or KnowledgeStore()
+        self.version = version or self.store.signature()
+    
+    def __setattr__(self, name, value):
+        if self._frozen:
+            raise AttributeError("The shared knowledge base is read-only.")
+        super().__setattr__(name, value)
+    
+    def freeze(self):
+        """Make all knowledge base data read-only so one instance can be shared by every session"""
+        for name in SECTIONS:
+            if name in self.__dict__:
+                self.__dict__[name] = freeze(self.__dict__[name])
+        super().__setattr__("_frozen", True)
+        return self
+    
+    def _load_section(self, section):
+        data = self.store.load(section)
+        return freeze(data) if self._frozen else data
+    
+    def load_all(self):
+        """Load every section now instead of on first access"""
+        for name in SECTIONS:
+            getattr(self, name)
+        return self
+    
+    # Sections are read from the store on first access
+    @cached_property
+    def herbs(self):
+        herbs = {key: AyurvedicHerb.from_dict(herb) for key, herb in self.store.load("herbs").items()}
+        return freeze(herbs) if self._frozen else herbs
+    
+    @cached_property
+    def dosha_info(self):
+        dosha_info = {name: Dosha.from_dict(name, data) for name, data in self.store.load("dosha_info").items()}
+        return freeze(dosha_info) if self._frozen else dosha_info
+    
+    @cached_property
+    def foods(self):
+        return self._load_section("foods")
+    
+    @cached_property
+    def yoga_asanas(self):
+        return self._load_section("yoga_asanas")
+    
+    @cached_property
+    def routines(self):
+        return self._load_section("routines")
+    
+    @cached_property
+    def symptom_keywords(self):
+        return self._load_section("symptom_keywords")
+    
+    @cached_property
+    def symptoms(self):
+        return self._load_section("symptoms")
+    
+    @cached_property
+    def dinacharya(self):
+        return self._load_section("dinacharya")
+    
+    @cached_property
+    def symptom_matcher(self):
+        return compile_symptom_matcher(self.symptom_keywords)
+    
+    @cached_property
+    def dosha_herbs(self):
+        """Inverted dosha -> suitable herbs index, most targeted herbs first"""
+        return build_dosha_index(self.herbs.values())
+    
+    @cached_property
+    def herb_keys(self):
+        """Every herb key, name, Sanskrit name and alias -> herb key"""
+        keys = KeyIndex()
+        for key, herb in self.herbs.items():
+            for name in (key, herb.name, herb.sanskrit):
+                if name:
+                    keys.add(name, key)
+        # Aliases last, so an alias never takes another herb's name
+        for key, herb in self.herbs.items():
+            for alias in herb.aliases:
+                keys.add(alias, key)
+        return keys
+    
+    @cached_property
+    def dosha_keys(self):
+        """Dosha name -> itself; Devanagari and IAST names fold to the same keys"""
+        return KeyIndex((dosha, dosha) for dosha in DOSHA_BITS)
+    
+    def _dosha(self, dosha):
+        return self.dosha_keys.get(dosha)
+    
+    @cached_property
+    def remedy_kb(self):
+        """Remedy knowledge base whose add_remedy keeps symptom_index in sync"""
+        remedy_kb = knowledge_base.AyurvedicKnowledgeBase(self.store)
+        remedy_kb.symptom_index = SymptomIndex(
+            self.symptoms, remedy_kb.remedies, self.symptom_matcher, self.herbs.values(), self.dosha_herbs
+        )
+        return remedy_kb
+    
+    @cached_property
+    def symptom_index(self):
+        return self.remedy_kb.symptom_index
+    
+    @cached_property
+    def herb_search_index(self):
+        from herb_search import HerbSearchIndex  # pulls in NumPy, so only on first search
+        return HerbSearchIndex(self.herbs.values())
+    
+    @cached_property
+    def corpus_index(self):
+        """BM25 index over every passage of the knowledge base; add_remedy keeps it in sync"""
+        from corpus_index import CorpusIndex, kb_passages  # pulls in SciPy, so only on first query
+        corpus_index = CorpusIndex(kb_passages(self))
+        self.remedy_kb.corpus_index = corpus_index
+        return corpus_index
+    
+    @cached_property
+    def schedule_engine(self):
+        """Daily routine timelines, with templates memoized per (dosha, season)"""
+        from dinacharya import ScheduleEngine
+        return ScheduleEngine(self.dinacharya)
+    
+    @cached_property
+    def chat_engine(self):
+        from chat_engine import ChatEngine
+        return ChatEngine(self)
+    
+    @timed("ayurveda_kb_call_seconds", "method")
+    def get_all_herbs(self):
+        return list(self.herbs.values())
+    
+    @timed("ayurveda_kb_call_seconds", "method")
+    def find_herb(self, name):
+        """Herb by key, name, Sanskrit name or alias in any script or spelling, or None"""
+        key = self.herb_keys.get(name)
+        return self.herbs[key] if key is not None else None
+    
+    @timed("ayurveda_kb_call_seconds", "method")
+    def get_dosha_info(self, dosha):
+        return self.dosha_info.get(self._dosha(dosha))
+    
+    @timed("ayurveda_kb_call_seconds", "method")
+    def get_dosha_specific_routine(self, dosha):
+        """Get dosha-specific routine"""
+        return self.routines.get(self._dosha(dosha), [])
+    
+    @timed("ayurveda_kb_call_seconds", "method")
+    def analyze_symptoms(self, symptoms):
+        """Score symptoms against the compiled keyword matcher - returns primary dosha"""
+        return self.symptom_matcher.analyze(symptoms)
+    
+    @timed("ayurveda_kb_call_seconds", "method")
+    def analyze_symptoms_batch(self, symptom_lists):
+        """Analyze many symptom lists in one call"""
+        return self.symptom_matcher.analyze_batch(symptom_lists)
+    
+    @timed("ayurveda_kb_call_seconds", "method")
+    def get_recommended_herbs(self, symptoms):
+        analysis = self.analyze_symptoms(symptoms)
+        return list(self.dosha_herbs.get(analysis["primary_dosha"], ())[:3])
+    
+    @timed("ayurveda_kb_call_seconds", "method")
+    def get_herbs_for_dosha(self, dosha):
+        """Herbs suitable for a dosha (including "All doshas" herbs), most targeted first"""
+        return list(self.dosha_herbs.get(self._dosha(dosha), ()))
+    
+    @timed("ayurveda_kb_call_seconds", "method")
+    def get_dietary_advice(self, dosha):
+        return self.foods.get(self._dosha(dosha), {"increase": [], "decrease": []})
+
+
+_store = KnowledgeStore()
+_shared_kb = None
+_shared_kb_lock = threading.Lock()
+_next_reload_check = 0.0
+
+
+def shared_knowledge_base() -> AyurvedicKnowledgeBase:
+    """
+    Return the process-wide frozen knowledge base, loading it on first use.
+    Every session holds a reference to this single instance. When the data
+    files change on disk a new version is swapped in at the next check;
+    callers holding the previous instance keep the sections it already loaded.
+    """
+    global _shared_kb, _next_reload_check
+    now = time.monotonic()
+    if _shared_kb is None or now >= _next_reload_check:
+        with _shared_kb_lock:
+            if _shared_kb is None or now >= _next_reload_check:
+                _next_reload_check = now + RELOAD_CHECK_INTERVAL
+                version = _store.signature()
+                if _shared_kb is None or _shared_kb.version != version:
+                    _shared_kb = AyurvedicKnowledgeBase(_store, version).freeze()
+    return _shared_kb